@@ -0,0 +1,138 @@
+import copy
+import hashlib
+import io
+import json
+from typing import Any, Dict, Tuple
+
+import torch
+import torch.nn as nn
+
+class InferenceBackend:
+    """Runs a ContentVerificationModel's forward pass; ``fingerprint`` covers the weights and the backend"""
+
+    name = "eager"
+
+    def __init__(self, model: nn.Module, num_threads: int = 0):
+        self.model = model.eval()
+        self.num_threads = num_threads
+        self._fingerprint = None
+
+    def __call__(self, features: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        with torch.inference_mode():
+            return self.model(features)
+
+    @property
+    def fingerprint(self) -> str:
+        # The eager backend keeps the plain model hash so existing records stay valid
+        if self.name == InferenceBackend.name:
+            return self.model.get_model_hash()
+        if self._fingerprint is None:
+            self._fingerprint = self._compute_fingerprint()
+        return self._fingerprint
+
+    def _compute_fingerprint(self) -> str:
+        backend_info = {'model_hash': self.model.get_model_hash(), 'backend': self.name}
+        return hashlib.sha256(json.dumps(backend_info, sort_keys=True).encode()).hexdigest()
+
+class QuantizedBackend(InferenceBackend):
+    """Dynamic int8 quantization of the nn.Linear layers"""
+
+    name = "int8"
+
+    def __init__(self, model: nn.Module, num_threads: int = 0):
+        super().__init__(model, num_threads)
+        self.quantized = torch.ao.quantization.quantize_dynamic(
+            copy.deepcopy(self.model), {nn.Linear}, dtype=torch.qint8
+        )
+
+    def __call__(self, features: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        with torch.inference_mode():
+            return self.quantized(features)
+
+class TorchScriptBackend(InferenceBackend):
+    """Traced, frozen TorchScript graph (dropout folded away, weights inlined)"""
+
+    name = "torchscript"
+
+    def __init__(self, model: nn.Module, num_threads: int = 0):
+        super().__init__(model, num_threads)
+        example = torch.zeros(1, self.model.encoder[0].in_features)
+        with torch.no_grad():
+            traced = torch.jit.trace(self.model, example)
+        self.graph = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+
+    def __call__(self, features: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        with torch.inference_mode():
+            return self.graph(features)
+
+class CompiledBackend(InferenceBackend):
+    """torch.compile graph (needs a C++ toolchain for the CPU inductor backend)"""
+
+    name = "compile"
+
+    def __init__(self, model: nn.Module, num_threads: int = 0):
+        super().__init__(model, num_threads)
+        self.compiled = torch.compile(self.model, dynamic=True)
+
+    def __call__(self, features: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        with torch.inference_mode():
+            return self.compiled(features)
+
+class OnnxBackend(InferenceBackend):
+    """ONNX export executed by onnxruntime's CPU provider"""
+
+    name = "onnx"
+
+    def __init__(self, model: nn.Module, num_threads: int = 0):
+        super().__init__(model, num_threads)
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError("The onnx inference backend requires onnxruntime") from e
+
+        buffer = io.BytesIO()
+        example = torch.zeros(1, self.model.encoder[0].in_features)
+        torch.onnx.export(
+            self.model, example, buffer,
+            input_names=["features"],
+            output_names=["encoded", "verification"],
+            dynamic_axes={"features": {0: "batch"}, "encoded": {0: "batch"}, "verification": {0: "batch"}}
+        )
+        options = onnxruntime.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = onnxruntime.InferenceSession(
+            buffer.getvalue(), options, providers=["CPUExecutionProvider"]
+        )
+
+    def __call__(self, features: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        encoded, verification = self.session.run(None, {"features": features.numpy()})
+        return torch.from_numpy(encoded), torch.from_numpy(verification)
+
+INFERENCE_BACKENDS = {
+    InferenceBackend.name: InferenceBackend,
+    QuantizedBackend.name: QuantizedBackend,
+    TorchScriptBackend.name: TorchScriptBackend,
+    CompiledBackend.name: CompiledBackend,
+    OnnxBackend.name: OnnxBackend
+}
+
+def check_parity(reference: InferenceBackend, candidate: InferenceBackend,
+                 features: torch.Tensor, tolerance: float = 0.02) -> Dict[str, Any]:
+    """Compare a backend's outputs against the fp32 eager model on sample features"""
+    ref_encoded, ref_scores = reference(features)
+    encoded, scores = candidate(features)
+    ref_probs = torch.softmax(ref_scores, dim=-1)
+    probs = torch.softmax(scores, dim=-1)
+
+    max_score_error = float((probs - ref_probs).abs().max())
+    agreement = float(((probs[:, 1] > 0.5) == (ref_probs[:, 1] > 0.5)).float().mean())
+    min_cosine = float(torch.nn.functional.cosine_similarity(encoded, ref_encoded, dim=-1).min())
+    return {
+        'backend': candidate.name,
+        'samples': len(features),
+        'max_score_error': max_score_error,
+        'decision_agreement': agreement,
+        'min_feature_cosine': min_cosine,
+        'passed': max_score_error <= tolerance and agreement >= 1.0 - tolerance
+    }
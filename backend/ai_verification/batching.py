@@ -0,0 +1,166 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Tuple
+
+from .model import ContentProcessor
+
+class InferenceStats:
+    """Counters for the batching engine (batch sizes and per-batch latency)"""
+
+    def __init__(self, latency_window: int = 1024):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.batch_size_histogram: Dict[int, int] = {}
+        self.latency_sum_ms = 0.0
+        self.latency_max_ms = 0.0
+        self._recent_latencies = deque(maxlen=latency_window)
+
+    def record_batch(self, size: int, latency_ms: float) -> None:
+        # Histogram buckets are powers of two: 1, 2, 4, 8, ...
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+        with self._lock:
+            self.batches += 1
+            self.items += size
+            self.batch_size_histogram[bucket] = self.batch_size_histogram.get(bucket, 0) + 1
+            self.latency_sum_ms += latency_ms
+            self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+            self._recent_latencies.append(latency_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._recent_latencies)
+            return {
+                'batches': self.batches,
+                'items': self.items,
+                'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+                'batch_size_histogram': dict(sorted(self.batch_size_histogram.items())),
+                'batch_latency_ms': {
+                    'mean': self.latency_sum_ms / self.batches if self.batches else 0.0,
+                    'max': self.latency_max_ms,
+                    'p50': self._percentile(recent, 0.50),
+                    'p99': self._percentile(recent, 0.99)
+                }
+            }
+
+    @staticmethod
+    def _percentile(values: List[float], q: float) -> float:
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+class BatchingInferenceEngine:
+    """Collects concurrent process_content calls into batched forward passes"""
+
+    def __init__(self, processor: ContentProcessor, max_batch_size: int = 32, max_wait_ms: float = 3.0):
+        self.processor = processor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.stats = InferenceStats()
+        self._queue: "queue.Queue[Tuple[str, ContentProcessor, Future]]" = queue.Queue()
+        self._stopped = threading.Event()
+        # Makes submit's stopped check and enqueue atomic with respect to stop
+        self._submit_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, content: str, processor: Optional[ContentProcessor] = None) -> Future:
+        """Queue content for the next batch (on ``processor``, or the engine's default)"""
+        future: Future = Future()
+        with self._submit_lock:
+            if self._stopped.is_set():
+                raise RuntimeError("Inference engine is stopped")
+            self._queue.put((content, processor or self.processor, future))
+        return future
+
+    def process_content(self, content: str, processor: Optional[ContentProcessor] = None) -> Dict[str, Any]:
+        """Drop-in replacement for ContentProcessor.process_content"""
+        return self.submit(content, processor).result()
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'queue_depth': self.queue_depth(),
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            **self.stats.snapshot()
+        }
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop accepting work, run the final batches, then fail anything left"""
+        with self._submit_lock:
+            self._stopped.set()
+        self._worker.join(timeout)
+        error = RuntimeError("Inference engine stopped before the item was processed")
+        for _, _, future in self._take_queued(None):
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def _take_queued(self, limit: Optional[int]) -> List[Tuple[str, ContentProcessor, Future]]:
+        batch = []
+        while limit is None or len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _collect_batch(self) -> List[Tuple[str, ContentProcessor, Future]]:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    # Window closed; still take whatever is already queued
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._run_batch(self._collect_batch())
+        # Nothing is enqueued once stopped is set: run what was already accepted
+        while True:
+            batch = self._take_queued(self.max_batch_size)
+            if not batch:
+                return
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Tuple[str, ContentProcessor, Future]]) -> None:
+        # Skip callers that gave up before the batch ran
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+
+        # Items queued across a model swap run on the version they were submitted to
+        groups: Dict[int, List[Tuple[str, ContentProcessor, Future]]] = {}
+        for item in batch:
+            groups.setdefault(id(item[1]), []).append(item)
+        for group in groups.values():
+            self._run_group(group[0][1], group)
+
+    def _run_group(self, processor: ContentProcessor, group: List[Tuple[str, ContentProcessor, Future]]) -> None:
+        started = time.perf_counter()
+        try:
+            results = processor.process_batch([content for content, _, _ in group])
+        except Exception as e:
+            for _, _, future in group:
+                future.set_exception(e)
+            return
+        finally:
+            self.stats.record_batch(len(group), (time.perf_counter() - started) * 1000.0)
+
+        for (_, _, future), result in zip(group, results):
+            future.set_result(result)
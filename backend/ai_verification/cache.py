@@ -0,0 +1,146 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Disk-tier puts between sweeps of expired and over-capacity rows
+_PRUNE_EVERY = 256
+
+class VerificationCache:
+    """Verification results keyed on (content_hash, model_hash), in memory and optionally in a shared SQLite file"""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600.0, db_path: Optional[str] = None,
+                 max_disk_entries: int = 100000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._puts_since_prune = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        if self.db_path:
+            self._db().execute(
+                "CREATE TABLE IF NOT EXISTS verification_cache ("
+                " content_hash TEXT NOT NULL,"
+                " model_hash TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " PRIMARY KEY (content_hash, model_hash))"
+            )
+            self._db().execute(
+                "CREATE INDEX IF NOT EXISTS ix_verification_cache_created_at ON verification_cache (created_at)"
+            )
+            self._prune_disk(time.time())
+
+    def get(self, content_hash: str, model_hash: str) -> Optional[Dict[str, Any]]:
+        key = (content_hash, model_hash)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.evictions += 1
+
+        if self.db_path:
+            row = self._db().execute(
+                "SELECT value, created_at FROM verification_cache WHERE content_hash = ? AND model_hash = ?",
+                key
+            ).fetchone()
+            if row is not None and row[1] + self.ttl_seconds > now:
+                value = json.loads(row[0])
+                self._put_memory(key, value, row[1] + self.ttl_seconds)
+                with self._lock:
+                    self.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, content_hash: str, model_hash: str, value: Dict[str, Any]) -> None:
+        key = (content_hash, model_hash)
+        now = time.time()
+        self._put_memory(key, value, now + self.ttl_seconds)
+
+        if self.db_path:
+            with self._db() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO verification_cache VALUES (?, ?, ?, ?)",
+                    (content_hash, model_hash, json.dumps(value), now)
+                )
+            with self._lock:
+                self._puts_since_prune += 1
+                prune = self._puts_since_prune >= min(_PRUNE_EVERY, self.max_disk_entries)
+                if prune:
+                    self._puts_since_prune = 0
+            if prune:
+                self._prune_disk(now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            with self._db() as db:
+                db.execute("DELETE FROM verification_cache")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'disk_evictions': self.disk_evictions
+            }
+
+    def _put_memory(self, key: Tuple[str, str], value: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _prune_disk(self, now: float) -> None:
+        """Drop expired rows, then the oldest rows beyond ``max_disk_entries``"""
+        with self._db() as db:
+            removed = db.execute(
+                "DELETE FROM verification_cache WHERE created_at <= ?", (now - self.ttl_seconds,)
+            ).rowcount
+            removed += db.execute(
+                "DELETE FROM verification_cache WHERE rowid IN ("
+                " SELECT rowid FROM verification_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            ).rowcount
+        if removed:
+            with self._lock:
+                self.disk_evictions += removed
+
+    def _db(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
@@ -0,0 +1,38 @@
+import hashlib
+from abc import ABC, abstractmethod
+import numpy as np
+import torch
+from typing import Sequence
+
+class FeatureExtractor(ABC):
+    """Maps a batch of texts to an (N, feature_size) float32 tensor"""
+
+    feature_size: int = 768
+    # True when features depend only on the SHA-256 digest of the content, so
+    # streamed uploads can be verified without holding the payload in memory
+    digest_features: bool = False
+
+    @abstractmethod
+    def __call__(self, texts: Sequence[str]) -> torch.Tensor:
+        ...
+
+    def from_digests(self, digests: Sequence[bytes]) -> torch.Tensor:
+        """Features from SHA-256 digests; only for extractors with ``digest_features``"""
+        raise ValueError(f"Feature extractor {type(self).__name__} needs the content, "
+                         f"not its digest; use process_batch")
+
+class HashFeatureExtractor(FeatureExtractor):
+    """SHA-256 digest features (simplified - use proper embeddings in production)"""
+
+    DIGEST_WORDS = hashlib.sha256().digest_size // 4
+    digest_features = True
+
+    def __call__(self, texts: Sequence[str]) -> torch.Tensor:
+        return self.from_digests([hashlib.sha256(text.encode()).digest() for text in texts])
+
+    def from_digests(self, digests: Sequence[bytes]) -> torch.Tensor:
+        features = np.zeros((len(digests), self.feature_size), dtype=np.float32)
+        if digests:
+            words = np.frombuffer(b"".join(digests), dtype=">u4")
+            features[:, :self.DIGEST_WORDS] = words.reshape(len(digests), self.DIGEST_WORDS)
+        return torch.from_numpy(features)
@@ -2,7 +2,11 @@ import torch
 import torch.nn as nn
 import hashlib
 import json
-from typing import Dict, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
+
+from ..metrics import stage
+from .backends import INFERENCE_BACKENDS, InferenceBackend, check_parity
+from .features import FeatureExtractor, HashFeatureExtractor
 
 class ContentVerificationModel(nn.Module):
     def __init__(self, input_size: int = 768, hidden_size: int = 512, output_size: int = 256):
@@ -23,6 +27,7 @@ class ContentVerificationModel(nn.Module):
             nn.ReLU(),
             nn.Linear(64, 2)  # [original_prob, ai_assisted_prob]
         )
+        self._model_hash: Optional[str] = None
     
     def forward(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
         encoded = self.encoder(x)
@@ -30,50 +35,105 @@ class ContentVerificationModel(nn.Module):
         return encoded, verification
     
     def get_model_hash(self) -> str:
-        """Generate hash of model architecture and parameters"""
+        """Return the cached hash of model architecture and parameters"""
+        if self._model_hash is None:
+            self._model_hash = self._compute_model_hash()
+        return self._model_hash
+    
+    def invalidate_model_hash(self) -> None:
+        """Drop the cached fingerprint; it is recomputed on next access"""
+        self._model_hash = None
+    
+    def load_state_dict(self, state_dict, strict: bool = True, **kwargs):
+        result = super().load_state_dict(state_dict, strict=strict, **kwargs)
+        self.invalidate_model_hash()
+        return result
+    
+    def _compute_model_hash(self) -> str:
+        """Hash the architecture and the raw parameter bytes, in state_dict order so it is reproducible"""
+        params_hasher = hashlib.sha256()
+        for name, tensor in self.state_dict().items():
+            data = tensor.detach().cpu().contiguous()
+            params_hasher.update(name.encode())
+            params_hasher.update(f"{data.dtype}{tuple(data.shape)}".encode())
+            params_hasher.update(data.numpy().data)
         model_info = {
             'architecture': str(self),
-            'parameters_hash': hashlib.sha256(
-                str([p.data for p in self.parameters()]).encode()
-            ).hexdigest()
+            'parameters_hash': params_hasher.hexdigest()
         }
         return hashlib.sha256(json.dumps(model_info).encode()).hexdigest()
 
 class ContentProcessor:
-    def __init__(self, model_path: str = None):
+    def __init__(self, model_path: str = None, feature_extractor: Optional[FeatureExtractor] = None,
+                 backend: str = "eager", num_threads: int = 0, parity_tolerance: Optional[float] = 0.02):
+        self.feature_extractor = feature_extractor or HashFeatureExtractor()
         self.model = ContentVerificationModel()
         if model_path:
-            self.model.load_state_dict(torch.load(model_path))
+            # Memory-mapped and assigned in place, so workers loading the same
+            # checkpoint share its pages instead of each holding a copy
+            self.model.load_state_dict(torch.load(model_path, mmap=True, weights_only=True), assign=True)
         self.model.eval()
+        # Only backends with their own runtime (onnxruntime) take num_threads; torch's
+        # thread count is process-wide and set once by the caller
+        self.backend: InferenceBackend = INFERENCE_BACKENDS[backend](self.model, num_threads)
+        self.parity: Optional[Dict[str, Any]] = None
+        if backend != InferenceBackend.name and parity_tolerance is not None:
+            # Refuse to serve a backend whose decisions drift from the fp32 model
+            samples = self._texts_to_features([f"parity sample {i}" for i in range(256)])
+            self.parity = check_parity(InferenceBackend(self.model), self.backend, samples, parity_tolerance)
+            if not self.parity['passed']:
+                raise RuntimeError(f"Inference backend {backend} failed the parity check: {self.parity}")
+    
+    @property
+    def model_hash(self) -> str:
+        return self.backend.fingerprint
     
     def process_content(self, content: str) -> Dict[str, Any]:
         """Process content and generate verification features"""
-        # Convert content to feature vector (simplified)
-        content_features = self._text_to_features(content)
-        
-        with torch.no_grad():
-            encoded, verification = self.model(content_features)
+        return self.process_batch([content])[0]
+    
+    def process_batch(self, contents: List[str]) -> List[Dict[str, Any]]:
+        """Process several contents with a single batched forward pass"""
+        # Convert content to feature vectors (simplified)
+        with stage("feature_extraction"):
+            content_features = self._texts_to_features(contents)
+        return self._process_features(content_features, [self._hash_content(content) for content in contents])
+    
+    def process_digests(self, digests: List[bytes]) -> List[Dict[str, Any]]:
+        """Process contents known only by their SHA-256 digests (streamed uploads)"""
+        with stage("feature_extraction"):
+            content_features = self.feature_extractor.from_digests(digests)
+        return self._process_features(content_features, [digest.hex() for digest in digests])
+    
+    def _process_features(self, content_features: torch.Tensor, content_hashes: List[str]) -> List[Dict[str, Any]]:
+        with stage("model_forward"):
+            encoded, verification = self.backend(content_features)
             
         # Convert to probabilities
         probs = torch.softmax(verification, dim=-1)
+        model_hash = self.backend.fingerprint
         
-        return {
-            'content_hash': self._hash_content(content),
-            'feature_vector': encoded.numpy().tolist(),
-            'verification_scores': probs.numpy().tolist(),
-            'model_hash': self.model.get_model_hash(),
-            'is_ai_assisted': probs[0][1] > 0.5  # Threshold for AI-assisted detection
-        }
+        # Slices keep the leading batch dimension so each result has the
+        # same (1, n) shape as a single-item forward pass
+        return [
+            {
+                'content_hash': content_hash,
+                'feature_vector': encoded[i:i + 1].numpy().tolist(),
+                'verification_scores': probs[i:i + 1].numpy().tolist(),
+                'model_hash': model_hash,
+                'is_ai_assisted': bool(probs[i][1] > 0.5)  # Threshold for AI-assisted detection
+            }
+            for i, content_hash in enumerate(content_hashes)
+        ]
     
     def _text_to_features(self, text: str) -> torch.Tensor:
-        """Convert text to feature vector (simplified - use proper embeddings in production)"""
-        # In production, use sentence transformers or similar
-        text_hash = hashlib.sha256(text.encode()).hexdigest()
-        # Convert hash to numerical features (simplified approach)
-        features = [int(text_hash[i:i+8], 16) for i in range(0, min(len(text_hash), 192), 8)]
-        # Pad or truncate to 768 features
-        features = features[:768] + [0] * (768 - len(features))
-        return torch.tensor(features, dtype=torch.float32).unsqueeze(0)
+        """Convert text to a (1, 768) feature vector"""
+        return self._texts_to_features([text])
+    
+    def _texts_to_features(self, texts: List[str]) -> torch.Tensor:
+        """Convert texts to a stacked (N, 768) feature tensor"""
+        # In production, plug in sentence transformers or similar
+        return self.feature_extractor(texts)
     
     def _hash_content(self, content: str) -> str:
         return hashlib.sha256(content.encode()).hexdigest()
\ No newline at end of file
@@ -0,0 +1,229 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .zk_circuits import ZKProofGenerator
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+class ProofJobQueue:
+    """Proof jobs persisted in SQLite so they survive restarts and are shared by workers"""
+
+    def __init__(self, db_path: str, max_attempts: int = 3, retry_backoff: float = 2.0):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._local = threading.local()
+        self._submitted = threading.Event()
+
+        with self._db() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS proof_jobs ("
+                " id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " content_hash TEXT NOT NULL,"
+                " model_hash TEXT NOT NULL,"
+                " circuit_input TEXT NOT NULL,"
+                " result TEXT,"
+                " error TEXT,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " available_at REAL NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS ix_proof_jobs_pending ON proof_jobs (status, available_at)")
+
+    def submit(self, content_hash: str, model_hash: str, circuit_input: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db() as db:
+            db.execute(
+                "INSERT INTO proof_jobs (id, status, content_hash, model_hash, circuit_input,"
+                " available_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, PENDING, content_hash, model_hash, json.dumps(circuit_input), now, now, now)
+            )
+        self._submitted.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._db().execute(
+            "SELECT id, status, content_hash, model_hash, result, error, attempts, created_at, updated_at"
+            " FROM proof_jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'job_id': row[0],
+            'status': row[1],
+            'content_hash': row[2],
+            'model_hash': row[3],
+            'result': json.loads(row[4]) if row[4] else None,
+            'error': row[5],
+            'attempts': row[6],
+            'created_at': row[7],
+            'updated_at': row[8]
+        }
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest available pending job to running"""
+        db = self._db()
+        now = time.time()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT id, circuit_input, attempts FROM proof_jobs"
+                " WHERE status = ? AND available_at <= ? ORDER BY created_at LIMIT 1",
+                (PENDING, now)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE proof_jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (RUNNING, now, row[0])
+            )
+        return {'job_id': row[0], 'circuit_input': json.loads(row[1]), 'attempts': row[2] + 1}
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        with self._db() as db:
+            db.execute(
+                "UPDATE proof_jobs SET status = ?, result = ?, error = NULL, updated_at = ? WHERE id = ?",
+                (COMPLETED, json.dumps(result), time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, attempts: int, error: str) -> None:
+        """Record a failure, re-queueing with exponential backoff until max_attempts"""
+        now = time.time()
+        with self._db() as db:
+            if attempts < self.max_attempts:
+                db.execute(
+                    "UPDATE proof_jobs SET status = ?, error = ?, available_at = ?, updated_at = ? WHERE id = ?",
+                    (PENDING, error, now + self.retry_backoff ** attempts, now, job_id)
+                )
+            else:
+                db.execute(
+                    "UPDATE proof_jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                    (FAILED, error, now, job_id)
+                )
+
+    def requeue_running(self) -> int:
+        """Return jobs left running by a crashed worker to the queue"""
+        with self._db() as db:
+            cursor = db.execute(
+                "UPDATE proof_jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (PENDING, time.time(), RUNNING)
+            )
+        return cursor.rowcount
+
+    def wait_for_submit(self, timeout: float) -> None:
+        self._submitted.wait(timeout)
+        self._submitted.clear()
+
+    def pending(self) -> int:
+        """Jobs not yet claimed by a worker (served by the status index)"""
+        return self._db().execute("SELECT COUNT(*) FROM proof_jobs WHERE status = ?", (PENDING,)).fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        rows = self._db().execute("SELECT status, COUNT(*) FROM proof_jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+class ProofWorker:
+    """Long-lived prover: owns one ZKProofGenerator (and its loaded artifacts) for its lifetime"""
+
+    def __init__(self, name: str, queue: ProofJobQueue, generator: ZKProofGenerator,
+                 concurrency: int = 1, poll_interval: float = 0.5,
+                 on_complete: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.name = name
+        self.queue = queue
+        self.generator = generator
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.on_complete = on_complete
+        self.completed = 0
+        self.failed = 0
+        self._slots = threading.Semaphore(concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=name)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopped.set()
+        self._thread.join(timeout)
+        self._executor.shutdown(wait=True)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            # Only claim work when a slot is free, so queued jobs stay
+            # available to other workers
+            if not self._slots.acquire(timeout=self.poll_interval):
+                continue
+            job = self.queue.claim()
+            if job is None:
+                self._slots.release()
+                self.queue.wait_for_submit(self.poll_interval)
+                continue
+            self._executor.submit(self._prove, job)
+
+    def _prove(self, job: Dict[str, Any]) -> None:
+        try:
+            result = self.generator.prove(job['circuit_input'])
+        except Exception as e:
+            self.failed += 1
+            self.queue.fail(job['job_id'], job['attempts'], str(e))
+        else:
+            self.completed += 1
+            self.queue.complete(job['job_id'], result)
+            if self.on_complete is not None:
+                self.on_complete(self.queue.get(job['job_id']))
+        finally:
+            self._slots.release()
+
+class ProofWorkerPool:
+    """A fixed set of ProofWorkers consuming a ProofJobQueue"""
+
+    def __init__(self, queue: ProofJobQueue, generator_factory: Callable[[], ZKProofGenerator],
+                 workers: int = 2, concurrency: int = 1,
+                 on_complete: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.queue = queue
+        self.workers: List[ProofWorker] = [
+            ProofWorker(f"prover-{i}", queue, generator_factory(), concurrency, on_complete=on_complete)
+            for i in range(workers)
+        ]
+
+    def start(self, recover: bool = True) -> None:
+        """Start the workers; ``recover`` first requeues jobs a crashed process left running"""
+        if recover:
+            self.queue.requeue_running()
+        for worker in self.workers:
+            worker.start()
+
+    def stop(self) -> None:
+        for worker in self.workers:
+            worker.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'jobs': self.queue.get_stats(),
+            'workers': {
+                worker.name: {'completed': worker.completed, 'failed': worker.failed}
+                for worker in self.workers
+            }
+        }
@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .model import ContentProcessor
+
+class ModelVersion:
+    """A loaded, warmed ContentProcessor and where it came from"""
+
+    def __init__(self, processor: ContentProcessor, model_path: Optional[str],
+                 load_time_ms: float, warmup_time_ms: float):
+        self.processor = processor
+        self.model_path = model_path
+        self.fingerprint = processor.model_hash
+        self.load_time_ms = load_time_ms
+        self.warmup_time_ms = warmup_time_ms
+        self.loaded_at = time.time()
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'fingerprint': self.fingerprint,
+            'model_path': self.model_path,
+            'backend': self.processor.backend.name,
+            'load_time_ms': self.load_time_ms,
+            'warmup_time_ms': self.warmup_time_ms,
+            'loaded_at': self.loaded_at
+        }
+
+class ModelRegistry:
+    """Resident model versions with an atomically switched active one"""
+
+    def __init__(self, processor_factory: Callable[[Optional[str]], ContentProcessor],
+                 max_resident: int = 2, warmup_batches: int = 3, warmup_batch_size: int = 8):
+        self.processor_factory = processor_factory
+        self.max_resident = max_resident
+        self.warmup_batches = warmup_batches
+        self.warmup_batch_size = warmup_batch_size
+        self.swaps = 0
+        self.load_failures = 0
+        self._versions: "OrderedDict[str, ModelVersion]" = OrderedDict()
+        self._active: Optional[ModelVersion] = None
+        self._lock = threading.Lock()
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-loader")
+        self._watch_stopped = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> ModelVersion:
+        return self._active
+
+    def get(self, fingerprint: str) -> Optional[ModelVersion]:
+        with self._lock:
+            return self._versions.get(fingerprint)
+
+    def load(self, model_path: Optional[str], warmup: bool = True) -> ModelVersion:
+        """Load (and by default warm) a checkpoint without activating it"""
+        started = time.perf_counter()
+        try:
+            processor = self.processor_factory(model_path)
+        except Exception:
+            self.load_failures += 1
+            raise
+        version = ModelVersion(processor, model_path, (time.perf_counter() - started) * 1000.0, 0.0)
+        if warmup:
+            self.warmup(version)
+
+        with self._lock:
+            # Reloading identical weights keeps the resident copy
+            return self._versions.setdefault(version.fingerprint, version)
+
+    def warmup(self, version: ModelVersion) -> None:
+        """Run a few synthetic batches so first requests don't pay for lazy init"""
+        started = time.perf_counter()
+        for i in range(self.warmup_batches):
+            version.processor.process_batch([f"warmup {i}-{j}" for j in range(self.warmup_batch_size)])
+        version.warmup_time_ms = (time.perf_counter() - started) * 1000.0
+
+    def activate(self, fingerprint: str) -> ModelVersion:
+        with self._lock:
+            version = self._versions.get(fingerprint)
+            if version is None:
+                raise KeyError(f"Model version {fingerprint} is not resident")
+            self._versions.move_to_end(fingerprint)
+            if self._active is not None and self._active is not version:
+                self.swaps += 1
+            self._active = version
+            while len(self._versions) > self.max_resident:
+                self._versions.popitem(last=False)
+            return version
+
+    def load_and_activate(self, model_path: Optional[str]) -> ModelVersion:
+        return self.activate(self.load(model_path).fingerprint)
+
+    def reload_async(self, model_path: Optional[str]) -> Future:
+        """Load, warm and activate a checkpoint on the background loader thread"""
+        return self._loader.submit(self.load_and_activate, model_path)
+
+    def watch(self, model_path: str, interval: float) -> None:
+        """Reload whenever the checkpoint file changes (each worker converges on its own)"""
+        self._watcher = threading.Thread(target=self._watch, args=(model_path, interval),
+                                         name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._watch_stopped.set()
+        if self._watcher is not None:
+            self._watcher.join(5.0)
+        self._loader.shutdown(wait=True)
+
+    def versions(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            active = self._active
+            return [
+                {**version.describe(), 'active': version is active}
+                for version in reversed(self._versions.values())
+            ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'active': self._active.fingerprint if self._active else None,
+            'resident': len(self._versions),
+            'swaps': self.swaps,
+            'load_failures': self.load_failures
+        }
+
+    def _watch(self, model_path: str, interval: float) -> None:
+        last_mtime = self._mtime(model_path)
+        while not self._watch_stopped.wait(interval):
+            mtime = self._mtime(model_path)
+            if mtime is None or mtime == last_mtime:
+                continue
+            last_mtime = mtime
+            try:
+                self.load_and_activate(model_path)
+            except Exception:
+                # Keep serving the current version; the next change retries
+                pass
+
+    def _mtime(self, model_path: str) -> Optional[float]:
+        try:
+            return os.stat(model_path).st_mtime
+        except OSError:
+            return None
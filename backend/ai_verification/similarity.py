@@ -0,0 +1,278 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..storage.locks import FileLock
+
+class FeatureIndex:
+    """Near-duplicate search over the encoder's feature vectors"""
+
+    HEADER_BYTES = 64
+    HASH_BYTES = 32
+
+    def __init__(self, path: str, dim: int = 256, threshold: float = 0.98, k: int = 10,
+                 nlist: int = 256, nprobe: int = 8, train_threshold: int = 20000,
+                 initial_capacity: int = 1024):
+        self.path = path
+        self.dim = dim
+        self.threshold = threshold
+        self.k = k
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.initial_capacity = initial_capacity
+        self.searches = 0
+        self.duplicates_flagged = 0
+        self.resets = 0
+        self._search_time = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._file_lock = FileLock(self._file("index.lock"))
+
+        with self._file_lock:
+            meta = self._read_meta()
+            if meta is not None and meta['dim'] == dim and os.path.exists(self._file("vectors.f32")):
+                self.model_hash: Optional[str] = meta['model_hash']
+                self.generation = meta.get('generation', 0)
+                self._open()
+            else:
+                self._reset(None)
+
+    def __len__(self) -> int:
+        return int(self._header[0])
+
+    def check_and_add(self, content_hash: str, model_hash: str, vector) -> List[Dict[str, Any]]:
+        """Return other content above the similarity threshold, then index this vector"""
+        query = self._normalize(vector)
+        with self._locked():
+            if model_hash != self.model_hash:
+                self._reset(model_hash)
+            matches = self._search(query, self.k)
+
+            duplicates = [
+                {'content_hash': match_hash, 'similarity': similarity}
+                for match_hash, similarity in matches
+                if match_hash != content_hash and similarity >= self.threshold
+            ]
+            if duplicates:
+                self.duplicates_flagged += 1
+            if all(match_hash != content_hash for match_hash, _ in matches):
+                self._add(content_hash, query)
+            return duplicates
+
+    def search(self, vector, k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(content_hash, cosine similarity) of the k nearest indexed vectors"""
+        with self._locked(shared=True):
+            return self._search(self._normalize(vector), k or self.k)
+
+    def flush(self) -> None:
+        with self._locked(shared=True):
+            self._flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'size': len(self),
+            'capacity': len(self._vectors),
+            'partitions': len(self._centroids) if self._centroids is not None else 0,
+            'searches': self.searches,
+            'duplicates_flagged': self.duplicates_flagged,
+            'resets': self.resets,
+            'mean_search_ms': self._search_time * 1000 / self.searches if self.searches else 0.0
+        }
+
+    @contextmanager
+    def _locked(self, shared: bool = False) -> Iterator[None]:
+        with self._lock:
+            self._file_lock.acquire(shared=shared)
+            try:
+                self._refresh()
+                yield
+            finally:
+                self._file_lock.release()
+
+    def _refresh(self) -> None:
+        """Catch up with what other processes wrote since this one last held the lock"""
+        meta = self._read_meta()
+        if meta is not None and meta.get('generation', 0) != self.generation:
+            # Reset by another process: the files were replaced
+            self.model_hash = meta['model_hash']
+            self.generation = meta.get('generation', 0)
+            self._open()
+            return
+        capacity = (os.path.getsize(self._file("vectors.f32")) - self.HEADER_BYTES) // (self.dim * 4)
+        if capacity != len(self._vectors):
+            del self._header, self._vectors, self._hashes, self._lists
+            self._open(rebuild_members=False)
+        if self._centroids is None:
+            if os.path.exists(self._file("centroids.npy")):
+                self._centroids = np.load(self._file("centroids.npy"))
+                self.nlist = len(self._centroids)
+                self._build_members()
+            self._synced = len(self)
+            return
+        for row in range(self._synced, len(self)):
+            self._append_member(int(self._lists[row]), row)
+        self._synced = len(self)
+
+    def _search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        start = time.perf_counter()
+        count = len(self)
+        if count == 0:
+            rows = np.empty(0, dtype=np.int64)
+            similarities = np.empty(0, dtype=np.float32)
+        elif self._centroids is None:
+            rows = None
+            similarities = self._vectors[:count] @ query
+        else:
+            probes = np.argsort(self._centroids @ query)[-self.nprobe:]
+            rows = np.concatenate([self._members[p][:self._member_counts[p]] for p in probes])
+            similarities = self._vectors[rows] @ query
+
+        if len(similarities) > k:
+            top = np.argpartition(similarities, -k)[-k:]
+        else:
+            top = np.arange(len(similarities))
+        top = top[np.argsort(similarities[top])[::-1]]
+        hits = rows[top] if rows is not None else top
+
+        self.searches += 1
+        self._search_time += time.perf_counter() - start
+        return [(self._hashes[row].tobytes().hex(), float(similarities[i])) for row, i in zip(hits, top)]
+
+    def _add(self, content_hash: str, vector: np.ndarray) -> None:
+        row = len(self)
+        if row == len(self._vectors):
+            self._grow(2 * len(self._vectors))
+        self._vectors[row] = vector
+        self._hashes[row] = np.frombuffer(bytes.fromhex(content_hash), dtype=np.uint8)
+        if self._centroids is not None:
+            partition = int(np.argmax(self._centroids @ vector))
+            self._lists[row] = partition
+            self._append_member(partition, row)
+        else:
+            self._lists[row] = -1
+        # Bump the count last so a crash mid-insert leaves the previous state
+        self._header[0] = row + 1
+        self._synced = row + 1
+
+        if self._centroids is None and row + 1 >= self.train_threshold:
+            self._train()
+
+    def _train(self, iterations: int = 10) -> None:
+        """Spherical k-means on a sample, then assign every stored vector once"""
+        count = len(self)
+        rng = np.random.default_rng(0)
+        sample_size = min(count, self.nlist * 64)
+        sample = self._vectors[np.sort(rng.choice(count, sample_size, replace=False))]
+        centroids = sample[rng.choice(sample_size, self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Keep the previous centroid for partitions that lost all members
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        for start in range(0, count, 65536):
+            block = self._vectors[start:start + 65536]
+            self._lists[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        self._centroids = centroids.astype(np.float32)
+        tmp_path = self._file("centroids.tmp.npy")
+        np.save(tmp_path, self._centroids)
+        os.replace(tmp_path, self._file("centroids.npy"))
+        self._build_members()
+
+    def _build_members(self) -> None:
+        count = len(self)
+        lists = np.asarray(self._lists[:count])
+        order = np.argsort(lists, kind='stable')
+        sizes = np.bincount(lists, minlength=self.nlist)
+        bounds = np.concatenate([[0], np.cumsum(sizes)])
+        self._members = [order[bounds[i]:bounds[i + 1]].copy() for i in range(self.nlist)]
+        self._member_counts = sizes.copy()
+        self._synced = count
+
+    def _append_member(self, partition: int, row: int) -> None:
+        members = self._members[partition]
+        size = self._member_counts[partition]
+        if size == len(members):
+            members = np.resize(members, max(16, 2 * len(members)))
+            self._members[partition] = members
+        members[size] = row
+        self._member_counts[partition] = size + 1
+
+    def _normalize(self, vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._file("meta.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _reset(self, model_hash: Optional[str]) -> None:
+        if getattr(self, 'model_hash', None) is not None:
+            self.resets += 1
+        meta = self._read_meta()
+        self.generation = (meta.get('generation', 0) if meta is not None else 0) + 1
+        for name in ("vectors.f32", "hashes.bin", "lists.i32", "centroids.npy"):
+            if os.path.exists(self._file(name)):
+                os.remove(self._file(name))
+        self._resize_files(self.initial_capacity)
+        self.model_hash = model_hash
+        tmp_path = self._file("meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({'dim': self.dim, 'model_hash': model_hash, 'generation': self.generation}, f)
+        os.replace(tmp_path, self._file("meta.json"))
+        self._open()
+
+    def _resize_files(self, capacity: int) -> None:
+        sizes = {
+            "vectors.f32": self.HEADER_BYTES + capacity * self.dim * 4,
+            "hashes.bin": capacity * self.HASH_BYTES,
+            "lists.i32": capacity * 4
+        }
+        for name, size in sizes.items():
+            with open(self._file(name), "ab") as f:
+                f.truncate(size)
+
+    def _grow(self, capacity: int) -> None:
+        self._flush()
+        del self._header, self._vectors, self._hashes, self._lists
+        self._resize_files(capacity)
+        self._open(rebuild_members=False)
+
+    def _flush(self) -> None:
+        for array in (self._header, self._vectors, self._hashes, self._lists):
+            array.flush()
+
+    def _open(self, rebuild_members: bool = True) -> None:
+        vectors_path = self._file("vectors.f32")
+        capacity = (os.path.getsize(vectors_path) - self.HEADER_BYTES) // (self.dim * 4)
+        self._header = np.memmap(vectors_path, dtype=np.uint64, mode="r+", shape=(1,))
+        self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+",
+                                  offset=self.HEADER_BYTES, shape=(capacity, self.dim))
+        self._hashes = np.memmap(self._file("hashes.bin"), dtype=np.uint8, mode="r+",
+                                 shape=(capacity, self.HASH_BYTES))
+        self._lists = np.memmap(self._file("lists.i32"), dtype=np.int32, mode="r+", shape=(capacity,))
+        if not rebuild_members:
+            return
+        self._centroids = None
+        self._members: List[np.ndarray] = []
+        self._member_counts = np.zeros(0, dtype=np.int64)
+        self._synced = len(self)
+        if os.path.exists(self._file("centroids.npy")):
+            self._centroids = np.load(self._file("centroids.npy"))
+            self.nlist = len(self._centroids)
+            self._build_members()
@@ -1,38 +1,228 @@
-from typing import Dict, Any, Tuple
+from concurrent.futures import Executor
+import torch
+from typing import Dict, Any, List, Optional, Tuple
+from ..metrics import stage
 from .model import ContentProcessor
-from .zk_circuits import ZKProofGenerator
-import hashlib
-import json
+from .batching import BatchingInferenceEngine
+from .cache import VerificationCache
+from .proof_jobs import ProofJobQueue, COMPLETED, FAILED
+from .registry import ModelRegistry
+from .similarity import FeatureIndex
+from .zk_circuits import PROVER_BACKENDS, ZKProofGenerator, prove_in_worker
 
 class ContentVerifier:
-    def __init__(self, model_path: str, circuits_path: str):
-        self.processor = ContentProcessor(model_path)
-        self.zk_generator = ZKProofGenerator(circuits_path)
+    def __init__(self, model_path: str, circuits_path: str,
+                 max_batch_size: int = 1, max_wait_ms: float = 0.0,
+                 proof_executor: Optional[Executor] = None,
+                 cache: Optional[VerificationCache] = None,
+                 proof_jobs: Optional[ProofJobQueue] = None,
+                 feature_index: Optional[FeatureIndex] = None,
+                 inference_backend: str = "eager",
+                 inference_threads: int = 0,
+                 parity_tolerance: Optional[float] = 0.02,
+                 model_versions: int = 2,
+                 models: Optional[ModelRegistry] = None,
+                 prover_backend: str = "mock"):
+        # Model versions are loaded through the registry so they can be hot-swapped;
+        # a registry preloaded by a pre-fork parent is used as is
+        self.models = models
+        if self.models is None:
+            if inference_threads:
+                # Process-wide; ContentProcessor only passes it to backends with their own runtime
+                torch.set_num_threads(inference_threads)
+            self.models = ModelRegistry(
+                lambda path: ContentProcessor(
+                    path,
+                    backend=inference_backend,
+                    num_threads=inference_threads,
+                    parity_tolerance=parity_tolerance
+                ),
+                max_resident=model_versions
+            )
+            self.models.load_and_activate(model_path)
+        # Optional process pool for proof generation, off the calling thread; its
+        # workers must be started with zk_circuits.init_proof_worker
+        self.proof_executor = proof_executor
+        # Proofs are only generated here when neither the pool nor the job queue takes them
+        self.zk_generator = None
+        if proof_executor is None and proof_jobs is None:
+            self.zk_generator = ZKProofGenerator(circuits_path, PROVER_BACKENDS[prover_backend](circuits_path))
+        # Concurrent requests share forward passes when batching is enabled
+        self.inference_engine = None
+        if max_batch_size > 1:
+            self.inference_engine = BatchingInferenceEngine(self.processor, max_batch_size, max_wait_ms)
+        # Results depend only on (content_hash, model_hash), so resubmissions are cached
+        self.cache = cache
+        # When set, proofs are queued for the prover workers instead of generated inline
+        self.proof_jobs = proof_jobs
+        # Near-duplicate lookup over the encoder's feature vectors
+        self.feature_index = feature_index
+    
+    @property
+    def processor(self) -> ContentProcessor:
+        """The active model version's processor"""
+        return self.models.active.processor
     
     def verify_content(self, content: str, creator_address: str) -> Tuple[Dict[str, Any], str]:
         """Verify content and generate ZK proof"""
-        # Process content with AI model
-        verification_data = self.processor.process_content(content)
+        # Pinned for the whole request, so a model swap never mixes versions
+        processor = self.processor
+        with stage("cache_lookup"):
+            cached = self._get_cached(processor._hash_content(content), processor.model_hash)
         
-        # Generate ZK proof
-        zk_proof = self.zk_generator.generate_verification_proof(
-            verification_data['content_hash'],
-            verification_data['model_hash'],
-            verification_data
-        )
+        if cached is not None:
+            verification_data, zk_proof = cached['verification_data'], cached['zk_proof']
+        else:
+            # Process content with AI model
+            with stage("inference"):
+                if self.inference_engine is not None:
+                    verification_data = self.inference_engine.process_content(content, processor)
+                else:
+                    verification_data = processor.process_content(content)
+            
+            # Generate ZK proof
+            with stage("proof"):
+                zk_proof = self._generate_proof(verification_data)
+            self._put_cached(verification_data, zk_proof)
+        
+        return self._build_record(verification_data, zk_proof, creator_address), verification_data['content_hash']
+    
+    def verify_digest(self, digest: bytes, creator_address: str) -> Tuple[Dict[str, Any], str]:
+        """Verify content known only by its SHA-256 digest (see ContentProcessor.process_digests)"""
+        processor = self.processor
+        with stage("cache_lookup"):
+            cached = self._get_cached(digest.hex(), processor.model_hash)
+        
+        if cached is not None:
+            verification_data, zk_proof = cached['verification_data'], cached['zk_proof']
+        else:
+            with stage("inference"):
+                verification_data = processor.process_digests([digest])[0]
+            with stage("proof"):
+                zk_proof = self._generate_proof(verification_data)
+            self._put_cached(verification_data, zk_proof)
         
-        # Create verification record
-        verification_record = {
+        return self._build_record(verification_data, zk_proof, creator_address), verification_data['content_hash']
+    
+    def verify_batch(self, submissions: List[Tuple[str, str]]) -> List[Tuple[Dict[str, Any], str]]:
+        """Verify (content, creator_address) pairs with one forward pass for all cache misses"""
+        processor = self.processor
+        with stage("cache_lookup"):
+            cached = [self._get_cached(processor._hash_content(content), processor.model_hash)
+                      for content, _ in submissions]
+        misses = [i for i, entry in enumerate(cached) if entry is None]
+        
+        if misses:
+            with stage("inference"):
+                batch_data = processor.process_batch([submissions[i][0] for i in misses])
+            with stage("proof"):
+                if self.proof_jobs is not None:
+                    proofs = [self._enqueue_proof(data) for data in batch_data]
+                elif self.proof_executor is not None:
+                    futures = [self.proof_executor.submit(prove_in_worker, *self._proof_args(data))
+                               for data in batch_data]
+                    proofs = [future.result() for future in futures]
+                else:
+                    proofs = [self._generate_proof(data) for data in batch_data]
+            
+            for i, verification_data, zk_proof in zip(misses, batch_data, proofs):
+                self._put_cached(verification_data, zk_proof)
+                cached[i] = {'verification_data': verification_data, 'zk_proof': zk_proof}
+        
+        return [
+            (self._build_record(entry['verification_data'], entry['zk_proof'], creator_address),
+             entry['verification_data']['content_hash'])
+            for entry, (_, creator_address) in zip(cached, submissions)
+        ]
+    
+    def _build_record(self, verification_data: Dict[str, Any], zk_proof: Dict[str, Any],
+                      creator_address: str) -> Dict[str, Any]:
+        """Create verification record"""
+        return {
             'content_hash': verification_data['content_hash'],
             'creator_address': creator_address,
             'model_hash': verification_data['model_hash'],
             'verification_data': verification_data,
             'zk_proof': zk_proof,
+            'proof_job_id': zk_proof.get('job_id'),
+            'near_duplicates': self._near_duplicates(verification_data),
             'is_verified': verification_data['is_ai_assisted'],
             'timestamp': None  # Will be set when saved to DB
         }
+    
+    def _near_duplicates(self, verification_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Previously verified content whose features are above the similarity threshold"""
+        if self.feature_index is None or self._is_stale(verification_data):
+            return []
+        return self.feature_index.check_and_add(
+            verification_data['content_hash'],
+            verification_data['model_hash'],
+            verification_data['feature_vector'][0]
+        )
+    
+    def _is_stale(self, verification_data: Dict[str, Any]) -> bool:
+        # Requests still finishing on a swapped-out version must not reset the
+        # cache or index, which both track the active fingerprint
+        return verification_data['model_hash'] != self.processor.model_hash
+    
+    def _get_cached(self, content_hash: str, model_hash: str) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return None
+        entry = self.cache.get(content_hash, model_hash)
+        if entry is None or self.proof_jobs is None or 'job_id' not in entry['zk_proof']:
+            return entry
         
-        return verification_record, verification_data['content_hash']
+        # Swap a finished job's proof into the cache; re-verify if the job failed
+        job = self.proof_jobs.get(entry['zk_proof']['job_id'])
+        if job is None or job['status'] == FAILED:
+            return None
+        if job['status'] == COMPLETED:
+            entry = {'verification_data': entry['verification_data'], 'zk_proof': job['result']}
+            self._put_cached(entry['verification_data'], entry['zk_proof'])
+        return entry
+    
+    def _put_cached(self, verification_data: Dict[str, Any], zk_proof: Dict[str, Any]) -> None:
+        if self.cache is not None and not self._is_stale(verification_data):
+            self.cache.put(
+                verification_data['content_hash'],
+                verification_data['model_hash'],
+                {'verification_data': verification_data, 'zk_proof': zk_proof}
+            )
+    
+    def _proof_args(self, verification_data: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        return (
+            verification_data['content_hash'],
+            verification_data['model_hash'],
+            verification_data
+        )
+    
+    def _enqueue_proof(self, verification_data: Dict[str, Any]) -> Dict[str, Any]:
+        circuit_input = ZKProofGenerator.build_circuit_input(*self._proof_args(verification_data))
+        job_id = self.proof_jobs.submit(
+            verification_data['content_hash'],
+            verification_data['model_hash'],
+            circuit_input
+        )
+        return {'status': 'pending', 'job_id': job_id}
+    
+    def _generate_proof(self, verification_data: Dict[str, Any]) -> Dict[str, Any]:
+        if self.proof_jobs is not None:
+            return self._enqueue_proof(verification_data)
+        args = self._proof_args(verification_data)
+        if self.proof_executor is not None:
+            return self.proof_executor.submit(prove_in_worker, *args).result()
+        return self.zk_generator.generate_verification_proof(*args)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Runtime statistics for tuning throughput against latency"""
+        return {
+            'inference': self.inference_engine.get_stats() if self.inference_engine else None,
+            'backend': {'name': self.processor.backend.name, 'parity': self.processor.parity},
+            'models': self.models.get_stats(),
+            'cache': self.cache.get_stats() if self.cache else None,
+            'duplicates': self.feature_index.get_stats() if self.feature_index else None,
+            'circuits': self.zk_generator.get_stats() if self.zk_generator else None
+        }
     
     def validate_proof(self, proof_data: Dict[str, Any]) -> bool:
         """Validate ZK proof (simplified)"""
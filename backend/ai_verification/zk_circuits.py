@@ -1,12 +1,177 @@
+import hashlib
 import json
+import mmap
 import subprocess
-import tempfile
+import threading
+import time
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-class ZKProofGenerator:
+from ..metrics import stage
+
+CIRCUIT_NAME = "content_verification"
+
+class CircuitArtifacts:
+    """Compiled artifacts for one circuit under ``build/<name>/``, mapped into memory once at startup"""
+    
+    def __init__(self, circuits_path: str, circuit_name: str = CIRCUIT_NAME):
+        self.circuit_name = circuit_name
+        self.build_dir = os.path.join(circuits_path, "build", circuit_name)
+        self.paths = {
+            'wasm': os.path.join(self.build_dir, f"{circuit_name}.wasm"),
+            'r1cs': os.path.join(self.build_dir, f"{circuit_name}.r1cs"),
+            'zkey': os.path.join(self.build_dir, f"{circuit_name}.zkey"),
+            'verification_key': os.path.join(self.build_dir, "verification_key.json")
+        }
+        self.buffers: Dict[str, mmap.mmap] = {}
+        self.verification_key: Dict[str, Any] = {}
+        self.load_time_ms = 0.0
+    
+    def load(self) -> "CircuitArtifacts":
+        """Validate and map all artifacts; raises FileNotFoundError listing anything missing"""
+        missing = [path for path in self.paths.values() if not os.path.isfile(path)]
+        if missing:
+            raise FileNotFoundError(f"Missing circuit artifacts for {self.circuit_name}: {', '.join(missing)}")
+        
+        started = time.perf_counter()
+        for kind in ('wasm', 'r1cs', 'zkey'):
+            with open(self.paths[kind], 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(buffer, 'madvise'):
+                buffer.madvise(mmap.MADV_WILLNEED)
+            self.buffers[kind] = buffer
+        with open(self.paths['verification_key']) as f:
+            self.verification_key = json.load(f)
+        self.load_time_ms = (time.perf_counter() - started) * 1000.0
+        return self
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'circuit': self.circuit_name,
+            'load_time_ms': self.load_time_ms,
+            'sizes': {kind: len(buffer) for kind, buffer in self.buffers.items()}
+        }
+
+class ProverBackend:
+    """Produces a proof for a circuit input; subclasses hold whatever state proving needs"""
+    
     def __init__(self, circuits_path: str):
         self.circuits_path = circuits_path
+        self.artifacts: Optional[CircuitArtifacts] = None
+    
+    def load(self) -> None:
+        """Load long-lived state (artifacts, keys) once before the first proof"""
+    
+    def prove(self, circuit_name: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'backend': type(self).__name__,
+            'artifacts': self.artifacts.get_stats() if self.artifacts else None
+        }
+
+class MockProver(ProverBackend):
+    """Stand-in prover for local development"""
+    
+    def prove(self, circuit_name: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        # This would normally compile the circuit and generate proofs
+        # For this example, we'll return mock data
+        return {
+            "proof": {
+                "pi_a": ["mock_proof_a_1", "mock_proof_a_2"],
+                "pi_b": [["mock_proof_b_1", "mock_proof_b_2"], ["mock_proof_b_3", "mock_proof_b_4"]],
+                "pi_c": ["mock_proof_c_1", "mock_proof_c_2"],
+                "protocol": "groth16"
+            },
+            "public_signals": [
+                str(input_data["content_hash"]),
+                str(input_data["is_verified"])
+            ]
+        }
+
+class SnarkjsProver(ProverBackend):
+    """Groth16 proving through a resident snarkjs process (circuits/prover.js)"""
+    
+    # Python-side input names -> circuit signal names
+    SIGNALS = {
+        "content_hash": "contentHash",
+        "model_hash": "modelHash",
+        "verification_score": "verificationScore",
+        "threshold": "threshold",
+        "is_verified": "isVerified"
+    }
+    
+    def __init__(self, circuits_path: str, circuit_name: str = CIRCUIT_NAME):
+        super().__init__(circuits_path)
+        self.circuit_name = circuit_name
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self.process_load_time_ms = 0.0
+    
+    def load(self) -> None:
+        self.artifacts = CircuitArtifacts(self.circuits_path, self.circuit_name).load()
+        self._start_process()
+    
+    def prove(self, circuit_name: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        request = {self.SIGNALS.get(key, key): str(value) for key, value in input_data.items()}
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start_process()
+            self._process.stdin.write(json.dumps(request) + "\n")
+            self._process.stdin.flush()
+            line = self._process.stdout.readline()
+        
+        if not line:
+            raise RuntimeError("snarkjs prover exited unexpectedly")
+        response = json.loads(line)
+        if 'error' in response:
+            raise RuntimeError(f"snarkjs proving failed: {response['error']}")
+        return {"proof": response["proof"], "public_signals": response["public_signals"]}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {**super().get_stats(), 'process_load_time_ms': self.process_load_time_ms}
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pipes and mappings stay with the owning process; a pickled copy
+        # reloads on its first proof (process pools use init_proof_worker)
+        state = self.__dict__.copy()
+        state.update(_process=None, _lock=None, artifacts=None)
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def _start_process(self) -> None:
+        if self.artifacts is None:
+            self.artifacts = CircuitArtifacts(self.circuits_path, self.circuit_name).load()
+        self._process = subprocess.Popen(
+            ["node", os.path.join(self.circuits_path, "prover.js"),
+             self.artifacts.paths['wasm'], self.artifacts.paths['zkey']],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True
+        )
+        # The helper prints one ready line once the artifacts are in memory
+        ready = json.loads(self._process.stdout.readline() or '{}')
+        if not ready.get('ready'):
+            raise RuntimeError("snarkjs prover failed to start")
+        self.process_load_time_ms = ready.get('load_time_ms', 0.0)
+
+PROVER_BACKENDS = {
+    "mock": MockProver,
+    "snarkjs": SnarkjsProver
+}
+
+class ZKProofGenerator:
+    def __init__(self, circuits_path: str, prover: Optional[ProverBackend] = None):
+        self.circuits_path = circuits_path
+        self.prover = prover or MockProver(circuits_path)
+        # Load and validate artifacts up front rather than on the first proof
+        started = time.perf_counter()
+        self.prover.load()
+        self.load_time_ms = (time.perf_counter() - started) * 1000.0
     
     def generate_verification_proof(self, 
                                   content_hash: str,
@@ -15,17 +180,28 @@ class ZKProofGenerator:
         """
         Generate ZK proof for content verification without revealing model details
         """
-        # Create input for ZK circuit
-        circuit_input = {
-            "content_hash": self._str_to_field_element(content_hash),
-            "model_hash": self._str_to_field_element(model_hash),
+        with stage("proof_input"):
+            circuit_input = self.build_circuit_input(content_hash, model_hash, verification_data)
+        return self.prove(circuit_input)
+    
+    @staticmethod
+    def build_circuit_input(content_hash: str,
+                            model_hash: str,
+                            verification_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create input for ZK circuit (needs no prover, so callers that only queue proofs skip loading one)"""
+        return {
+            "content_hash": ZKProofGenerator._str_to_field_element(content_hash),
+            "model_hash": ZKProofGenerator._str_to_field_element(model_hash),
             "verification_score": int(verification_data['verification_scores'][0][1] * 10000),
             "threshold": 5000,  # 0.5 * 10000
             "is_verified": 1 if verification_data['is_ai_assisted'] else 0
         }
-        
+    
+    def prove(self, circuit_input: Dict[str, Any]) -> Dict[str, Any]:
+        """Prove a circuit input built by build_circuit_input"""
         # Generate proof using circom (simplified - actual implementation would use circomlib)
-        proof_data = self._generate_circom_proof("content_verification", circuit_input)
+        with stage("prove"):
+            proof_data = self._generate_circom_proof(CIRCUIT_NAME, circuit_input)
         
         return {
             "proof": proof_data["proof"],
@@ -33,34 +209,27 @@ class ZKProofGenerator:
             "circuit_input": circuit_input
         }
     
-    def _str_to_field_element(self, s: str) -> int:
+    def get_stats(self) -> Dict[str, Any]:
+        return {'load_time_ms': self.load_time_ms, **self.prover.get_stats()}
+    
+    @staticmethod
+    def _str_to_field_element(s: str) -> int:
         """Convert string to field element for ZK circuits"""
         return int(hashlib.sha256(s.encode()).hexdigest()[:16], 16)
     
     def _generate_circom_proof(self, circuit_name: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Generate proof using circom and snarkjs
-        This is a simplified version - in production, you'd use proper circuit compilation
-        """
-        # Write input to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(input_data, f)
-            input_file = f.name
-        
-        try:
-            # This would normally compile the circuit and generate proofs
-            # For this example, we'll return mock data
-            return {
-                "proof": {
-                    "pi_a": ["mock_proof_a_1", "mock_proof_a_2"],
-                    "pi_b": [["mock_proof_b_1", "mock_proof_b_2"], ["mock_proof_b_3", "mock_proof_b_4"]],
-                    "pi_c": ["mock_proof_c_1", "mock_proof_c_2"],
-                    "protocol": "groth16"
-                },
-                "public_signals": [
-                    str(input_data["content_hash"]),
-                    str(input_data["is_verified"])
-                ]
-            }
-        finally:
-            os.unlink(input_file)
\ No newline at end of file
+        """Generate proof using circom and snarkjs, through the configured prover backend"""
+        return self.prover.prove(circuit_name, input_data)
+
+# This process's generator when it is a proof-pool worker (see init_proof_worker)
+_worker_generator: Optional[ZKProofGenerator] = None
+
+def init_proof_worker(circuits_path: str, backend: str = "mock") -> None:
+    """ProcessPoolExecutor initializer: load the prover once per worker process"""
+    global _worker_generator
+    _worker_generator = ZKProofGenerator(circuits_path, PROVER_BACKENDS[backend](circuits_path))
+
+def prove_in_worker(content_hash: str, model_hash: str, verification_data: Dict[str, Any]) -> Dict[str, Any]:
+    if _worker_generator is None:
+        raise RuntimeError("Proof worker was not started with init_proof_worker")
+    return _worker_generator.generate_verification_proof(content_hash, model_hash, verification_data)
@@ -0,0 +1,66 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from ..metrics import REGISTRY
+
+REQUESTS_SHED = REGISTRY.counter(
+    "content_marketplace_requests_shed_total",
+    "Requests rejected by admission control",
+    ["reason"]
+)
+
+class Overloaded(Exception):
+    """A stage is saturated; the caller should retry after ``retry_after`` seconds"""
+
+    def __init__(self, stage: str, retry_after: float, status_code: int = 503):
+        super().__init__(f"{stage} is overloaded")
+        self.stage = stage
+        self.retry_after = retry_after
+        self.status_code = status_code
+        REQUESTS_SHED.inc(stage)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+class TokenBucketLimiter:
+    """Per-key token buckets (e.g. one per creator address)"""
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.allowed = 0
+        self.rejected = 0
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, cost: float = 1.0) -> None:
+        """Take ``cost`` tokens from the key's bucket or raise Overloaded (429)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+            admitted = tokens >= cost
+            if admitted:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            if admitted:
+                self.allowed += 1
+                return
+            self.rejected += 1
+        raise Overloaded("rate_limit", (cost - tokens) / self.rate, status_code=429)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'rate': self.rate,
+            'burst': self.burst,
+            'tracked_keys': len(self._buckets),
+            'allowed': self.allowed,
+            'rejected': self.rejected
+        }
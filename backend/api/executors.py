@@ -0,0 +1,144 @@
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from ..metrics import REGISTRY
+from .admission import Overloaded
+
+STAGE_QUEUE_DEPTH = REGISTRY.gauge(
+    "content_marketplace_stage_queue_depth",
+    "Calls waiting for a slot in each stage pool",
+    ["stage"]
+)
+
+class StagePool:
+    """Runs blocking calls for one pipeline stage off the event loop, with its own concurrency and queue limits"""
+
+    def __init__(self, name: str, executor: Executor, max_concurrency: int, max_queue: int = 0):
+        self.name = name
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        # Moving average of a call's duration, for Retry-After estimates
+        self.mean_service_time = 0.0
+
+    def admit(self) -> None:
+        """Raise Overloaded if a new call would exceed the wait queue"""
+        if self.max_queue and self.active >= self.max_concurrency and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded(self.name, self.mean_service_time * (self.waiting + 1) / self.max_concurrency)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        self.admit()
+        return await self.run_queued(fn, *args, **kwargs)
+
+    async def run_queued(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Like ``run``, but always waits for a slot (for already-admitted work)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.waiting += 1
+        STAGE_QUEUE_DEPTH.inc(self.name)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+            STAGE_QUEUE_DEPTH.dec(self.name)
+
+        self.active += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            # Carry context variables (e.g. the sampled trace) into the worker thread
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(self.executor, context.run, functools.partial(fn, *args, **kwargs))
+        finally:
+            self.mean_service_time += 0.1 * ((time.perf_counter() - started) - self.mean_service_time)
+            self.active -= 1
+            self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'active': self.active,
+            'waiting': self.waiting,
+            'rejected': self.rejected,
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue,
+            'mean_service_ms': self.mean_service_time * 1000.0
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait)
+
+class ExecutorPools:
+    """Thread pools for the verify and mint routes plus a process pool for proving"""
+
+    def __init__(self,
+                 verify_workers: int = 8,
+                 mint_workers: int = 4,
+                 proof_workers: int = 0,
+                 max_concurrent_verifications: int = 32,
+                 max_concurrent_mints: int = 4,
+                 verify_queue: int = 0,
+                 mint_queue: int = 0,
+                 circuits_path: str = "./circuits",
+                 prover_backend: str = "mock"):
+        self.verify = StagePool(
+            "verify",
+            ThreadPoolExecutor(max_workers=verify_workers, thread_name_prefix="verify"),
+            max_concurrent_verifications,
+            verify_queue
+        )
+        self.mint = StagePool(
+            "mint",
+            ThreadPoolExecutor(max_workers=mint_workers, thread_name_prefix="mint"),
+            max_concurrent_mints,
+            mint_queue
+        )
+        # Proof generation is CPU-bound Python, so it gets real processes.
+        # Spawned (not forked) workers avoid inheriting torch's thread state;
+        # each loads its prover once, in the initializer.
+        self.proof_executor: Optional[ProcessPoolExecutor] = None
+        if proof_workers > 0:
+            from ..ai_verification.zk_circuits import init_proof_worker
+
+            self.proof_executor = ProcessPoolExecutor(
+                max_workers=proof_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_proof_worker,
+                initargs=(circuits_path, prover_backend)
+            )
+
+    @classmethod
+    def from_config(cls, config) -> "ExecutorPools":
+        return cls(
+            verify_workers=config.VERIFY_THREAD_WORKERS,
+            mint_workers=config.MINT_THREAD_WORKERS,
+            proof_workers=config.PROOF_PROCESS_WORKERS,
+            max_concurrent_verifications=config.MAX_CONCURRENT_VERIFICATIONS,
+            max_concurrent_mints=config.MAX_CONCURRENT_MINTS,
+            verify_queue=config.VERIFY_QUEUE_LIMIT,
+            mint_queue=config.MINT_QUEUE_LIMIT,
+            circuits_path=config.CIRCUITS_PATH,
+            prover_backend=config.PROVER_BACKEND
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'verify': self.verify.get_stats(),
+            'mint': self.mint.get_stats()
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.verify.shutdown(wait)
+        self.mint.shutdown(wait)
+        if self.proof_executor is not None:
+            self.proof_executor.shutdown(wait=wait)
@@ -1,5 +1,69 @@
+import time
 
-"""Middleware helpers (placeholder)."""
+from starlette.routing import Match
+
+from ..config import config
+from ..metrics import REGISTRY, TRACER, configure
+
+HTTP_SECONDS = REGISTRY.histogram(
+    "content_marketplace_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"]
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "content_marketplace_http_requests_in_flight",
+    "HTTP requests currently being served"
+)
+
+def _route_template(scope) -> str:
+    # Newer Starlette records the matched route; otherwise match it here
+    route = scope.get("route")
+    if route is None and "app" in scope:
+        for candidate in scope["app"].router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    if route is None:
+        return "unmatched"
+
+    # Routes of an included router may carry their path without the prefix
+    try:
+        concrete = route.path_format.format(**scope.get("path_params", {}))
+    except (AttributeError, KeyError, IndexError):
+        return getattr(route, "path", "unmatched")
+    path = scope["path"]
+    prefix = path[:-len(concrete)] if concrete and path.endswith(concrete) else ""
+    return prefix + route.path
+
+class MetricsMiddleware:
+    """Per-route latency histogram, in-flight gauge and a sampled trace per request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            with TRACER.trace(f"{scope['method']} {scope['path']}"):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            HTTP_SECONDS.observe(time.perf_counter() - started, scope["method"], _route_template(scope), str(status))
 
 def attach_middlewares(app):
-    pass
+    configure(config.METRICS_ENABLED, config.TRACE_SAMPLE_RATE, config.TRACE_BUFFER_SIZE)
+    if config.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+class CachedResponse:
+    """A response body with its precomputed ETag"""
+
+    __slots__ = ('body', 'etag')
+
+    def __init__(self, body: Any):
+        self.body = body
+        encoded = json.dumps(body, sort_keys=True, separators=(",", ":")).encode()
+        self.etag = '"' + hashlib.sha256(encoded).hexdigest()[:32] + '"'
+
+class ReadThroughCache:
+    """Bounded LRU with TTL and single-flight loads in front of database reads"""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, CachedResponse]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get_or_load(self, key: Hashable,
+                          loader: Callable[[], Awaitable[Any]]) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+            self.evictions += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader))
+            # Mark failures retrieved so ones nobody waited for are not logged as unhandled
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Optional[CachedResponse]:
+        task = asyncio.current_task()
+        try:
+            body = await loader()
+            response = CachedResponse(body) if body is not None else None
+            # Skip the insert if the key was invalidated while loading
+            if response is not None and self._inflight.get(key) is task:
+                self._put(key, response)
+            return response
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        self._inflight.pop(key, None)
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._inflight.clear()
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations
+        }
+
+    def _put(self, key: Hashable, response: CachedResponse) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+class SharedInvalidations:
+    """Read-cache invalidations shared by pre-forked workers"""
+
+    _SEQUENCE = struct.Struct("<Q")
+    # Publishing pid, key length, key
+    _SLOT = struct.Struct("<iH122s")
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._map = mmap.mmap(-1, self._SEQUENCE.size + capacity * self._SLOT.size)
+        self._lock = multiprocessing.get_context("fork").Lock()
+        self._seen = 0
+        self.published = 0
+        self.received = 0
+        self.overflows = 0
+
+    def publish(self, keys: List[str]) -> None:
+        pid = os.getpid()
+        with self._lock:
+            sequence = self._SEQUENCE.unpack_from(self._map, 0)[0]
+            for key in keys:
+                data = key.encode()[:self._SLOT.size - 6]
+                self._SLOT.pack_into(self._map, self._offset(sequence), pid, len(data), data)
+                sequence += 1
+            # Advance the sequence last, so readers never see a half-written slot
+            self._SEQUENCE.pack_into(self._map, 0, sequence)
+        self.published += len(keys)
+
+    def poll(self) -> Optional[List[str]]:
+        """Keys other processes invalidated since the last poll, or None if some were missed"""
+        if self._SEQUENCE.unpack_from(self._map, 0)[0] == self._seen:
+            return []
+        pid = os.getpid()
+        with self._lock:
+            sequence = self._SEQUENCE.unpack_from(self._map, 0)[0]
+            if sequence - self._seen > self.capacity:
+                self._seen = sequence
+                self.overflows += 1
+                return None
+            keys = []
+            for position in range(self._seen, sequence):
+                owner, length, data = self._SLOT.unpack_from(self._map, self._offset(position))
+                if owner != pid:
+                    keys.append(data[:length].decode())
+            self._seen = sequence
+        self.received += len(keys)
+        return keys
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'published': self.published,
+            'received': self.received,
+            'overflows': self.overflows
+        }
+
+    def _offset(self, position: int) -> int:
+        return self._SEQUENCE.size + (position % self.capacity) * self._SLOT.size
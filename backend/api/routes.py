@@ -1,18 +1,61 @@
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
-from typing import Dict, Any, List
+from fastapi import APIRouter, HTTPException, Depends, File, Form, Query, Request, UploadFile
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import Dict, Any, AsyncIterator, IO, Iterator, List, Optional, Tuple
+from contextlib import asynccontextmanager
+import asyncio
+import codecs
 import datetime
+import hmac
+import json
+import tempfile
 
-from ..ai_verification.verification import ContentVerifier
-from ..nft.minting import NFTMinter
 from ..database.models import Content, NFTMetadata
+from ..database import export, queries
 from ..config import config
+from ..metrics import TRACER, sample_stacks
+from .admission import Overloaded
+from .read_cache import CachedResponse
+from .services import Services
 
 router = APIRouter()
 
-# Dependency injections (would be properly set up in main.py)
-verifier = ContentVerifier(config.MODEL_PATH, config.CIRCUITS_PATH)
-# nft_minter would be initialized with contract
+# Subsystems are built by the lifespan hooks; torch/web3 load in the background
+services = Services(config)
+
+@asynccontextmanager
+async def lifespan(app) -> AsyncIterator[None]:
+    await services.start()
+    try:
+        yield
+    finally:
+        await services.stop()
+
+async def require_ready() -> None:
+    """Hold requests briefly while the model loads; 503 if it takes longer"""
+    if not await services.wait_ready(config.READY_TIMEOUT):
+        raise HTTPException(status_code=503, detail="Service is starting", headers={"Retry-After": "5"})
+
+def _shed(e: Overloaded) -> HTTPException:
+    return HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
+
+def _admit_verification(creator_address: str) -> None:
+    """Rate-limit the creator and refuse work the verify or proving stages can't absorb"""
+    if services.rate_limiter is not None:
+        services.rate_limiter.acquire(creator_address)
+    services.executors.verify.admit()
+    if (services.proof_jobs is not None and config.MAX_PENDING_PROOF_JOBS
+            and services.proof_jobs.pending() >= config.MAX_PENDING_PROOF_JOBS):
+        raise Overloaded("proving", 5.0)
+
+def _admit_mint(creator_address: str) -> None:
+    """Rate-limit the creator and refuse mints while the mint stage or the chain is backed up"""
+    if services.rate_limiter is not None:
+        services.rate_limiter.acquire(creator_address)
+    services.executors.mint.admit()
+    if (services.nft_minter is not None and config.MAX_PENDING_TRANSACTIONS
+            and services.nft_minter.contract.pipeline.in_flight() >= config.MAX_PENDING_TRANSACTIONS):
+        raise Overloaded("transactions", config.RECEIPT_POLL_INTERVAL * 5)
 
 class ContentSubmission(BaseModel):
     content: str
@@ -24,6 +67,14 @@ class VerificationResponse(BaseModel):
     is_verified: bool
     verification_data: Dict[str, Any]
     zk_proof: Dict[str, Any]
+    proof_job_id: Optional[str] = None
+    near_duplicates: List[Dict[str, Any]] = []
+
+class BatchVerificationResult(VerificationResponse):
+    index: int
+
+class ModelReloadRequest(BaseModel):
+    model_path: Optional[str] = None
 
 class MintingRequest(BaseModel):
     content_hash: str
@@ -35,80 +86,537 @@ class MintingResponse(BaseModel):
     metadata_uri: str
     blockchain_address: str
 
-@router.post("/verify", response_model=VerificationResponse)
+@router.post("/verify", response_model=VerificationResponse, dependencies=[Depends(require_ready)])
 async def verify_content(submission: ContentSubmission):
     """Verify content and generate ZK proof"""
     try:
-        verification_record, content_hash = verifier.verify_content(
+        _admit_verification(submission.creator_address)
+        verification_record, content_hash = await services.executors.verify.run(
+            services.verifier.verify_content,
             submission.content,
             submission.creator_address
         )
         
-        # Save to database (simplified)
-        # In production, use proper database session
-        content_record = {
-            'content_hash': content_hash,
-            'original_content': submission.content,
-            'content_type': submission.content_type,
-            'creator_address': submission.creator_address,
-            'ai_model_hash': verification_record['model_hash'],
-            'verification_proof': json.dumps(verification_record['verification_data']),
-            'zk_proof': json.dumps(verification_record['zk_proof']),
-            'verified_at': datetime.datetime.utcnow(),
-            'is_verified': verification_record['is_verified']
-        }
+        await _queue_anchors([verification_record])
+        
+        # Payload and proofs go to the blob store; the write-behind buffer
+        # commits the row in bulk off the request path
+        blobs = await _store_blobs(verification_record, await services.blob_store.write_bytes(submission.content.encode()))
+        services.db_writer.add_content(_content_row(submission.content_type, submission.creator_address,
+                                           verification_record, blobs))
         
         return VerificationResponse(
             content_hash=content_hash,
             is_verified=verification_record['is_verified'],
             verification_data=verification_record['verification_data'],
-            zk_proof=verification_record['zk_proof']
+            zk_proof=verification_record['zk_proof'],
+            proof_job_id=verification_record['proof_job_id'],
+            near_duplicates=verification_record['near_duplicates']
         )
     
+    except Overloaded as e:
+        raise _shed(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
 
-@router.post("/mint", response_model=MintingResponse)
+async def _queue_anchors(verification_records: List[Dict[str, Any]]) -> None:
+    """Queue proofs for on-chain anchoring (queued proof jobs are added when they complete)"""
+    if services.anchor_batcher is None:
+        return
+    leaves = [(record['content_hash'], record['model_hash'], record['zk_proof'])
+              for record in verification_records if record['proof_job_id'] is None]
+    
+    def add_leaves() -> None:
+        for leaf in leaves:
+            services.anchor_batcher.add(*leaf)
+    
+    if leaves:
+        # The batcher writes to SQLite, so keep it off the event loop
+        await asyncio.to_thread(add_leaves)
+
+async def _store_blobs(verification_record: Dict[str, Any], content_blob: Tuple[str, int]) -> Dict[str, Any]:
+    """Write the proofs to the blob store; returns the row's ref/size columns"""
+    verification_blob, zk_blob = await asyncio.gather(
+        services.blob_store.write_bytes(_json_bytes(verification_record['verification_data'])),
+        services.blob_store.write_bytes(_json_bytes(verification_record['zk_proof']))
+    )
+    return {
+        'content_ref': content_blob[0],
+        'content_size': content_blob[1],
+        'verification_proof_ref': verification_blob[0],
+        'verification_proof_size': verification_blob[1],
+        'zk_proof_ref': zk_blob[0],
+        'zk_proof_size': zk_blob[1]
+    }
+
+def _json_bytes(value: Dict[str, Any]) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+
+def _content_row(content_type: str, creator_address: str, verification_record: Dict[str, Any],
+                 blobs: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a database.models.Content row from a verification record and its blob refs"""
+    return {
+        'content_hash': verification_record['content_hash'],
+        'content_type': content_type,
+        'creator_address': creator_address,
+        'ai_model_hash': verification_record['model_hash'],
+        **blobs,
+        'verified_at': datetime.datetime.utcnow(),
+        'is_verified': verification_record['is_verified']
+    }
+
+@router.post("/verify/upload", response_model=VerificationResponse, dependencies=[Depends(require_ready)])
+async def verify_upload(file: UploadFile = File(...),
+                        creator_address: str = Form(...),
+                        content_type: str = Form("text")):
+    """Verify a multipart upload, streamed into the blob store and hashed incrementally"""
+    async def chunks() -> AsyncIterator[bytes]:
+        while True:
+            chunk = await file.read(config.UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    
+    try:
+        # Before reading the body, so shed uploads cost no bandwidth or disk
+        _admit_verification(creator_address)
+        content_blob = await services.blob_store.write_stream(chunks())
+        if services.verifier.processor.feature_extractor.digest_features:
+            # Features only need the digest, so the payload is never loaded
+            verify, content = services.verifier.verify_digest, bytes.fromhex(content_blob[0])
+        else:
+            verify, content = services.verifier.verify_content, (await services.blob_store.read_bytes(content_blob[0])).decode()
+        verification_record, content_hash = await services.executors.verify.run(verify, content, creator_address)
+        
+        await _queue_anchors([verification_record])
+        
+        blobs = await _store_blobs(verification_record, content_blob)
+        services.db_writer.add_content(_content_row(content_type, creator_address, verification_record, blobs))
+        
+        return VerificationResponse(
+            content_hash=content_hash,
+            is_verified=verification_record['is_verified'],
+            verification_data=verification_record['verification_data'],
+            zk_proof=verification_record['zk_proof'],
+            proof_job_id=verification_record['proof_job_id'],
+            near_duplicates=verification_record['near_duplicates']
+        )
+    
+    except Overloaded as e:
+        raise _shed(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
+    finally:
+        await file.close()
+
+async def _spool_body(request: Request) -> IO[bytes]:
+    """Copy the request body into a spooled temp file (memory first, then disk)"""
+    # The body has to be drained before the streaming response starts, since
+    # the response side also listens on the ASGI receive channel
+    spool = tempfile.SpooledTemporaryFile(max_size=config.VERIFY_BATCH_SPOOL_BYTES)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+def _read_submissions(body: IO[bytes], ndjson: bool) -> Iterator[Any]:
+    """Yield raw submission objects from an NDJSON stream or a JSON array body"""
+    if ndjson:
+        for line in body:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        yield from _iter_json_array(body)
+
+def _iter_json_array(body: IO[bytes], block_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yield the elements of a JSON array one at a time, reading the body in blocks"""
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos, eof = "", 0, False
+    
+    def more() -> None:
+        nonlocal buffer, pos, eof
+        block = body.read(block_size)
+        eof = not block
+        buffer, pos = buffer[pos:] + utf8.decode(block, final=eof), 0
+    
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            more()
+    
+    if next_char() != "[":
+        raise ValueError("Expected a JSON array of submissions")
+    pos += 1
+    if next_char() == "]":
+        return
+    while True:
+        next_char()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # A value ending at the buffer's edge (e.g. a number) may continue in the next block
+                if end < len(buffer) or eof:
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            more()
+        pos = end
+        yield item
+        separator = next_char()
+        pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' after array element, got {separator!r}")
+
+@router.post("/verify/batch", dependencies=[Depends(require_ready)])
+async def verify_content_batch(request: Request):
+    """Verify many submissions, streaming one NDJSON result line per item, tagged with its index"""
+    chunk_size = config.VERIFY_BATCH_CHUNK_SIZE
+    ndjson = request.headers.get("content-type", "").startswith("application/x-ndjson")
+    try:
+        services.executors.verify.admit()
+    except Overloaded as e:
+        raise _shed(e)
+    body = await _spool_body(request)
+    
+    def failed(index: int, error: BaseException) -> str:
+        return json.dumps({"index": index, "error": f"Verification failed: {str(error)}"}) + "\n"
+    
+    async def verify_chunk(chunk: List[Tuple[int, ContentSubmission]]) -> List[str]:
+        # Headers are already sent, so failures are reported in-band, per item
+        try:
+            # Admitted once up front; later chunks wait for a slot instead of failing mid-stream
+            results = await services.executors.verify.run_queued(
+                services.verifier.verify_batch,
+                [(submission.content, submission.creator_address) for _, submission in chunk]
+            )
+            await _queue_anchors([verification_record for verification_record, _ in results])
+        except Exception as e:
+            return [failed(index, e) for index, _ in chunk]
+        
+        async def store(submission: ContentSubmission, verification_record: Dict[str, Any]) -> Dict[str, Any]:
+            content_blob = await services.blob_store.write_bytes(submission.content.encode())
+            return await _store_blobs(verification_record, content_blob)
+        
+        blobs = await asyncio.gather(*(
+            store(submission, verification_record) for (_, submission), (verification_record, _) in zip(chunk, results)
+        ), return_exceptions=True)
+        lines = []
+        for (index, submission), (verification_record, content_hash), row_blobs in zip(chunk, results, blobs):
+            if isinstance(row_blobs, BaseException):
+                lines.append(failed(index, row_blobs))
+                continue
+            services.db_writer.add_content(_content_row(submission.content_type, submission.creator_address,
+                                               verification_record, row_blobs))
+            lines.append(BatchVerificationResult(
+                index=index,
+                content_hash=content_hash,
+                is_verified=verification_record['is_verified'],
+                verification_data=verification_record['verification_data'],
+                zk_proof=verification_record['zk_proof'],
+                proof_job_id=verification_record['proof_job_id'],
+                near_duplicates=verification_record['near_duplicates']
+            ).model_dump_json() + "\n")
+        return lines
+    
+    async def results() -> AsyncIterator[str]:
+        chunk: List[Tuple[int, ContentSubmission]] = []
+        parsed = 0
+        body_error = None
+        try:
+            try:
+                for item in _read_submissions(body, ndjson):
+                    index, parsed = parsed, parsed + 1
+                    try:
+                        submission = ContentSubmission.model_validate(item)
+                    except ValidationError as e:
+                        yield json.dumps({"index": index, "error": str(e)}) + "\n"
+                        continue
+                    if services.rate_limiter is not None:
+                        try:
+                            services.rate_limiter.acquire(submission.creator_address)
+                        except Overloaded as e:
+                            yield json.dumps({"index": index, "error": str(e), "retry_after": e.retry_after}) + "\n"
+                            continue
+                    chunk.append((index, submission))
+                    if len(chunk) >= chunk_size:
+                        for line in await verify_chunk(chunk):
+                            yield line
+                        chunk = []
+            except ValueError as e:
+                # Malformed body: the items before it are still verified
+                body_error = json.dumps({"index": parsed, "error": f"Invalid batch body: {str(e)}"}) + "\n"
+            if chunk:
+                for line in await verify_chunk(chunk):
+                    yield line
+            if body_error is not None:
+                yield body_error
+        finally:
+            body.close()
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.post("/mint", response_model=MintingResponse, dependencies=[Depends(require_ready)])
 async def mint_content(request: MintingRequest):
     """Mint verified content as NFT"""
     try:
-        # In production, fetch content record from database
-        # For now, use mock data
-        content_data = {
-            'content_hash': request.content_hash,
-            'creator_address': request.creator_address,
-            'content_type': 'text'
-        }
+        _admit_mint(request.creator_address)
+        content_data, verification_record = await _load_verification_record(request.content_hash)
+        if content_data['creator_address'].lower() != request.creator_address.lower():
+            raise HTTPException(status_code=403, detail="Only the content's creator can mint it")
+        if content_data['nft_token_id'] is not None:
+            raise HTTPException(status_code=409, detail=f"Content already minted as token {content_data['nft_token_id']}")
         
-        verification_record = {
-            'content_hash': request.content_hash,
-            'model_hash': 'mock_model_hash',
-            'verification_data': {'is_ai_assisted': True},
-            'zk_proof': {'proof': 'mock_proof'},
-            'timestamp': datetime.datetime.utcnow()
-        }
+        if services.nft_minter is None:
+            # Mock minting when no contract is configured
+            mock_result = {
+                'token_id': 12345,
+                'transaction_hash': '0x' + 'mock_tx_hash'.zfill(64),
+                'metadata_uri': 'https://ipfs.io/ipfs/Qmmockmetadata',
+                'blockchain_address': '0xmockContractAddress'
+            }
+            return MintingResponse(**mock_result)
         
-        # Mock minting - in production, use actual NFT minter
-        mock_result = {
-            'token_id': 12345,
-            'transaction_hash': '0x' + 'mock_tx_hash'.zfill(64),
-            'metadata_uri': 'https://ipfs.io/ipfs/Qmmockmetadata',
-            'blockchain_address': '0xmockContractAddress'
-        }
+        # Signing and waiting for the receipt block, so run on the mint pool
+        mint_result = await services.executors.mint.run(
+            services.nft_minter.mint_verified_content,
+            content_data,
+            verification_record
+        )
+        
+        services.db_writer.add_nft({
+            'token_id': mint_result['token_id'],
+            'content_hash': request.content_hash,
+            'metadata_uri': mint_result['metadata_uri'],
+            'transaction_hash': mint_result['transaction_hash'],
+            'blockchain_address': config.CONTRACT_ADDRESS,
+            'block_number': mint_result.get('block_number')
+        })
         
-        return MintingResponse(**mock_result)
+        return MintingResponse(
+            token_id=mint_result['token_id'],
+            transaction_hash=mint_result['transaction_hash'],
+            metadata_uri=mint_result['metadata_uri'],
+            blockchain_address=config.CONTRACT_ADDRESS
+        )
     
+    except Overloaded as e:
+        raise _shed(e)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Minting failed: {str(e)}")
 
+async def _load_verification_record(content_hash: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """The persisted content row and verification record (model hash, scores, proof) to mint from"""
+    async with services.db_sessions() as session:
+        row = await queries.get_verification_refs(session, content_hash)
+    if row is None:
+        # Verified moments ago: still buffered, or in a flush another request started
+        await services.db_writer.flush()
+        async with services.db_sessions() as session:
+            row = await queries.get_verification_refs(session, content_hash)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Content not found")
+    
+    verification_data, zk_proof = await asyncio.gather(
+        services.blob_store.read_bytes(row['verification_proof_ref']),
+        services.blob_store.read_bytes(row['zk_proof_ref'])
+    )
+    verification_data, zk_proof = json.loads(verification_data), json.loads(zk_proof)
+    if 'job_id' in zk_proof:
+        # Stored while the proof was still queued; the finished proof lives with the job
+        job = services.proof_jobs.get(zk_proof['job_id']) if services.proof_jobs is not None else None
+        if job is None or job['status'] != 'completed':
+            raise HTTPException(status_code=409, detail="Proof is not ready yet",
+                                headers={"Retry-After": "5"})
+        zk_proof = job['result']
+    
+    content_data = {
+        'content_hash': row['content_hash'],
+        'creator_address': row['creator_address'],
+        'content_type': row['content_type'],
+        'nft_token_id': row['nft_token_id']
+    }
+    verification_record = {
+        'content_hash': row['content_hash'],
+        'model_hash': row['ai_model_hash'],
+        'verification_data': verification_data,
+        'zk_proof': zk_proof,
+        'timestamp': row['verified_at']
+    }
+    return content_data, verification_record
+
+@router.get("/proofs/{job_id}", dependencies=[Depends(require_ready)])
+async def get_proof_job(job_id: str):
+    """Get proof job status and, once completed, the proof"""
+    if services.proof_jobs is None:
+        raise HTTPException(status_code=404, detail="Proof jobs are not enabled")
+    job = services.proof_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Proof job not found")
+    return job
+
+@router.get("/anchors/{content_hash}", dependencies=[Depends(require_ready)])
+async def get_anchor_proof(content_hash: str, model_hash: Optional[str] = None):
+    """Get the Merkle inclusion proof anchoring a verification on-chain (the latest one unless model_hash is given)"""
+    if services.anchor_batcher is None:
+        raise HTTPException(status_code=404, detail="Anchoring is not enabled")
+    proof = await services.executors.verify.run(services.anchor_batcher.get_inclusion_proof, content_hash, model_hash)
+    if proof is None:
+        raise HTTPException(status_code=404, detail="No anchor for content")
+    return proof
+
+def _cached_json(request: Request, cached: Optional[CachedResponse]) -> Response:
+    """Return 304 when the client's If-None-Match matches, else the JSON body with its ETag"""
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match == "*" or cached.etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(cached.body, headers=headers)
+
 @router.get("/content/{content_hash}")
-async def get_content(content_hash: str):
+async def get_content(content_hash: str, request: Request):
     """Get content verification status"""
-    # In production, fetch from database
-    return {"content_hash": content_hash, "status": "verified"}
+    async def load():
+        async with services.db_sessions() as session:
+            return await queries.get_content(session, content_hash)
+    
+    services.sync_invalidations()
+    return _cached_json(request, await services.read_cache.get_or_load(("content", content_hash), load))
+
+def _is_sha256_hex(value: str) -> bool:
+    return len(value) == 64 and all(c in "0123456789abcdef" for c in value)
+
+@router.get("/content/{content_hash}/blob")
+async def get_content_blob(content_hash: str):
+    """Stream the original content from the blob store"""
+    # Content is addressed by the SHA-256 of its bytes, i.e. its content hash
+    if not _is_sha256_hex(content_hash) or not await services.blob_store.exists(content_hash):
+        raise HTTPException(status_code=404, detail="Not found")
+    return StreamingResponse(services.blob_store.read_stream(content_hash), media_type="application/octet-stream")
 
 @router.get("/nft/{token_id}")
-async def get_nft(token_id: int):
+async def get_nft(token_id: int, request: Request):
     """Get NFT information"""
-    # In production, fetch from database and blockchain
-    return {"token_id": token_id, "metadata_uri": "https://ipfs.io/ipfs/Qmmock"}
\ No newline at end of file
+    async def load():
+        async with services.db_sessions() as session:
+            return await queries.get_nft(session, token_id)
+    
+    services.sync_invalidations()
+    return _cached_json(request, await services.read_cache.get_or_load(("nft", token_id), load))
+
+@router.get("/creators/{creator_address}/content")
+async def list_creator_content(creator_address: str,
+                               request: Request,
+                               after: Optional[int] = None,
+                               limit: int = Query(50, ge=1, le=500)):
+    """List a creator's content, paginated by keyset cursor (pass next_cursor as after)"""
+    async def load():
+        async with services.db_sessions() as session:
+            items, next_cursor = await queries.list_content_by_creator(session, creator_address, after, limit)
+        return {'items': items, 'next_cursor': next_cursor}
+    
+    services.sync_invalidations()
+    key = ("creator", creator_address, services.creator_generations.get(creator_address, 0), after, limit)
+    return _cached_json(request, await services.read_cache.get_or_load(key, load))
+
+def require_admin(request: Request) -> None:
+    """Admin endpoints require X-Admin-Token and are disabled while ADMIN_TOKEN is unset"""
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    token = request.headers.get("x-admin-token", "")
+    if not hmac.compare_digest(token.encode(), config.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+@router.get("/export", dependencies=[Depends(require_admin)])
+async def export_records(table: str = Query("content"),
+                         format: str = Query("ndjson"),
+                         since: Optional[str] = Query(None, description="ISO watermark from a previous export"),
+                         chunk_size: int = Query(config.EXPORT_CHUNK_SIZE, ge=1, le=100000)):
+    """Stream a table as NDJSON or Parquet; X-Export-Watermark is the next export's ``since``"""
+    if table not in export.EXPORT_TABLES:
+        raise HTTPException(status_code=400, detail=f"Unknown table {table!r}")
+    if format not in export.ENCODERS:
+        raise HTTPException(status_code=400, detail=f"Unknown format {format!r}")
+    try:
+        since_at = export.parse_watermark(since)
+        encoder = export.ENCODERS[format](export.EXPORT_TABLES[table])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    # Commit this worker's buffered rows; the lag covers rows other workers have yet to flush
+    await services.db_writer.flush()
+    export_table = export.EXPORT_TABLES[table]
+    until = await export.export_watermark(services.db_engine, export_table, config.EXPORT_WATERMARK_LAG)
+    watermark = export.next_watermark(since_at, until)
+    return StreamingResponse(
+        export.stream_export(services.db_engine, export_table, encoder, since_at, until, chunk_size),
+        media_type=encoder.media_type,
+        headers={
+            'X-Export-Watermark': watermark.isoformat() if watermark is not None else "",
+            'Content-Disposition': f'attachment; filename="{table}.{encoder.extension}"'
+        }
+    )
+
+@router.get("/admin/models", dependencies=[Depends(require_admin), Depends(require_ready)])
+async def list_models():
+    """Resident model versions, most recently active first"""
+    return {'versions': services.verifier.models.versions()}
+
+@router.post("/admin/models/reload", status_code=202, dependencies=[Depends(require_admin), Depends(require_ready)])
+async def reload_model(request: ModelReloadRequest):
+    """Load, warm and switch to a checkpoint in the background (defaults to MODEL_PATH)"""
+    services.verifier.models.reload_async(request.model_path or config.MODEL_PATH)
+    return {'status': 'loading', 'active': services.verifier.models.active.fingerprint}
+
+@router.post("/admin/models/{fingerprint}/activate", dependencies=[Depends(require_admin), Depends(require_ready)])
+async def activate_model(fingerprint: str):
+    """Switch back to a resident version (rollback)"""
+    try:
+        return services.verifier.models.activate(fingerprint).describe()
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Model version is not resident")
+
+@router.get("/admin/traces", dependencies=[Depends(require_admin)])
+async def list_traces(limit: int = Query(50, ge=1, le=1000)):
+    """Most recent sampled request traces with their per-stage spans"""
+    return {'sample_rate': TRACER.sample_rate, 'traces': TRACER.recent(limit)}
+
+@router.get("/admin/profile", dependencies=[Depends(require_admin)])
+async def profile(seconds: float = Query(5.0, gt=0, le=60)):
+    """Sample every thread's stack for a while; returns collapsed stacks for flamegraph tools"""
+    if not config.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    return Response(await asyncio.to_thread(sample_stacks, seconds), media_type="text/plain")
+
+@router.get("/stats")
+async def get_stats():
+    """Runtime statistics (inference batching, result cache, worker pools)"""
+    return {
+        **(services.verifier.get_stats() if services.ready.is_set() else {}),
+        'startup': services.status(),
+        'executors': services.executors.get_stats() if services.executors else None,
+        'rate_limit': services.rate_limiter.get_stats() if services.rate_limiter else None,
+        'proofs': services.proof_workers.get_stats() if services.proof_workers else None,
+        'transactions': services.nft_minter.contract.get_stats() if services.nft_minter else None,
+        'anchoring': services.anchor_batcher.get_stats() if services.anchor_batcher else None,
+        'ipfs': services.ipfs_publisher.get_stats() if services.ipfs_publisher else None,
+        'indexer': services.chain_indexer.get_stats() if services.chain_indexer else None,
+        'database': services.db_writer.get_stats(),
+        'read_cache': services.read_cache.get_stats(),
+        'invalidations': services.invalidations.get_stats() if services.invalidations else None
+    }
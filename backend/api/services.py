@@ -0,0 +1,335 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..config import Config
+from ..database.chain_index import ChainIndexStore
+from ..database.session import create_engine, create_session_factory, init_models
+from ..database.writer import WriteBehindBuffer
+from ..storage.blobs import BlobStore
+from ..storage.locks import FileLock
+from .admission import TokenBucketLimiter
+from .executors import ExecutorPools
+from .read_cache import ReadThroughCache, SharedInvalidations
+
+class Services:
+    """Application subsystems, built in phases by the lifespan hooks"""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.timings: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.ready = asyncio.Event()
+        self._started_at = 0.0
+        self._heavy_task: Optional[asyncio.Task] = None
+
+        self.db_engine = create_engine(config.DATABASE_URL, config.DB_POOL_SIZE, config.DB_MAX_OVERFLOW)
+        self.db_sessions = create_session_factory(self.db_engine)
+        self.read_cache = ReadThroughCache(config.READ_CACHE_SIZE, config.READ_CACHE_TTL)
+        self.blob_store = BlobStore(config.BLOB_STORE_PATH, config.UPLOAD_CHUNK_SIZE)
+        self.rate_limiter = TokenBucketLimiter(
+            config.CREATOR_RATE_LIMIT, config.CREATOR_RATE_BURST
+        ) if config.CREATOR_RATE_LIMIT > 0 else None
+        # Bumped on writes so cached listing pages for that creator stop matching
+        self.creator_generations: Dict[str, int] = {}
+        # Set up by preload() before forking; None when serving from one process
+        self.invalidations: Optional[SharedInvalidations] = None
+        self.owner_lock = FileLock(config.OWNER_LOCK_PATH)
+        self.owner = False
+        self.db_writer = WriteBehindBuffer(
+            self.db_engine,
+            max_batch=config.DB_WRITE_BATCH_SIZE,
+            flush_interval=config.DB_WRITE_FLUSH_INTERVAL,
+            on_flush=self._invalidate_reads
+        )
+
+        self.models = None
+        self.executors: Optional[ExecutorPools] = None
+        self.verifier = None
+        self.nft_minter = None
+        self.ipfs_publisher = None
+        self.chain_indexer = None
+        self.anchor_batcher = None
+        self.proof_jobs = None
+        self.proof_workers = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = (time.perf_counter() - started) * 1000.0
+
+    def preload(self) -> None:
+        """Create the schema and load the model in a pre-fork parent"""
+        async def create_schema():
+            # Once here, so workers don't race on CREATE TABLE
+            await init_models(self.db_engine)
+            await self.db_engine.dispose()
+
+        with self.phase("schema_preload"):
+            asyncio.run(create_schema())
+            if self.config.PROOF_JOBS_ENABLED:
+                from ..ai_verification.proof_jobs import ProofJobQueue
+
+                # Jobs a previous run left running, recovered before any worker claims new ones
+                ProofJobQueue(self.config.PROOF_JOBS_DB).requeue_running()
+        self.invalidations = SharedInvalidations()
+        with self.phase("model_preload"):
+            self._set_inference_threads()
+            self.models = self._model_registry()
+            self.models.activate(self.models.load(self.config.MODEL_PATH or None, warmup=False).fingerprint)
+
+    async def start(self) -> None:
+        # Events bind to the running loop, so each start gets a fresh one
+        self.ready = asyncio.Event()
+        self.error = None
+        self._started_at = time.perf_counter()
+        with self.phase("database"):
+            await init_models(self.db_engine)
+            self.db_writer.start()
+        with self.phase("executors"):
+            self.executors = ExecutorPools.from_config(self.config)
+        self._heavy_task = asyncio.get_running_loop().create_task(self._start_heavy())
+
+    async def stop(self) -> None:
+        self.ready.clear()
+        if self._heavy_task is not None:
+            try:
+                await self._heavy_task
+            except Exception:
+                pass
+            self._heavy_task = None
+        if self.chain_indexer is not None:
+            await self.chain_indexer.stop()
+        await self.db_writer.stop()
+        await self.db_engine.dispose()
+        await asyncio.to_thread(self._stop_heavy)
+        if self.executors is not None:
+            self.executors.shutdown()
+            self.executors = None
+
+    async def wait_ready(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'ready': self.ready.is_set(),
+            'error': self.error,
+            'owner': self.owner,
+            'startup_ms': dict(self.timings)
+        }
+
+    async def _start_heavy(self) -> None:
+        try:
+            await asyncio.to_thread(self._build_heavy)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            raise
+        if self.chain_indexer is not None:
+            # Runs on the event loop, next to the write-behind buffer
+            self.chain_indexer.start()
+        self.timings['ready'] = (time.perf_counter() - self._started_at) * 1000.0
+        self.ready.set()
+
+    def _build_heavy(self) -> None:
+        config = self.config
+        with self.phase("imports"):
+            from ..ai_verification.cache import VerificationCache
+            from ..ai_verification.proof_jobs import ProofJobQueue, ProofWorkerPool
+            from ..ai_verification.similarity import FeatureIndex
+            from ..ai_verification.verification import ContentVerifier
+            from ..ai_verification.zk_circuits import ZKProofGenerator, PROVER_BACKENDS
+            from ..nft.anchoring import AnchorBatcher
+            from ..nft.contract import ContentNFTContract
+            from ..nft.indexer import ChainIndexer
+            from ..nft.ipfs import IPFSPublisher, MetadataStore
+            from ..nft.minting import NFTMinter
+            from ..nft.registry import VerificationRegistryContract
+
+        with self.phase("model"):
+            self._set_inference_threads()
+            if self.models is None:
+                self.models = self._model_registry()
+                self.models.load_and_activate(config.MODEL_PATH or None)
+            else:
+                # Preloaded by the pre-fork parent; warm in this worker
+                self.models.warmup(self.models.active)
+            if config.MODEL_PATH and config.MODEL_WATCH_INTERVAL > 0:
+                self.models.watch(config.MODEL_PATH, config.MODEL_WATCH_INTERVAL)
+
+        with self.phase("chain"):
+            self.owner = self.owner_lock.acquire(blocking=False)
+            if config.CONTRACT_ADDRESS and config.PRIVATE_KEY:
+                metadata_store = MetadataStore(config.IPFS_STORE_DB, max_attempts=config.IPFS_PUBLISH_MAX_ATTEMPTS)
+                self.nft_minter = NFTMinter(ContentNFTContract(
+                    config.WEB3_PROVIDER,
+                    config.CONTRACT_ADDRESS,
+                    config.PRIVATE_KEY,
+                    gas_price_refresh=config.GAS_PRICE_REFRESH_SECONDS,
+                    receipt_poll_interval=config.RECEIPT_POLL_INTERVAL,
+                    receipt_timeout=config.RECEIPT_TIMEOUT
+                ), ipfs_gateway=config.IPFS_GATEWAY, metadata_store=metadata_store)
+                if config.IPFS_API_URL and self.owner:
+                    self.ipfs_publisher = IPFSPublisher(
+                        metadata_store,
+                        config.IPFS_API_URL,
+                        batch_size=config.IPFS_PUBLISH_BATCH_SIZE,
+                        interval=config.IPFS_PUBLISH_INTERVAL
+                    )
+                    self.ipfs_publisher.start()
+            if self.nft_minter is not None and config.REGISTRY_ADDRESS:
+                self.anchor_batcher = AnchorBatcher(
+                    VerificationRegistryContract(
+                        self.nft_minter.contract.w3,
+                        config.REGISTRY_ADDRESS,
+                        self.nft_minter.contract.pipeline,
+                        self.nft_minter.contract.account.address
+                    ),
+                    config.ANCHOR_DB,
+                    max_batch_size=config.ANCHOR_BATCH_SIZE,
+                    max_delay=config.ANCHOR_MAX_DELAY
+                )
+                if self.owner:
+                    self.anchor_batcher.start()
+            if config.CONTRACT_ADDRESS and config.INDEXER_ENABLED and self.owner:
+                from web3 import Web3
+
+                self.chain_indexer = ChainIndexer(
+                    self.nft_minter.contract.w3 if self.nft_minter is not None
+                    else Web3(Web3.HTTPProvider(config.WEB3_PROVIDER)),
+                    config.CONTRACT_ADDRESS,
+                    ChainIndexStore(self.db_engine, config.CONTRACT_ADDRESS),
+                    start_block=config.INDEXER_START_BLOCK,
+                    reorg_depth=config.INDEXER_REORG_DEPTH,
+                    max_range=config.INDEXER_MAX_BLOCK_RANGE,
+                    target_logs=config.INDEXER_TARGET_LOGS,
+                    poll_interval=config.INDEXER_POLL_INTERVAL,
+                    on_change=lambda rows: self._invalidate_reads([], rows)
+                )
+
+        with self.phase("provers"):
+            if config.PROOF_JOBS_ENABLED:
+                self.proof_jobs = ProofJobQueue(config.PROOF_JOBS_DB, max_attempts=config.PROOF_JOB_MAX_ATTEMPTS)
+                self.proof_workers = ProofWorkerPool(
+                    self.proof_jobs,
+                    lambda: ZKProofGenerator(config.CIRCUITS_PATH, PROVER_BACKENDS[config.PROVER_BACKEND](config.CIRCUITS_PATH)),
+                    workers=config.PROOF_WORKERS,
+                    concurrency=config.PROOF_WORKER_CONCURRENCY,
+                    on_complete=self._anchor_completed_proof
+                )
+                # A pre-fork parent already recovered the shared queue
+                self.proof_workers.start(recover=self.invalidations is None)
+
+        with self.phase("verifier"):
+            self.verifier = ContentVerifier(
+                config.MODEL_PATH,
+                config.CIRCUITS_PATH,
+                max_batch_size=config.INFERENCE_MAX_BATCH_SIZE,
+                max_wait_ms=config.INFERENCE_MAX_WAIT_MS,
+                proof_executor=self.executors.proof_executor,
+                prover_backend=config.PROVER_BACKEND,
+                cache=VerificationCache(
+                    max_entries=config.VERIFICATION_CACHE_SIZE,
+                    ttl_seconds=config.VERIFICATION_CACHE_TTL,
+                    db_path=config.VERIFICATION_CACHE_PATH or None,
+                    max_disk_entries=config.VERIFICATION_CACHE_DISK_SIZE
+                ) if config.VERIFICATION_CACHE_SIZE > 0 else None,
+                proof_jobs=self.proof_jobs,
+                feature_index=FeatureIndex(
+                    config.DUPLICATE_INDEX_PATH,
+                    threshold=config.DUPLICATE_THRESHOLD,
+                    nlist=config.DUPLICATE_INDEX_NLIST,
+                    nprobe=config.DUPLICATE_INDEX_NPROBE,
+                    train_threshold=config.DUPLICATE_INDEX_TRAIN_SIZE
+                ) if config.DUPLICATE_INDEX_PATH else None,
+                models=self.models
+            )
+
+    def _stop_heavy(self) -> None:
+        if self.proof_workers is not None:
+            self.proof_workers.stop()
+        if self.anchor_batcher is not None:
+            # Only the owner submits anchors, so only it flushes the rest
+            self.anchor_batcher.stop(flush=self.owner)
+        if self.ipfs_publisher is not None:
+            self.ipfs_publisher.stop()
+        if self.nft_minter is not None:
+            self.nft_minter.contract.pipeline.stop()
+        if self.verifier is not None:
+            if self.verifier.inference_engine is not None:
+                self.verifier.inference_engine.stop()
+            if self.verifier.feature_index is not None:
+                self.verifier.feature_index.flush()
+        if self.models is not None:
+            self.models.stop()
+        self.models = None
+        self.nft_minter = None
+        self.ipfs_publisher = None
+        self.chain_indexer = None
+        self.anchor_batcher = None
+        self.proof_jobs = None
+        self.proof_workers = None
+        self.owner_lock.close()
+        self.owner = False
+
+    def sync_invalidations(self) -> None:
+        """Apply read-cache invalidations published by other pre-forked workers"""
+        if self.invalidations is None:
+            return
+        keys = self.invalidations.poll()
+        if keys is None:
+            self.read_cache.clear()
+            return
+        for key in keys:
+            kind, _, value = key.partition(":")
+            if kind == "creator":
+                self.creator_generations[value] = self.creator_generations.get(value, 0) + 1
+            else:
+                self.read_cache.invalidate((kind, int(value) if kind == "nft" else value))
+
+    def _set_inference_threads(self) -> None:
+        # torch's thread count is process-wide, so it is set here rather than per model version
+        if self.config.INFERENCE_THREADS:
+            import torch
+
+            torch.set_num_threads(self.config.INFERENCE_THREADS)
+
+    def _model_registry(self):
+        from ..ai_verification.model import ContentProcessor
+        from ..ai_verification.registry import ModelRegistry
+
+        config = self.config
+        return ModelRegistry(
+            lambda path: ContentProcessor(
+                path,
+                backend=config.INFERENCE_BACKEND,
+                num_threads=config.INFERENCE_THREADS,
+                parity_tolerance=config.INFERENCE_PARITY_TOLERANCE
+            ),
+            max_resident=config.MODEL_VERSIONS_RESIDENT
+        )
+
+    def _invalidate_reads(self, content_rows: List[Dict[str, Any]], nft_rows: List[Dict[str, Any]]) -> None:
+        keys = []
+        for row in content_rows:
+            self.read_cache.invalidate(("content", row['content_hash']))
+            creator = row['creator_address']
+            self.creator_generations[creator] = self.creator_generations.get(creator, 0) + 1
+            keys += [f"content:{row['content_hash']}", f"creator:{creator}"]
+        for row in nft_rows:
+            self.read_cache.invalidate(("content", row['content_hash']))
+            self.read_cache.invalidate(("nft", row['token_id']))
+            keys += [f"content:{row['content_hash']}", f"nft:{row['token_id']}"]
+        if self.invalidations is not None and keys:
+            self.invalidations.publish(keys)
+
+    def _anchor_completed_proof(self, job: Dict[str, Any]) -> None:
+        if self.anchor_batcher is not None:
+            self.anchor_batcher.add(job['content_hash'], job['model_hash'], job['result'])
@@ -6,20 +6,120 @@ from typing import Optional
 class Config:
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./content_marketplace.db")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_WRITE_BATCH_SIZE: int = int(os.getenv("DB_WRITE_BATCH_SIZE", "500"))
+    DB_WRITE_FLUSH_INTERVAL: float = float(os.getenv("DB_WRITE_FLUSH_INTERVAL", "0.25"))
+    READ_CACHE_SIZE: int = int(os.getenv("READ_CACHE_SIZE", "10000"))
+    READ_CACHE_TTL: float = float(os.getenv("READ_CACHE_TTL", "5"))
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+    # Seconds the export watermark trails the clock; keep it well above DB_WRITE_FLUSH_INTERVAL
+    EXPORT_WATERMARK_LAG: float = float(os.getenv("EXPORT_WATERMARK_LAG", "30"))
+    
+    # Content-addressed blob store for payloads and proofs
+    BLOB_STORE_PATH: str = os.getenv("BLOB_STORE_PATH", "./blobs")
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
     
     # Blockchain
     WEB3_PROVIDER: str = os.getenv("WEB3_PROVIDER", "http://localhost:8545")
     CONTRACT_ADDRESS: Optional[str] = os.getenv("CONTRACT_ADDRESS")
     PRIVATE_KEY: Optional[str] = os.getenv("PRIVATE_KEY")
+    REGISTRY_ADDRESS: Optional[str] = os.getenv("REGISTRY_ADDRESS")
+    GAS_PRICE_REFRESH_SECONDS: float = float(os.getenv("GAS_PRICE_REFRESH_SECONDS", "15"))
+    RECEIPT_POLL_INTERVAL: float = float(os.getenv("RECEIPT_POLL_INTERVAL", "1.0"))
+    RECEIPT_TIMEOUT: float = float(os.getenv("RECEIPT_TIMEOUT", "120"))
+    
+    # IPFS metadata: CIDs are computed locally and objects published in the
+    # background (empty IPFS_API_URL keeps them in the local store only)
+    IPFS_GATEWAY: str = os.getenv("IPFS_GATEWAY", "https://ipfs.io/ipfs/")
+    IPFS_API_URL: str = os.getenv("IPFS_API_URL", "")
+    IPFS_STORE_DB: str = os.getenv("IPFS_STORE_DB", "./ipfs_objects.db")
+    IPFS_PUBLISH_BATCH_SIZE: int = int(os.getenv("IPFS_PUBLISH_BATCH_SIZE", "32"))
+    IPFS_PUBLISH_INTERVAL: float = float(os.getenv("IPFS_PUBLISH_INTERVAL", "1.0"))
+    IPFS_PUBLISH_MAX_ATTEMPTS: int = int(os.getenv("IPFS_PUBLISH_MAX_ATTEMPTS", "5"))
+    
+    # Chain indexer: follows ContentMinted logs into the NFT tables so reads need no RPC
+    INDEXER_ENABLED: bool = os.getenv("INDEXER_ENABLED", "true").lower() == "true"
+    INDEXER_START_BLOCK: int = int(os.getenv("INDEXER_START_BLOCK", "0"))  # contract deployment block
+    INDEXER_REORG_DEPTH: int = int(os.getenv("INDEXER_REORG_DEPTH", "12"))
+    INDEXER_MAX_BLOCK_RANGE: int = int(os.getenv("INDEXER_MAX_BLOCK_RANGE", "2000"))
+    INDEXER_TARGET_LOGS: int = int(os.getenv("INDEXER_TARGET_LOGS", "1000"))
+    INDEXER_POLL_INTERVAL: float = float(os.getenv("INDEXER_POLL_INTERVAL", "2.0"))
     
     # AI Model
     MODEL_PATH: str = os.getenv("MODEL_PATH", "./models/content_verifier.pth")
+    MODEL_VERSIONS_RESIDENT: int = int(os.getenv("MODEL_VERSIONS_RESIDENT", "2"))
+    MODEL_WATCH_INTERVAL: float = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))  # 0 disables reload on file change
     
     # ZK Settings
     CIRCUITS_PATH: str = os.getenv("CIRCUITS_PATH", "./circuits")
+    PROVER_BACKEND: str = os.getenv("PROVER_BACKEND", "mock")  # mock, snarkjs
+    
+    # Proof jobs (when enabled, /verify returns a job id and provers run in the background)
+    PROOF_JOBS_ENABLED: bool = os.getenv("PROOF_JOBS_ENABLED", "false").lower() == "true"
+    PROOF_JOBS_DB: str = os.getenv("PROOF_JOBS_DB", "./proof_jobs.db")
+    PROOF_WORKERS: int = int(os.getenv("PROOF_WORKERS", "2"))
+    PROOF_WORKER_CONCURRENCY: int = int(os.getenv("PROOF_WORKER_CONCURRENCY", "1"))
+    PROOF_JOB_MAX_ATTEMPTS: int = int(os.getenv("PROOF_JOB_MAX_ATTEMPTS", "3"))
+    
+    # Inference backend: eager, int8, torchscript, compile, onnx (0 threads keeps the torch default)
+    INFERENCE_BACKEND: str = os.getenv("INFERENCE_BACKEND", "eager")
+    INFERENCE_THREADS: int = int(os.getenv("INFERENCE_THREADS", "0"))
+    INFERENCE_PARITY_TOLERANCE: float = float(os.getenv("INFERENCE_PARITY_TOLERANCE", "0.02"))
+    
+    # Inference batching (max batch size of 1 disables the batching engine)
+    INFERENCE_MAX_BATCH_SIZE: int = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "32"))
+    INFERENCE_MAX_WAIT_MS: float = float(os.getenv("INFERENCE_MAX_WAIT_MS", "3.0"))
+    VERIFY_BATCH_CHUNK_SIZE: int = int(os.getenv("VERIFY_BATCH_CHUNK_SIZE", "64"))
+    VERIFY_BATCH_SPOOL_BYTES: int = int(os.getenv("VERIFY_BATCH_SPOOL_BYTES", str(8 * 1024 * 1024)))
+    
+    # Verification result cache (size 0 disables; empty path keeps it in-process)
+    VERIFICATION_CACHE_SIZE: int = int(os.getenv("VERIFICATION_CACHE_SIZE", "10000"))
+    VERIFICATION_CACHE_TTL: float = float(os.getenv("VERIFICATION_CACHE_TTL", "3600"))
+    VERIFICATION_CACHE_PATH: str = os.getenv("VERIFICATION_CACHE_PATH", "")
+    VERIFICATION_CACHE_DISK_SIZE: int = int(os.getenv("VERIFICATION_CACHE_DISK_SIZE", "100000"))
+    
+    # Near-duplicate index over feature vectors (empty path disables)
+    DUPLICATE_INDEX_PATH: str = os.getenv("DUPLICATE_INDEX_PATH", "./feature_index")
+    DUPLICATE_THRESHOLD: float = float(os.getenv("DUPLICATE_THRESHOLD", "0.99"))
+    DUPLICATE_INDEX_NLIST: int = int(os.getenv("DUPLICATE_INDEX_NLIST", "256"))
+    DUPLICATE_INDEX_NPROBE: int = int(os.getenv("DUPLICATE_INDEX_NPROBE", "8"))
+    DUPLICATE_INDEX_TRAIN_SIZE: int = int(os.getenv("DUPLICATE_INDEX_TRAIN_SIZE", "20000"))
+    
+    # Merkle-batched anchoring through VerificationRegistry
+    ANCHOR_BATCH_SIZE: int = int(os.getenv("ANCHOR_BATCH_SIZE", "256"))
+    ANCHOR_MAX_DELAY: float = float(os.getenv("ANCHOR_MAX_DELAY", "30"))
+    ANCHOR_DB: str = os.getenv("ANCHOR_DB", "./anchors.db")
+    
+    # Worker pools (PROOF_PROCESS_WORKERS=0 keeps proving on the verify threads)
+    VERIFY_THREAD_WORKERS: int = int(os.getenv("VERIFY_THREAD_WORKERS", "8"))
+    MINT_THREAD_WORKERS: int = int(os.getenv("MINT_THREAD_WORKERS", "4"))
+    PROOF_PROCESS_WORKERS: int = int(os.getenv("PROOF_PROCESS_WORKERS", "2"))
+    MAX_CONCURRENT_VERIFICATIONS: int = int(os.getenv("MAX_CONCURRENT_VERIFICATIONS", "32"))
+    MAX_CONCURRENT_MINTS: int = int(os.getenv("MAX_CONCURRENT_MINTS", "4"))
+    
+    # Admission control (0 disables a limit). Over-limit requests get 503 or,
+    # for the per-creator token bucket, 429, both with Retry-After
+    VERIFY_QUEUE_LIMIT: int = int(os.getenv("VERIFY_QUEUE_LIMIT", "128"))
+    MINT_QUEUE_LIMIT: int = int(os.getenv("MINT_QUEUE_LIMIT", "16"))
+    MAX_PENDING_PROOF_JOBS: int = int(os.getenv("MAX_PENDING_PROOF_JOBS", "10000"))
+    MAX_PENDING_TRANSACTIONS: int = int(os.getenv("MAX_PENDING_TRANSACTIONS", "64"))
+    CREATOR_RATE_LIMIT: float = float(os.getenv("CREATOR_RATE_LIMIT", "0"))  # requests/second per creator
+    CREATOR_RATE_BURST: int = int(os.getenv("CREATOR_RATE_BURST", "20"))
+    
+    # Observability (traces and profiles are served under /api/v1/admin)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+    TRACE_BUFFER_SIZE: int = int(os.getenv("TRACE_BUFFER_SIZE", "256"))
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
     
     # API
+    ADMIN_TOKEN: Optional[str] = os.getenv("ADMIN_TOKEN")  # required by /admin/* and /export, which are off without it
     HOST: str = os.getenv("HOST", "0.0.0.0")
-    PORT: int = int(os.getenv("PORT", 8000"))
+    PORT: int = int(os.getenv("PORT", "8000"))
+    WORKERS: int = int(os.getenv("WORKERS", "1"))  # >1 serves pre-forked workers sharing the parent's model
+    # Held by the one process that runs the chain indexer, anchoring and IPFS publishing
+    OWNER_LOCK_PATH: str = os.getenv("OWNER_LOCK_PATH", "./owner.lock")
+    READY_TIMEOUT: float = float(os.getenv("READY_TIMEOUT", "30"))  # how long requests wait for startup
 
 config = Config()
\ No newline at end of file
@@ -0,0 +1,115 @@
+import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..metrics import stage
+from .models import ChainCheckpoint, Content, IndexedBlock, NFTMetadata
+from .writer import _upsert
+
+class ChainIndexStore:
+    """Indexed ContentMinted events, the checkpoint and recent block hashes"""
+
+    def __init__(self, engine: AsyncEngine, contract_address: str):
+        self.engine = engine
+        self.contract_address = contract_address
+
+    async def checkpoint(self) -> Optional[Tuple[int, Optional[str]]]:
+        """(block_number, block_hash) of the last applied block, if any"""
+        async with self.engine.connect() as conn:
+            row = (await conn.execute(
+                select(ChainCheckpoint.block_number, ChainCheckpoint.block_hash)
+                .where(ChainCheckpoint.contract_address == self.contract_address)
+            )).first()
+        return tuple(row) if row is not None else None
+
+    async def recent_blocks(self) -> List[Tuple[int, str]]:
+        """Stored (block_number, block_hash) pairs, newest first"""
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(
+                select(IndexedBlock.block_number, IndexedBlock.block_hash)
+                .where(IndexedBlock.contract_address == self.contract_address)
+                .order_by(IndexedBlock.block_number.desc())
+            )).all()
+        return [tuple(row) for row in rows]
+
+    async def apply(self, events: List[Dict[str, Any]], blocks: Dict[int, str],
+                    block_number: int, block_hash: Optional[str], prune_below: int) -> List[Dict[str, Any]]:
+        """Upsert decoded events for known content and advance the checkpoint; returns the rows written"""
+        with stage("index_apply"):
+            async with self.engine.begin() as conn:
+                rows = await self._upsert_events(conn, events) if events else []
+                if blocks:
+                    await conn.execute(_upsert(self.engine, IndexedBlock, [
+                        {'contract_address': self.contract_address, 'block_number': number, 'block_hash': hash_}
+                        for number, hash_ in sorted(blocks.items())
+                    ], ('contract_address', 'block_number')))
+                await conn.execute(delete(IndexedBlock).where(
+                    IndexedBlock.contract_address == self.contract_address,
+                    IndexedBlock.block_number < prune_below
+                ))
+                await self._set_checkpoint(conn, block_number, block_hash)
+        return rows
+
+    async def rewind(self, block_number: int, block_hash: Optional[str]) -> List[Dict[str, Any]]:
+        """Drop everything indexed after ``block_number``; returns the removed NFT rows"""
+        async with self.engine.begin() as conn:
+            removed = (await conn.execute(
+                select(NFTMetadata.token_id, Content.content_hash)
+                .outerjoin(Content, Content.id == NFTMetadata.content_id)
+                .where(NFTMetadata.blockchain_address == self.contract_address,
+                       NFTMetadata.block_number > block_number)
+            )).all()
+            if removed:
+                token_ids = [row.token_id for row in removed]
+                await conn.execute(update(Content).where(Content.nft_token_id.in_(token_ids))
+                                   .values(nft_token_id=None))
+                await conn.execute(delete(NFTMetadata).where(NFTMetadata.token_id.in_(token_ids)))
+            await conn.execute(delete(IndexedBlock).where(
+                IndexedBlock.contract_address == self.contract_address,
+                IndexedBlock.block_number > block_number
+            ))
+            await self._set_checkpoint(conn, block_number, block_hash)
+        return [{'token_id': row.token_id, 'content_hash': row.content_hash} for row in removed]
+
+    async def _upsert_events(self, conn, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        hashes = {event['content_hash'] for event in events}
+        result = await conn.execute(
+            select(Content.content_hash, Content.id).where(Content.content_hash.in_(hashes))
+        )
+        content_ids = dict(result.all())
+
+        rows = []
+        for event in events:
+            content_id = content_ids.get(event['content_hash'])
+            if content_id is None:
+                continue
+            rows.append({
+                'token_id': event['token_id'],
+                'content_id': content_id,
+                'metadata_uri': event['metadata_uri'],
+                'transaction_hash': event['transaction_hash'],
+                'blockchain_address': self.contract_address,
+                'block_number': event['block_number'],
+                'updated_at': datetime.datetime.utcnow()
+            })
+        if not rows:
+            return []
+
+        await conn.execute(_upsert(self.engine, NFTMetadata, rows, 'token_id'))
+        await conn.execute(
+            update(Content.__table__)
+            .where(Content.__table__.c.id == bindparam('b_content_id'))
+            .values(nft_token_id=bindparam('b_token_id')),
+            [{'b_content_id': row['content_id'], 'b_token_id': row['token_id']} for row in rows]
+        )
+        by_id = {content_id: content_hash for content_hash, content_id in content_ids.items()}
+        return [{**row, 'content_hash': by_id[row['content_id']]} for row in rows]
+
+    async def _set_checkpoint(self, conn, block_number: int, block_hash: Optional[str]) -> None:
+        await conn.execute(_upsert(self.engine, ChainCheckpoint, [{
+            'contract_address': self.contract_address,
+            'block_number': block_number,
+            'block_hash': block_hash
+        }], 'contract_address'))
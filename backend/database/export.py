@@ -0,0 +1,270 @@
+import argparse
+import asyncio
+import datetime
+import json
+import sys
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .models import Content, NFTMetadata
+
+class ExportTable:
+    """A selectable to export, ordered by (watermark, key) for a stable keyset"""
+
+    def __init__(self, name: str, columns: Sequence[Any], watermark, key, joins: Sequence[Any] = ()):
+        self.name = name
+        self.columns = tuple(columns)
+        self.watermark = watermark
+        self.key = key
+        self.joins = tuple(joins)
+
+    def query(self, since: Optional[datetime.datetime], until: datetime.datetime):
+        query = select(*self.columns)
+        for target, onclause in self.joins:
+            query = query.outerjoin(target, onclause)
+        if since is not None:
+            query = query.where(self.watermark > since)
+        return query.where(self.watermark <= until).order_by(self.watermark, self.key)
+
+    @property
+    def field_names(self) -> List[str]:
+        return [column.key for column in self.columns]
+
+EXPORT_TABLES = {
+    'content': ExportTable(
+        'content',
+        (
+            Content.id,
+            Content.content_hash,
+            Content.content_type,
+            Content.creator_address,
+            Content.content_ref,
+            Content.content_size,
+            Content.ai_model_hash,
+            Content.verification_proof_ref,
+            Content.verification_proof_size,
+            Content.zk_proof_ref,
+            Content.zk_proof_size,
+            Content.nft_token_id,
+            Content.is_verified,
+            Content.created_at,
+            Content.verified_at
+        ),
+        watermark=Content.verified_at,
+        key=Content.id
+    ),
+    'nft': ExportTable(
+        'nft',
+        (
+            NFTMetadata.id,
+            NFTMetadata.token_id,
+            Content.content_hash,
+            NFTMetadata.metadata_uri,
+            NFTMetadata.transaction_hash,
+            NFTMetadata.blockchain_address,
+            NFTMetadata.block_number,
+            NFTMetadata.created_at,
+            NFTMetadata.updated_at
+        ),
+        watermark=NFTMetadata.updated_at,
+        key=NFTMetadata.id,
+        joins=((Content, Content.id == NFTMetadata.content_id),)
+    )
+}
+
+def parse_watermark(value: Optional[str]) -> Optional[datetime.datetime]:
+    """ISO timestamp as naive UTC, the way rows are written (datetime.utcnow)"""
+    if not value:
+        return None
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def next_watermark(since: Optional[datetime.datetime],
+                   until: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+    """Where the next incremental export starts; an empty window keeps ``since``"""
+    return until if until is not None and (since is None or until > since) else since
+
+async def export_watermark(engine: AsyncEngine, table: ExportTable, lag: float = 0.0,
+                           now: Optional[datetime.datetime] = None) -> Optional[datetime.datetime]:
+    """Upper bound of the export window: the newest stamp, but no later than ``lag`` seconds ago"""
+    async with engine.connect() as conn:
+        newest = (await conn.execute(select(func.max(table.watermark)))).scalar()
+    if newest is None or lag <= 0:
+        return newest
+    cutoff = (now or datetime.datetime.utcnow()) - datetime.timedelta(seconds=lag)
+    # Stamps are naive UTC; compare like with like
+    return min(newest.replace(tzinfo=None), cutoff)
+
+async def iter_chunks(engine: AsyncEngine, table: ExportTable, since: Optional[datetime.datetime],
+                      until: datetime.datetime, chunk_size: int = 1000) -> AsyncIterator[List[Any]]:
+    """Rows of the export window in partitions of at most ``chunk_size``"""
+    async with engine.connect() as conn:
+        result = await conn.stream(
+            table.query(since, until).execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions(chunk_size):
+            yield rows
+
+class NDJSONEncoder:
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def __init__(self, table: ExportTable):
+        self.fields = table.field_names
+
+    def encode(self, rows: List[Any]) -> bytes:
+        return "".join(
+            json.dumps(dict(zip(self.fields, row)), default=_json_default, separators=(",", ":")) + "\n"
+            for row in rows
+        ).encode()
+
+    def finish(self) -> bytes:
+        return b""
+
+class _ByteSink:
+    """Write-only file object that hands written bytes back to the caller"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+class ParquetEncoder:
+    """One Parquet row group per chunk (pyarrow is an optional dependency)"""
+
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+
+    def __init__(self, table: ExportTable):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export requires pyarrow") from e
+
+        self.pa = pa
+        self.fields = table.field_names
+        self.schema = pa.schema([
+            (name, _ARROW_TYPES[column.type.python_type](pa))
+            for name, column in zip(self.fields, table.columns)
+        ])
+        self.sink = _ByteSink()
+        self.writer = pq.ParquetWriter(self.sink, self.schema, compression="zstd")
+
+    def encode(self, rows: List[Any]) -> bytes:
+        columns = list(zip(*rows)) if rows else [[] for _ in self.fields]
+        self.writer.write_table(self.pa.Table.from_arrays(
+            [self.pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema
+        ))
+        return self.sink.drain()
+
+    def finish(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+_ARROW_TYPES = {
+    int: lambda pa: pa.int64(),
+    str: lambda pa: pa.string(),
+    bool: lambda pa: pa.bool_(),
+    datetime.datetime: lambda pa: pa.timestamp("us")
+}
+
+ENCODERS = {
+    'ndjson': NDJSONEncoder,
+    'parquet': ParquetEncoder
+}
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+async def stream_export(engine: AsyncEngine, table: ExportTable, encoder, since: Optional[datetime.datetime],
+                        until: Optional[datetime.datetime], chunk_size: int = 1000) -> AsyncIterator[bytes]:
+    """Encoded bytes for the window ``(since, until]``; an empty window yields an empty file"""
+    if until is not None and (since is None or until > since):
+        async for rows in iter_chunks(engine, table, since, until, chunk_size):
+            data = encoder.encode(rows)
+            if data:
+                yield data
+    data = encoder.finish()
+    if data:
+        yield data
+
+async def export_to_file(database_url: str, table_name: str, output, fmt: str = "ndjson",
+                         since: Optional[str] = None, chunk_size: int = 1000,
+                         lag: float = 0.0) -> Dict[str, Any]:
+    from .session import create_engine
+
+    engine = create_engine(database_url)
+    table = EXPORT_TABLES[table_name]
+    encoder = ENCODERS[fmt](table)
+    since_at = parse_watermark(since)
+    try:
+        until = await export_watermark(engine, table, lag)
+        written = 0
+        async for data in stream_export(engine, table, encoder, since_at, until, chunk_size):
+            output.write(data)
+            written += len(data)
+    finally:
+        await engine.dispose()
+    watermark = next_watermark(since_at, until)
+    return {
+        'table': table_name,
+        'format': fmt,
+        'since': since,
+        'watermark': watermark.isoformat() if watermark is not None else None,
+        'bytes': written
+    }
+
+def main(argv=None) -> int:
+    from ..config import config
+
+    parser = argparse.ArgumentParser(prog="python -m backend.database.export", description="Stream content or NFT records as NDJSON or Parquet (see Export in the README)")
+    parser.add_argument("table", choices=sorted(EXPORT_TABLES))
+    parser.add_argument("--format", choices=sorted(ENCODERS), default="ndjson")
+    parser.add_argument("--since", help="export rows after this watermark (ISO timestamp)")
+    parser.add_argument("--output", help="file to write (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=config.EXPORT_CHUNK_SIZE)
+    parser.add_argument("--lag", type=float, default=config.EXPORT_WATERMARK_LAG,
+                        help="leave rows stamped in the last LAG seconds for the next export")
+    parser.add_argument("--database-url", default=config.DATABASE_URL)
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, "wb") as output:
+            summary = asyncio.run(export_to_file(args.database_url, args.table, output, args.format,
+                                                 args.since, args.chunk_size, args.lag))
+    else:
+        summary = asyncio.run(export_to_file(args.database_url, args.table, sys.stdout.buffer, args.format,
+                                             args.since, args.chunk_size, args.lag))
+    # The summary (with the next --since) goes to stderr so stdout stays a clean export
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
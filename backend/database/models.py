@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 import datetime
@@ -10,24 +10,60 @@ class Content(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     content_hash = Column(String(66), unique=True, index=True)
-    original_content = Column(Text, nullable=False)
+    # Payload and proofs live in the blob store; rows keep their SHA-256 refs and sizes
+    content_ref = Column(String(64), nullable=False)
+    content_size = Column(Integer, nullable=False)
     content_type = Column(String(50), nullable=False)  # text, image, audio, etc.
     creator_address = Column(String(42), nullable=False)
     ai_model_hash = Column(String(66), nullable=False)
-    verification_proof = Column(Text, nullable=False)
-    zk_proof = Column(Text, nullable=False)
+    verification_proof_ref = Column(String(64), nullable=False)
+    verification_proof_size = Column(Integer, nullable=False)
+    zk_proof_ref = Column(String(64), nullable=False)
+    zk_proof_size = Column(Integer, nullable=False)
     nft_token_id = Column(Integer, unique=True, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     verified_at = Column(DateTime(timezone=True), nullable=True)
     is_verified = Column(Boolean, default=False)
+    
+    __table_args__ = (
+        # Keyset pagination of a creator's content by id
+        Index("ix_content_creator_address_id", "creator_address", "id"),
+        # Incremental exports scan by watermark
+        Index("ix_content_verified_at_id", "verified_at", "id"),
+    )
 
 class NFTMetadata(Base):
     __tablename__ = "nft_metadata"
     
     id = Column(Integer, primary_key=True, index=True)
     token_id = Column(Integer, unique=True, index=True)
-    content_id = Column(Integer, nullable=False)
+    content_id = Column(Integer, nullable=False, index=True)
     metadata_uri = Column(String(256), nullable=False)
     transaction_hash = Column(String(66), nullable=True)
     blockchain_address = Column(String(42), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    # Block of the ContentMinted event, so rows from reorged blocks can be rewound
+    block_number = Column(Integer, nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Stamped (naive UTC) by every upsert, so incremental exports see changed rows too
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_nft_metadata_updated_at_id", "updated_at", "id"),
+    )
+
+class ChainCheckpoint(Base):
+    """Last block the chain indexer has applied, per contract"""
+    __tablename__ = "chain_checkpoints"
+    
+    contract_address = Column(String(42), primary_key=True)
+    block_number = Column(Integer, nullable=False)
+    block_hash = Column(String(66), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class IndexedBlock(Base):
+    """Hashes of recently indexed blocks, kept for the reorg window"""
+    __tablename__ = "indexed_blocks"
+    
+    contract_address = Column(String(42), primary_key=True)
+    block_number = Column(Integer, primary_key=True)
+    block_hash = Column(String(66), nullable=False)
\ No newline at end of file
@@ -0,0 +1,100 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Content, NFTMetadata
+
+# Row fetches only select the columns the API returns, never the blob refs
+CONTENT_COLUMNS = (
+    Content.id,
+    Content.content_hash,
+    Content.content_type,
+    Content.creator_address,
+    Content.content_size,
+    Content.ai_model_hash,
+    Content.nft_token_id,
+    Content.is_verified,
+    Content.created_at,
+    Content.verified_at
+)
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+def _content_dict(row) -> Dict[str, Any]:
+    return {
+        'content_hash': row.content_hash,
+        'status': "verified" if row.is_verified else "unverified",
+        'content_type': row.content_type,
+        'creator_address': row.creator_address,
+        'content_size': row.content_size,
+        'ai_model_hash': row.ai_model_hash,
+        'nft_token_id': row.nft_token_id,
+        'is_verified': row.is_verified,
+        'created_at': _isoformat(row.created_at),
+        'verified_at': _isoformat(row.verified_at)
+    }
+
+async def get_content(session: AsyncSession, content_hash: str) -> Optional[Dict[str, Any]]:
+    """Lookup by the unique content_hash index"""
+    row = (await session.execute(
+        select(*CONTENT_COLUMNS).where(Content.content_hash == content_hash)
+    )).first()
+    return _content_dict(row) if row is not None else None
+
+async def get_verification_refs(session: AsyncSession, content_hash: str) -> Optional[Dict[str, Any]]:
+    """What minting needs: the creator, model hash and proof blob refs of a content row"""
+    row = (await session.execute(
+        select(
+            Content.content_hash,
+            Content.content_type,
+            Content.creator_address,
+            Content.ai_model_hash,
+            Content.verification_proof_ref,
+            Content.zk_proof_ref,
+            Content.nft_token_id,
+            Content.verified_at
+        ).where(Content.content_hash == content_hash)
+    )).first()
+    return dict(row._mapping) if row is not None else None
+
+async def get_nft(session: AsyncSession, token_id: int) -> Optional[Dict[str, Any]]:
+    """Lookup by the unique token_id index, joined to its content hash"""
+    row = (await session.execute(
+        select(
+            NFTMetadata.token_id,
+            NFTMetadata.metadata_uri,
+            NFTMetadata.transaction_hash,
+            NFTMetadata.blockchain_address,
+            NFTMetadata.block_number,
+            NFTMetadata.created_at,
+            Content.content_hash
+        )
+        .join(Content, Content.id == NFTMetadata.content_id)
+        .where(NFTMetadata.token_id == token_id)
+    )).first()
+    if row is None:
+        return None
+    return {
+        'token_id': row.token_id,
+        'metadata_uri': row.metadata_uri,
+        'transaction_hash': row.transaction_hash,
+        'blockchain_address': row.blockchain_address,
+        'block_number': row.block_number,
+        'content_hash': row.content_hash,
+        'created_at': _isoformat(row.created_at)
+    }
+
+async def list_content_by_creator(session: AsyncSession,
+                                  creator_address: str,
+                                  after_id: Optional[int] = None,
+                                  limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Keyset page over (creator_address, id); returns the items and the next cursor"""
+    query = select(*CONTENT_COLUMNS).where(Content.creator_address == creator_address)
+    if after_id is not None:
+        query = query.where(Content.id > after_id)
+    rows = (await session.execute(query.order_by(Content.id).limit(limit + 1))).all()
+
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    return [_content_dict(row) for row in rows[:limit]], next_cursor
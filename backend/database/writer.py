@@ -0,0 +1,253 @@
+import asyncio
+import datetime
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..metrics import stage
+from .models import Content, NFTMetadata
+
+def _upsert(engine: AsyncEngine, model, rows: List[Dict[str, Any]], key: Union[str, Tuple[str, ...]]):
+    """INSERT ... ON CONFLICT(key) DO UPDATE for the engine's dialect (key may be composite)"""
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(model).values(rows)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(model).values(rows)
+    elif dialect == "mysql":
+        # MySQL resolves the conflict from the table's unique keys, not a named column
+        stmt = mysql.insert(model).values(rows)
+        keys = (key,) if isinstance(key, str) else tuple(key)
+        return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in rows[0]
+                                             if column not in keys})
+    else:
+        raise NotImplementedError(f"Bulk upsert is not supported on {dialect}")
+    keys = (key,) if isinstance(key, str) else tuple(key)
+    updates = {column: stmt.excluded[column] for column in rows[0] if column not in keys}
+    return stmt.on_conflict_do_update(index_elements=list(keys), set_=updates)
+
+def _max_bind_params(engine: AsyncEngine) -> int:
+    """Bound parameters one statement may carry on the engine's dialect"""
+    if engine.dialect.name == "sqlite":
+        import sqlite3
+        # SQLITE_MAX_VARIABLE_NUMBER default: 999 before 3.32, 32766 since
+        return 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+    return 65535
+
+def _chunks(rows: List[Dict[str, Any]], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+class WriteBehindBuffer:
+    """Buffers verification and NFT rows and writes them in bulk transactions"""
+
+    def __init__(self, engine: AsyncEngine, max_batch: int = 500, flush_interval: float = 0.25,
+                 on_flush: Optional[Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], None]] = None,
+                 max_dead_letters: int = 1000):
+        self.engine = engine
+        # Called with the committed content and NFT rows (e.g. to invalidate read caches)
+        self.on_flush = on_flush
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.flushes = 0
+        self.rows_written = 0
+        self.flush_errors = 0
+        self.dead_lettered = 0
+        # (table, row, error) for the most recent rows the database refused
+        self._dead_letters = deque(maxlen=max_dead_letters)
+        # Keyed on the conflict column so repeated writes collapse before the flush
+        self._content: Dict[str, Dict[str, Any]] = {}
+        self._nfts: Dict[int, Dict[str, Any]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopped: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopped = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Let an in-progress flush finish, then drain whatever is still buffered"""
+        if self._task is not None:
+            self._stopped.set()
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def add_content(self, row: Dict[str, Any]) -> None:
+        """Queue a Content row (column names as in database.models.Content)"""
+        self._content[row['content_hash']] = row
+        self._maybe_wake()
+
+    def add_nft(self, row: Dict[str, Any]) -> None:
+        """Queue an NFTMetadata row; ``content_hash`` is resolved to ``content_id`` at flush time"""
+        self._nfts[row['token_id']] = row
+        self._maybe_wake()
+
+    def pending(self) -> int:
+        return len(self._content) + len(self._nfts)
+
+    async def flush(self) -> int:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            content_rows = list(self._content.values())
+            nft_rows = list(self._nfts.values())
+            self._content.clear()
+            self._nfts.clear()
+            if not content_rows and not nft_rows:
+                return 0
+
+            written = 0
+            # Content first: NFT rows resolve their content_id from it
+            pending = ([('content', chunk) for chunk in _chunks(content_rows, self._chunk_size(Content))] +
+                       [('nft', chunk) for chunk in _chunks(nft_rows, self._chunk_size(NFTMetadata))])
+            try:
+                with stage("db_flush"):
+                    while pending:
+                        table, chunk = pending[0]
+                        written += await self._write_chunk(table, chunk)
+                        pending.pop(0)
+            except BaseException:
+                # Connection trouble or cancellation: put the unwritten rows back
+                # (newer writes win) and retry on the next tick
+                self.flush_errors += 1
+                for table, chunk in pending:
+                    self._requeue(table, chunk)
+                raise
+
+            self.flushes += 1
+            return written
+
+    def dead_letters(self) -> List[Tuple[str, Dict[str, Any], str]]:
+        """Recently refused rows as (table, row, error), oldest first"""
+        return list(self._dead_letters)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'pending': self.pending(),
+            'flushes': self.flushes,
+            'rows_written': self.rows_written,
+            'flush_errors': self.flush_errors,
+            'dead_lettered': self.dead_lettered
+        }
+
+    def _chunk_size(self, model) -> int:
+        columns = len(model.__table__.columns)
+        return max(1, min(self.max_batch, _max_bind_params(self.engine) // columns))
+
+    async def _write_chunk(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """Write one chunk in its own transaction, isolating rows that fail on their own"""
+        try:
+            await self._commit(table, rows)
+        except OperationalError:
+            raise
+        except DBAPIError:
+            # Something in the chunk was refused: find it row by row
+            written = []
+            try:
+                for row in rows:
+                    try:
+                        await self._commit(table, [row])
+                    except OperationalError:
+                        raise
+                    except DBAPIError as exc:
+                        self._dead_letter(table, row, exc)
+                    else:
+                        written.append(row)
+            finally:
+                # The caller requeues the whole chunk on error; upserts make the rewrite harmless
+                self._committed(table, written)
+            return len(written)
+        self._committed(table, rows)
+        return len(rows)
+
+    async def _commit(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        async with self.engine.begin() as conn:
+            if table == 'content':
+                await conn.execute(_upsert(self.engine, Content, rows, 'content_hash'))
+            else:
+                await self._write_nfts(conn, rows)
+
+    def _committed(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        self.rows_written += len(rows)
+        if rows and self.on_flush is not None:
+            if table == 'content':
+                self.on_flush(rows, [])
+            else:
+                self.on_flush([], rows)
+
+    def _requeue(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        if table == 'content':
+            for row in rows:
+                self._content.setdefault(row['content_hash'], row)
+        else:
+            for row in rows:
+                self._nfts.setdefault(row['token_id'], row)
+
+    def _dead_letter(self, table: str, row: Dict[str, Any], exc: Exception) -> None:
+        self.dead_lettered += 1
+        self._dead_letters.append((table, row, str(getattr(exc, 'orig', exc))))
+
+    async def _write_nfts(self, conn, nft_rows: List[Dict[str, Any]]) -> None:
+        hashes = {row['content_hash'] for row in nft_rows}
+        result = await conn.execute(
+            select(Content.content_hash, Content.id).where(Content.content_hash.in_(hashes))
+        )
+        content_ids = dict(result.all())
+
+        rows = []
+        for row in nft_rows:
+            content_id = content_ids.get(row['content_hash'])
+            if content_id is None:
+                continue
+            rows.append({
+                'token_id': row['token_id'],
+                'content_id': content_id,
+                'metadata_uri': row['metadata_uri'],
+                'transaction_hash': row.get('transaction_hash'),
+                'blockchain_address': row['blockchain_address'],
+                'block_number': row.get('block_number'),
+                'updated_at': datetime.datetime.utcnow()
+            })
+        if not rows:
+            return
+
+        await conn.execute(_upsert(self.engine, NFTMetadata, rows, 'token_id'))
+        await conn.execute(
+            update(Content.__table__)
+            .where(Content.__table__.c.id == bindparam('b_content_id'))
+            .values(nft_token_id=bindparam('b_token_id')),
+            [{'b_content_id': row['content_id'], 'b_token_id': row['token_id']} for row in rows]
+        )
+
+    def _maybe_wake(self) -> None:
+        if self._wakeup is not None and self.pending() >= self.max_batch:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopped.is_set():
+                # stop() drains the buffer itself
+                return
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # Back off for an interval, but wake up for stop()
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
@@ -1,14 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+import gc
+import os
+import signal
+import socket
 import uvicorn
 
-from api.routes import router
-from config import config
+from backend.api.middleware import attach_middlewares
+from backend.api.routes import router, lifespan, services
+from backend.config import config
+from backend.metrics import REGISTRY
 
 app = FastAPI(
     title="AI-Verified Content Marketplace",
     description="Platform for minting AI-verified content as NFTs with ZK proofs",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -19,6 +27,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+attach_middlewares(app)
 
 # Include routers
 app.include_router(router, prefix="/api/v1")
@@ -29,12 +38,62 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    """Liveness: the process is up and serving requests"""
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: model and subsystems are loaded (with startup phase timings)"""
+    status = services.status()
+    return JSONResponse(status, status_code=200 if status['ready'] else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint (route latencies, stage timers, in-flight requests)"""
+    if not config.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+def serve_prefork(workers: int) -> None:
+    """Load the model once, then fork workers that share it copy-on-write"""
+    services.preload()
+    # Keep the collector from touching (and so copying) the preloaded objects
+    gc.freeze()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((config.HOST, config.PORT))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            server = uvicorn.Server(uvicorn.Config(app, host=config.HOST, port=config.PORT))
+            server.run(sockets=[sock])
+            os._exit(0)
+        children.append(pid)
+
+    def forward(signum, frame):
+        for child in children:
+            try:
+                os.kill(child, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for child in children:
+        os.waitpid(child, 0)
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host=config.HOST,
-        port=config.PORT,
-        reload=True
-    )
\ No newline at end of file
+    if config.WORKERS > 1:
+        serve_prefork(config.WORKERS)
+    else:
+        uvicorn.run(
+            "backend.main:app",
+            host=config.HOST,
+            port=config.PORT,
+            reload=True
+        )
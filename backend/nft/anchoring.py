@@ -0,0 +1,296 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from web3 import Web3
+
+def proof_digest(zk_proof: Dict[str, Any]) -> bytes:
+    """SHA-256 of the canonical JSON encoding of a proof"""
+    return hashlib.sha256(json.dumps(zk_proof, sort_keys=True, separators=(",", ":")).encode()).digest()
+
+def leaf_hash(content_hash: str, model_hash: str, digest: bytes) -> bytes:
+    """keccak256(abi.encodePacked(contentHash, modelHash, proofDigest)) as in VerificationRegistry"""
+    return bytes(Web3.keccak(Web3.to_bytes(hexstr=content_hash) + Web3.to_bytes(hexstr=model_hash) + digest))
+
+def _hash_pair(a: bytes, b: bytes) -> bytes:
+    # Sorted pairs, so a proof needs no left/right flags (OpenZeppelin MerkleProof)
+    return bytes(Web3.keccak(a + b if a < b else b + a))
+
+class MerkleTree:
+    """Binary keccak256 Merkle tree; an odd node out is promoted to the next level"""
+
+    def __init__(self, leaves: List[bytes]):
+        if not leaves:
+            raise ValueError("Merkle tree needs at least one leaf")
+        self.levels: List[List[bytes]] = [list(leaves)]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def proof(self, index: int) -> List[bytes]:
+        siblings = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                siblings.append(level[sibling])
+            index //= 2
+        return siblings
+
+    @staticmethod
+    def verify(leaf: bytes, proof: List[bytes], root: bytes) -> bool:
+        node = leaf
+        for sibling in proof:
+            node = _hash_pair(node, sibling)
+        return node == root
+
+class AnchorBatcher:
+    """Collects verification leaves and anchors one Merkle root per batch"""
+
+    def __init__(self, registry, db_path: str, max_batch_size: int = 256, max_delay: float = 30.0,
+                 poll_interval: float = 1.0, retry_backoff: float = 1.0, max_backoff: float = 300.0):
+        self.registry = registry
+        self.db_path = db_path
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.batches_anchored = 0
+        self.anchor_failures = 0
+        self.already_anchored = 0
+        self.consecutive_failures = 0
+        self._flush_lock = threading.Lock()
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        with self._db() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS anchor_proofs ("
+                " content_hash TEXT NOT NULL,"
+                " model_hash TEXT NOT NULL,"
+                " proof_digest TEXT NOT NULL,"
+                " leaf TEXT NOT NULL,"
+                " root TEXT NOT NULL,"
+                " merkle_proof TEXT NOT NULL,"
+                " leaf_index INTEGER NOT NULL,"
+                " batch_id INTEGER,"
+                " transaction_hash TEXT,"
+                " anchored_at REAL NOT NULL,"
+                " PRIMARY KEY (content_hash, model_hash))"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS anchor_pending ("
+                " content_hash TEXT NOT NULL,"
+                " model_hash TEXT NOT NULL,"
+                " proof_digest TEXT NOT NULL,"
+                " leaf TEXT NOT NULL,"
+                " added_at REAL NOT NULL,"
+                # Set once the leaf is part of a submitted batch
+                " root TEXT,"
+                " leaf_index INTEGER,"
+                " PRIMARY KEY (content_hash, model_hash))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS ix_anchor_pending_root ON anchor_pending (root)")
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="anchor-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+        if flush:
+            self.flush()
+
+    def add(self, content_hash: str, model_hash: str, zk_proof: Dict[str, Any]) -> None:
+        """Queue a verification for the next batch (no-op if already queued or anchored)"""
+        if self._anchored(content_hash, model_hash):
+            return
+        digest = proof_digest(zk_proof)
+        with self._db() as db:
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO anchor_pending (content_hash, model_hash, proof_digest, leaf, added_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (content_hash, model_hash, digest.hex(), leaf_hash(content_hash, model_hash, digest).hex(), time.time())
+            )
+        if cursor.rowcount:
+            count = self._pending_state()[0]
+            # A first leaf starts the max_delay clock; a full batch flushes now
+            if count == 1 or count >= self.max_batch_size:
+                self._wakeup.set()
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """Anchor one batch (retrying an unconfirmed one first); leaves stay queued if anchoring fails"""
+        with self._flush_lock:
+            batch, retry = self._open_batch(), True
+            if not batch:
+                batch, retry = self._new_batch(), False
+            if not batch:
+                return None
+
+            tree = MerkleTree([entry['leaf'] for _, entry in batch])
+            # A retried root may have been mined after its submission seemed to fail
+            anchored = self._find_anchored(tree.root) if retry else None
+            if anchored is None:
+                try:
+                    anchored = self.registry.anchor_root(tree.root, len(batch))
+                except Exception:
+                    # e.g. "Root already anchored" from a submission that went through after all
+                    anchored = self._find_anchored(tree.root)
+                    if anchored is None:
+                        self.anchor_failures += 1
+                        raise
+
+            now = time.time()
+            with self._db() as db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO anchor_proofs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (content_hash, entry['model_hash'], entry['proof_digest'].hex(),
+                         entry['leaf'].hex(), tree.root.hex(),
+                         json.dumps([sibling.hex() for sibling in tree.proof(index)]),
+                         index, anchored.get('batch_id'), anchored.get('transaction_hash'), now)
+                        for index, (content_hash, entry) in enumerate(batch)
+                    ]
+                )
+                db.execute("DELETE FROM anchor_pending WHERE root = ?", (tree.root.hex(),))
+            self.batches_anchored += 1
+            return {'root': tree.root.hex(), 'leaf_count': len(batch), **anchored}
+
+    def _open_batch(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Leaves of a batch that was submitted but not confirmed, in tree order"""
+        row = self._db().execute(
+            "SELECT root FROM anchor_pending WHERE root IS NOT NULL ORDER BY rowid LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return []
+        return self._batch_entries(self._db().execute(
+            "SELECT content_hash, model_hash, proof_digest, leaf FROM anchor_pending"
+            " WHERE root = ? ORDER BY leaf_index",
+            (row[0],)
+        ).fetchall())
+
+    def _new_batch(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Take the oldest unbatched leaves and record their root before anything is submitted"""
+        batch = self._batch_entries(self._db().execute(
+            "SELECT content_hash, model_hash, proof_digest, leaf FROM anchor_pending"
+            " WHERE root IS NULL ORDER BY rowid LIMIT ?",
+            (self.max_batch_size,)
+        ).fetchall())
+        if batch:
+            root = MerkleTree([entry['leaf'] for _, entry in batch]).root.hex()
+            with self._db() as db:
+                db.executemany(
+                    "UPDATE anchor_pending SET root = ?, leaf_index = ? WHERE content_hash = ? AND model_hash = ?",
+                    [(root, index, content_hash, entry['model_hash'])
+                     for index, (content_hash, entry) in enumerate(batch)]
+                )
+        return batch
+
+    @staticmethod
+    def _batch_entries(rows) -> List[Tuple[str, Dict[str, Any]]]:
+        return [
+            (content_hash, {'model_hash': model_hash, 'proof_digest': bytes.fromhex(digest),
+                            'leaf': bytes.fromhex(leaf)})
+            for content_hash, model_hash, digest, leaf in rows
+        ]
+
+    def _find_anchored(self, root: bytes) -> Optional[Dict[str, Any]]:
+        """The registry's record of ``root``, if it is already anchored"""
+        lookup = getattr(self.registry, 'batch_id', None)
+        if lookup is None:
+            return None
+        try:
+            batch_id = lookup(root)
+        except Exception:
+            return None
+        if not batch_id:
+            return None
+        self.already_anchored += 1
+        return {'batch_id': batch_id, 'transaction_hash': None}
+
+    def get_inclusion_proof(self, content_hash: str, model_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Proof for ``content_hash`` under ``model_hash``, or its latest verification if omitted"""
+        where, params = "content_hash = ?", (content_hash,)
+        if model_hash is not None:
+            where, params = where + " AND model_hash = ?", params + (model_hash,)
+        pending = self._db().execute(f"SELECT model_hash FROM anchor_pending WHERE {where}", params).fetchone()
+        if pending is not None:
+            return {'content_hash': content_hash, 'model_hash': pending[0], 'status': 'pending'}
+        row = self._db().execute(
+            "SELECT model_hash, proof_digest, leaf, root, merkle_proof, leaf_index, batch_id, transaction_hash"
+            f" FROM anchor_proofs WHERE {where} ORDER BY anchored_at DESC, rowid DESC LIMIT 1",
+            params
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'content_hash': content_hash,
+            'status': 'anchored',
+            'model_hash': row[0],
+            'proof_digest': row[1],
+            'leaf': row[2],
+            'root': row[3],
+            'merkle_proof': json.loads(row[4]),
+            'leaf_index': row[5],
+            'batch_id': row[6],
+            'transaction_hash': row[7]
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'pending_leaves': self._pending_state()[0],
+            'batches_anchored': self.batches_anchored,
+            'anchor_failures': self.anchor_failures,
+            'already_anchored': self.already_anchored,
+            'consecutive_failures': self.consecutive_failures
+        }
+
+    def _anchored(self, content_hash: str, model_hash: str) -> bool:
+        return self._db().execute(
+            "SELECT 1 FROM anchor_proofs WHERE content_hash = ? AND model_hash = ?", (content_hash, model_hash)
+        ).fetchone() is not None
+
+    def _pending_state(self) -> Tuple[int, Optional[float]]:
+        """(pending leaf count, wall time the oldest one was added)"""
+        return tuple(self._db().execute("SELECT COUNT(*), MIN(added_at) FROM anchor_pending").fetchone())
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            count, first_at = self._pending_state()
+            if count >= self.max_batch_size or (first_at is not None and time.time() - first_at >= self.max_delay):
+                try:
+                    self.flush()
+                    self.consecutive_failures = 0
+                except Exception:
+                    # Leaves remain pending; back off exponentially before retrying
+                    self.consecutive_failures += 1
+                    self._stopped.wait(min(self.max_backoff,
+                                           self.retry_backoff * 2 ** (self.consecutive_failures - 1)))
+                continue
+            timeout = self.poll_interval if first_at is None else \
+                min(self.poll_interval, max(0.0, first_at + self.max_delay - time.time()))
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
@@ -1,14 +1,36 @@
 from web3 import Web3
+from concurrent.futures import Future
 import json
 import os
 from typing import Dict, Any, Optional
 
+from .indexer import decode_content_minted, is_content_minted
+from .transactions import NonceManager, GasPriceOracle, TransactionPipeline
+
 class ContentNFTContract:
-    def __init__(self, web3_provider: str, contract_address: str, private_key: str):
-        self.w3 = Web3(Web3.HTTPProvider(web3_provider))
+    def __init__(self, web3_provider: str, contract_address: str, private_key: str,
+                 w3: Optional[Web3] = None,
+                 gas_price_refresh: float = 15.0,
+                 receipt_poll_interval: float = 1.0,
+                 receipt_timeout: float = 120.0):
+        # An injected Web3 (dev chain or in-process provider) takes precedence
+        self.w3 = w3 or Web3(Web3.HTTPProvider(web3_provider))
         self.contract_address = contract_address
         self.private_key = private_key
         self.account = self.w3.eth.account.from_key(private_key)
+        self._chain_id: Optional[int] = None
+        
+        # Nonces and gas price are tracked locally; receipts are collected in the background
+        self.nonce_manager = NonceManager(self.w3, self.account.address)
+        self.gas_oracle = GasPriceOracle(self.w3, gas_price_refresh)
+        self.pipeline = TransactionPipeline(
+            self.w3,
+            private_key,
+            self.nonce_manager,
+            self.gas_oracle,
+            poll_interval=receipt_poll_interval,
+            receipt_timeout=receipt_timeout
+        )
         
         # Load contract ABI (simplified - would load from compiled contract)
         self.contract = self.w3.eth.contract(
@@ -49,6 +71,18 @@ class ContentNFTContract:
                 ],
                 "stateMutability": "view",
                 "type": "function"
+            },
+            {
+                "anonymous": False,
+                "inputs": [
+                    {"indexed": True, "internalType": "uint256", "name": "tokenId", "type": "uint256"},
+                    {"indexed": True, "internalType": "address", "name": "creator", "type": "address"},
+                    {"indexed": False, "internalType": "bytes32", "name": "contentHash", "type": "bytes32"},
+                    {"indexed": False, "internalType": "bytes32", "name": "modelHash", "type": "bytes32"},
+                    {"indexed": False, "internalType": "string", "name": "tokenURI", "type": "string"}
+                ],
+                "name": "ContentMinted",
+                "type": "event"
             }
         ]
     
@@ -58,39 +92,66 @@ class ContentNFTContract:
                  content_hash: str,
                  model_hash: str,
                  zk_proof: Dict[str, Any]) -> Dict[str, Any]:
-        """Mint NFT for verified content"""
+        """Mint NFT for verified content and wait for the receipt"""
+        return self.submit_mint(to_address, token_uri, content_hash, model_hash, zk_proof).result()
+    
+    def submit_mint(self,
+                    to_address: str,
+                    token_uri: str,
+                    content_hash: str,
+                    model_hash: str,
+                    zk_proof: Dict[str, Any]) -> Future:
+        """Broadcast a mint without waiting; the future resolves to the mint result"""
         
         # Prepare proof data
         proof_bytes = json.dumps(zk_proof).encode()
         
-        # Build transaction
+        # Build transaction (nonce is assigned by the pipeline; chain id and
+        # gas price come from local caches so building needs no RPC)
         transaction = self.contract.functions.mintVerifiedContent(
-            to_address,
+            # Creator addresses arrive lowercase from the API; web3 insists on checksums
+            Web3.to_checksum_address(to_address),
             token_uri,
             Web3.to_bytes(hexstr=content_hash),
             Web3.to_bytes(hexstr=model_hash),
             proof_bytes
         ).build_transaction({
             'from': self.account.address,
-            'nonce': self.w3.eth.get_transaction_count(self.account.address),
+            'chainId': self._get_chain_id(),
             'gas': 2000000,
-            'gasPrice': self.w3.eth.gas_price
+            'gasPrice': self.gas_oracle.get_gas_price()
         })
         
         # Sign and send transaction
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        tx_hash, receipt_future = self.pipeline.submit(transaction)
+        
+        result: Future = Future()
         
-        # Wait for receipt
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        def on_receipt(done: Future) -> None:
+            if done.exception() is not None:
+                result.set_exception(done.exception())
+                return
+            receipt = done.result()
+            result.set_result({
+                'transaction_hash': Web3.to_hex(tx_hash),
+                'token_id': self._get_token_id_from_receipt(receipt),
+                'block_number': receipt['blockNumber']
+            })
         
-        return {
-            'transaction_hash': tx_hash.hex(),
-            'token_id': self._get_token_id_from_receipt(receipt),
-            'block_number': receipt['blockNumber']
-        }
+        receipt_future.add_done_callback(on_receipt)
+        return result
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return self.pipeline.get_stats()
+    
+    def _get_chain_id(self) -> int:
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
     
     def _get_token_id_from_receipt(self, receipt) -> int:
-        """Extract token ID from transaction receipt (simplified)"""
-        # In production, parse logs to get token ID
-        return receipt['blockNumber'] * 1000 + receipt['transactionIndex']
\ No newline at end of file
+        """Token ID from the receipt's ContentMinted log"""
+        for log in receipt.get('logs', []):
+            if str(log.get('address', '')).lower() == self.contract_address.lower() and is_content_minted(log):
+                return decode_content_minted(log)['token_id']
+        raise ValueError("No ContentMinted event in transaction receipt")
\ No newline at end of file
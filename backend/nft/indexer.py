@@ -0,0 +1,213 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+from eth_abi import decode
+from web3 import Web3
+
+from ..metrics import stage
+
+CONTENT_MINTED_TOPIC = Web3.keccak(text="ContentMinted(uint256,address,bytes32,bytes32,string)")
+_CONTENT_MINTED_DATA = ["bytes32", "bytes32", "string"]
+# Successful ranges at the learned ceiling before trying a larger one again
+_CEILING_PROBE_AFTER = 64
+
+def _to_hex(value) -> str:
+    # HexBytes.hex() drops the 0x prefix on newer hexbytes, so go through Web3.to_hex
+    return Web3.to_hex(bytes(value)) if isinstance(value, (bytes, bytearray)) else str(value)
+
+def decode_content_minted(log: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode a raw ContentMinted(tokenId, creator, contentHash, modelHash, tokenURI) log"""
+    topics = log['topics']
+    content_hash, model_hash, token_uri = decode(_CONTENT_MINTED_DATA, bytes(log['data']))
+    return {
+        'token_id': int.from_bytes(bytes(topics[1]), "big"),
+        'creator_address': Web3.to_checksum_address(bytes(topics[2])[-20:]),
+        # Hex without 0x, as content hashes are stored
+        'content_hash': content_hash.hex(),
+        'model_hash': model_hash.hex(),
+        'metadata_uri': token_uri,
+        'block_number': log['blockNumber'],
+        'block_hash': _to_hex(log['blockHash']),
+        'transaction_hash': _to_hex(log['transactionHash'])
+    }
+
+def is_content_minted(log: Dict[str, Any]) -> bool:
+    topics = log.get('topics') or []
+    return bool(topics) and bytes(topics[0]) == bytes(CONTENT_MINTED_TOPIC) and not log.get('removed')
+
+class ChainIndexer:
+    """Follows ContentMinted logs into NFTMetadata so reads never need RPC"""
+
+    def __init__(self, w3, contract_address: str, store, start_block: int = 0,
+                 reorg_depth: int = 12, max_range: int = 2000, target_logs: int = 1000,
+                 poll_interval: float = 2.0,
+                 on_change: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        self.w3 = w3
+        self.contract_address = contract_address
+        self.store = store
+        self.start_block = start_block
+        self.reorg_depth = reorg_depth
+        self.max_range = max_range
+        self.target_logs = target_logs
+        self.poll_interval = poll_interval
+        # Called with the NFT rows written or removed (e.g. to invalidate read caches)
+        self.on_change = on_change
+        self.range_size = max_range
+        # Largest range the node has accepted since it last refused one; re-probed periodically
+        self.range_ceiling = max_range
+        self._ranges_at_ceiling = 0
+        self.head: Optional[int] = None
+        self.checkpoint: Optional[int] = None
+        self.events_indexed = 0
+        self.events_skipped = 0
+        self.ranges = 0
+        self.range_errors = 0
+        self.reorgs = 0
+        self.errors = 0
+        self._stopped: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._stopped = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def caught_up(self) -> bool:
+        return self.head is not None and self.checkpoint is not None and self.checkpoint >= self.head
+
+    async def sync_once(self) -> int:
+        """Check for a reorg, then index one block range; returns events indexed"""
+        self.head = await asyncio.to_thread(lambda: self.w3.eth.block_number)
+        checkpoint = await self.store.checkpoint()
+        if checkpoint is not None:
+            number, block_hash = checkpoint
+            self.checkpoint = number
+            if block_hash is not None and number <= self.head and await self._block_hash(number) != block_hash:
+                await self._handle_reorg()
+                return 0
+            start = number + 1
+        else:
+            self.checkpoint = self.start_block - 1
+            start = self.start_block
+        if start > self.head:
+            return 0
+
+        end = min(self.head, start + self.range_size - 1)
+        try:
+            with stage("index_get_logs"):
+                logs = await asyncio.to_thread(self.w3.eth.get_logs, {
+                    'address': self.contract_address,
+                    'topics': [_to_hex(CONTENT_MINTED_TOPIC)],
+                    'fromBlock': start,
+                    'toBlock': end
+                })
+        except Exception:
+            # Typically "block range too large" or "too many results"
+            self.range_errors += 1
+            if self.range_size == 1:
+                raise
+            self.range_size = self.range_ceiling = max(1, self.range_size // 2)
+            self._ranges_at_ceiling = 0
+            return 0
+
+        events = [decode_content_minted(log) for log in logs if is_content_minted(log)]
+        end_hash = await self._block_hash(end)
+        window_start = self.head - self.reorg_depth
+        blocks = {event['block_number']: event['block_hash'] for event in events
+                  if event['block_number'] > window_start}
+        if end > window_start:
+            blocks[end] = end_hash
+
+        rows = await self.store.apply(events, blocks, end, end_hash, prune_below=window_start)
+        self.checkpoint = end
+        self.ranges += 1
+        self.events_indexed += len(rows)
+        self.events_skipped += len(events) - len(rows)
+        self._resize(len(logs))
+        if rows and self.on_change is not None:
+            self.on_change(rows)
+        return len(rows)
+
+    async def sync(self) -> int:
+        """Index until caught up with the current head"""
+        total = 0
+        while True:
+            total += await self.sync_once()
+            if self.caught_up():
+                return total
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'head': self.head,
+            'checkpoint': self.checkpoint,
+            'lag_blocks': max(0, self.head - self.checkpoint)
+                          if self.head is not None and self.checkpoint is not None else None,
+            'range_size': self.range_size,
+            'range_ceiling': self.range_ceiling,
+            'ranges': self.ranges,
+            'events_indexed': self.events_indexed,
+            'events_skipped': self.events_skipped,
+            'range_errors': self.range_errors,
+            'reorgs': self.reorgs,
+            'errors': self.errors
+        }
+
+    def _resize(self, log_count: int) -> None:
+        if log_count > self.target_logs:
+            self.range_size = max(1, self.range_size // 2)
+            return
+        if self.range_size >= self.range_ceiling:
+            self._ranges_at_ceiling += 1
+            if self._ranges_at_ceiling >= _CEILING_PROBE_AFTER and self.range_ceiling < self.max_range:
+                self.range_ceiling = min(self.max_range, self.range_ceiling * 2)
+                self._ranges_at_ceiling = 0
+        if log_count < self.target_logs // 2:
+            self.range_size = min(self.range_ceiling, self.range_size * 2)
+
+    async def _block_hash(self, number: int) -> str:
+        block = await asyncio.to_thread(self.w3.eth.get_block, number)
+        return _to_hex(block['hash'])
+
+    async def _handle_reorg(self) -> None:
+        self.reorgs += 1
+        recent = await self.store.recent_blocks()
+        fork_number, fork_hash = None, None
+        for number, block_hash in recent:
+            if number <= self.head and await self._block_hash(number) == block_hash:
+                fork_number, fork_hash = number, block_hash
+                break
+        if fork_number is None:
+            # No stored hash survived: blocks older than the window are final
+            fork_number = max(self.start_block, self.head - self.reorg_depth) - 1
+            if recent:
+                fork_number = min(fork_number, recent[-1][0] - 1)
+            fork_hash = await self._block_hash(fork_number) if fork_number >= 0 else None
+        removed = await self.store.rewind(fork_number, fork_hash)
+        self.checkpoint = fork_number
+        if removed and self.on_change is not None:
+            self.on_change(removed)
+
+    async def _run(self) -> None:
+        while not self._stopped.is_set():
+            failed = False
+            try:
+                await self.sync_once()
+            except Exception:
+                # RPC or database hiccup: keep the checkpoint and retry next poll
+                self.errors += 1
+                failed = True
+            if failed or self.caught_up():
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
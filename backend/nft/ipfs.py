@@ -0,0 +1,216 @@
+import base64
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+PENDING = "pending"
+PINNED = "pinned"
+FAILED = "failed"
+
+# Multicodec / multihash codes used in CIDv1
+_CIDV1 = 0x01
+_RAW_CODEC = 0x55
+_SHA2_256 = 0x12
+
+def encode_json(value: Any) -> bytes:
+    """Deterministic JSON: sorted keys, no insignificant whitespace, UTF-8"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+def compute_cid(data: bytes) -> str:
+    """CIDv1 (raw codec, sha2-256, base32) of a single block"""
+    digest = hashlib.sha256(data).digest()
+    cid = bytes([_CIDV1, _RAW_CODEC, _SHA2_256, len(digest)]) + digest
+    return "b" + base64.b32encode(cid).decode().lower().rstrip("=")
+
+class MetadataStore:
+    """Content-addressed metadata objects in SQLite, with their publish status"""
+
+    def __init__(self, db_path: str, max_attempts: int = 5, retry_backoff: float = 2.0):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.deduplicated = 0
+        self._local = threading.local()
+        self._added = threading.Event()
+
+        with self._db() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS ipfs_objects ("
+                " cid TEXT PRIMARY KEY,"
+                " data BLOB NOT NULL,"
+                " status TEXT NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " error TEXT,"
+                " available_at REAL NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " published_at REAL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS ix_ipfs_objects_pending ON ipfs_objects (status, available_at)")
+
+    def put(self, value: Any) -> str:
+        """Store a JSON value for publishing; returns its CID"""
+        data = encode_json(value)
+        cid = compute_cid(data)
+        now = time.time()
+        with self._db() as db:
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO ipfs_objects (cid, data, status, available_at, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (cid, data, PENDING, now, now)
+            )
+        if cursor.rowcount:
+            self.wake()
+        else:
+            self.deduplicated += 1
+        return cid
+
+    def get(self, cid: str) -> Optional[bytes]:
+        row = self._db().execute("SELECT data FROM ipfs_objects WHERE cid = ?", (cid,)).fetchone()
+        return row[0] if row else None
+
+    def status(self, cid: str) -> Optional[str]:
+        row = self._db().execute("SELECT status FROM ipfs_objects WHERE cid = ?", (cid,)).fetchone()
+        return row[0] if row else None
+
+    def pending(self, limit: int) -> List[Tuple[str, bytes]]:
+        """Oldest objects due for publishing as (cid, data)"""
+        return self._db().execute(
+            "SELECT cid, data FROM ipfs_objects"
+            " WHERE status = ? AND available_at <= ? ORDER BY created_at LIMIT ?",
+            (PENDING, time.time(), limit)
+        ).fetchall()
+
+    def mark_pinned(self, cids: List[str]) -> None:
+        now = time.time()
+        with self._db() as db:
+            db.executemany(
+                "UPDATE ipfs_objects SET status = ?, error = NULL, published_at = ? WHERE cid = ?",
+                [(PINNED, now, cid) for cid in cids]
+            )
+
+    def mark_failed(self, cids: List[str], error: str) -> None:
+        """Back off exponentially, giving up after max_attempts"""
+        now = time.time()
+        with self._db() as db:
+            for cid in cids:
+                row = db.execute("SELECT attempts FROM ipfs_objects WHERE cid = ?", (cid,)).fetchone()
+                if row is None:
+                    continue
+                attempts = row[0] + 1
+                db.execute(
+                    "UPDATE ipfs_objects SET attempts = ?, error = ?, status = ?, available_at = ? WHERE cid = ?",
+                    (attempts, error, FAILED if attempts >= self.max_attempts else PENDING,
+                     now + self.retry_backoff ** attempts, cid)
+                )
+
+    def wake(self) -> None:
+        self._added.set()
+
+    def wait_for_put(self, timeout: float) -> None:
+        self._added.wait(timeout)
+        self._added.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        rows = self._db().execute("SELECT status, COUNT(*) FROM ipfs_objects GROUP BY status").fetchall()
+        return {**{status: count for status, count in rows}, 'deduplicated': self.deduplicated}
+
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+class IPFSPublisher:
+    """Pushes pending MetadataStore objects to an IPFS node (Kubo HTTP RPC) in batches"""
+
+    def __init__(self, store: MetadataStore, api_url: str, batch_size: int = 32,
+                 interval: float = 1.0, timeout: float = 30.0,
+                 session: Optional[requests.Session] = None):
+        self.store = store
+        self.api_url = api_url.rstrip("/")
+        self.batch_size = batch_size
+        self.interval = interval
+        self.timeout = timeout
+        self.session = session or self._session()
+        self.batches = 0
+        self.published = 0
+        self.failures = 0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="ipfs-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.store.wake()
+        if self._thread is not None:
+            self._thread.join(5.0)
+        self.session.close()
+
+    def publish_pending(self) -> int:
+        """Publish one batch; returns how many objects were pinned"""
+        batch = self.store.pending(self.batch_size)
+        if not batch:
+            return 0
+        cids = [cid for cid, _ in batch]
+        try:
+            response = self.session.post(
+                f"{self.api_url}/api/v0/block/put",
+                params={'cid-codec': 'raw', 'mhtype': 'sha2-256', 'pin': 'true'},
+                files=[('file', (cid, data, 'application/octet-stream')) for cid, data in batch],
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            returned = [json.loads(line)['Key'] for line in response.text.splitlines() if line.strip()]
+        except (requests.RequestException, ValueError, KeyError) as e:
+            self.failures += 1
+            self.store.mark_failed(cids, f"{type(e).__name__}: {e}")
+            raise
+
+        returned = set(returned)
+        pinned = [cid for cid in cids if cid in returned]
+        mismatched = [cid for cid in cids if cid not in returned]
+        self.store.mark_pinned(pinned)
+        if mismatched:
+            self.store.mark_failed(mismatched, "Node returned a different CID")
+        self.batches += 1
+        self.published += len(pinned)
+        return len(pinned)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'batches': self.batches,
+            'published': self.published,
+            'failures': self.failures,
+            **self.store.get_stats()
+        }
+
+    def _session(self) -> requests.Session:
+        session = requests.Session()
+        # block/put is idempotent, so POSTs are safe to retry
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=None)
+        session.mount("http://", HTTPAdapter(pool_maxsize=4, max_retries=retries))
+        session.mount("https://", HTTPAdapter(pool_maxsize=4, max_retries=retries))
+        return session
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                published = self.publish_pending()
+            except Exception:
+                # Objects stay pending with backoff; try again next interval
+                published = 0
+            if published < self.batch_size:
+                self.store.wait_for_put(self.interval)
@@ -1,12 +1,19 @@
-import json
-import requests
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from ..metrics import stage
 from .contract import ContentNFTContract
+from .ipfs import MetadataStore, compute_cid, encode_json
+
+def _isoformat(timestamp: Any) -> Any:
+    # Metadata is serialised as JSON, which has no datetime type
+    return timestamp.isoformat() if hasattr(timestamp, 'isoformat') else timestamp
 
 class NFTMinter:
-    def __init__(self, contract: ContentNFTContract, ipfs_gateway: str = "https://ipfs.io/ipfs/"):
+    def __init__(self, contract: ContentNFTContract, ipfs_gateway: str = "https://ipfs.io/ipfs/",
+                 metadata_store: Optional[MetadataStore] = None):
         self.contract = contract
         self.ipfs_gateway = ipfs_gateway
+        # Published to an IPFS node in the background by IPFSPublisher
+        self.metadata_store = metadata_store
     
     def create_metadata(self, 
                        content_data: Dict[str, Any],
@@ -42,7 +49,7 @@ class NFTMinter:
             "properties": {
                 "content_hash": content_data['content_hash'],
                 "model_hash": verification_record['model_hash'],
-                "verification_timestamp": verification_record.get('timestamp'),
+                "verification_timestamp": _isoformat(verification_record.get('timestamp')),
                 "creator": content_data['creator_address']
             }
         }
@@ -50,11 +57,12 @@ class NFTMinter:
         return metadata
     
     def upload_to_ipfs(self, metadata: Dict[str, Any]) -> str:
-        """Upload metadata to IPFS (simplified - would use actual IPFS client)"""
-        # In production, use ipfshttpclient or similar
-        # For now, return mock IPFS hash
-        mock_hash = f"Qm{json.dumps(metadata).encode().hex()[:44]}"
-        return f"{self.ipfs_gateway}{mock_hash}"
+        """Queue metadata for IPFS and return its URI"""
+        if self.metadata_store is not None:
+            cid = self.metadata_store.put(metadata)
+        else:
+            cid = compute_cid(encode_json(metadata))
+        return f"{self.ipfs_gateway}{cid}"
     
     def mint_verified_content(self, 
                             content_data: Dict[str, Any],
@@ -62,19 +70,22 @@ class NFTMinter:
         """Mint NFT for verified content"""
         
         # Create metadata
-        metadata = self.create_metadata(content_data, verification_record)
+        with stage("mint_metadata"):
+            metadata = self.create_metadata(content_data, verification_record)
         
         # Upload to IPFS
-        metadata_uri = self.upload_to_ipfs(metadata)
+        with stage("ipfs_upload"):
+            metadata_uri = self.upload_to_ipfs(metadata)
         
         # Mint NFT
-        mint_result = self.contract.mint_nft(
-            to_address=content_data['creator_address'],
-            token_uri=metadata_uri,
-            content_hash=verification_record['content_hash'],
-            model_hash=verification_record['model_hash'],
-            zk_proof=verification_record['zk_proof']
-        )
+        with stage("mint_transaction"):
+            mint_result = self.contract.mint_nft(
+                to_address=content_data['creator_address'],
+                token_uri=metadata_uri,
+                content_hash=verification_record['content_hash'],
+                model_hash=verification_record['model_hash'],
+                zk_proof=verification_record['zk_proof']
+            )
         
         return {
             **mint_result,
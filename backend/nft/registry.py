@@ -0,0 +1,71 @@
+from web3 import Web3
+from typing import Dict, Any, Optional
+
+from .transactions import TransactionPipeline
+
+class VerificationRegistryContract:
+    """Client for contracts/VerificationRegistry.sol, sharing the NFT contract's TransactionPipeline"""
+
+    def __init__(self, w3: Web3, contract_address: str, pipeline: TransactionPipeline, from_address: str):
+        self.w3 = w3
+        self.contract_address = contract_address
+        self.pipeline = pipeline
+        self.from_address = from_address
+        self.contract = self.w3.eth.contract(
+            address=contract_address,
+            abi=self._get_contract_abi()
+        )
+
+    def _get_contract_abi(self) -> list:
+        """Get contract ABI (simplified)"""
+        return [
+            {
+                "inputs": [
+                    {"internalType": "bytes32", "name": "root", "type": "bytes32"},
+                    {"internalType": "uint256", "name": "leafCount", "type": "uint256"}
+                ],
+                "name": "anchorBatch",
+                "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+                "stateMutability": "nonpayable",
+                "type": "function"
+            },
+            {
+                "inputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
+                "name": "batchIdByRoot",
+                "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+                "stateMutability": "view",
+                "type": "function"
+            },
+            {
+                "anonymous": False,
+                "inputs": [
+                    {"indexed": True, "internalType": "uint256", "name": "batchId", "type": "uint256"},
+                    {"indexed": True, "internalType": "bytes32", "name": "root", "type": "bytes32"},
+                    {"indexed": False, "internalType": "uint256", "name": "leafCount", "type": "uint256"}
+                ],
+                "name": "BatchAnchored",
+                "type": "event"
+            }
+        ]
+
+    def batch_id(self, root: bytes) -> Optional[int]:
+        """Batch the root was anchored in, or None if it is not on chain"""
+        return self.contract.functions.batchIdByRoot(root).call() or None
+
+    def anchor_root(self, root: bytes, leaf_count: int) -> Dict[str, Any]:
+        """Post a batch root and wait for it to be mined"""
+        transaction = self.contract.functions.anchorBatch(root, leaf_count).build_transaction({
+            'from': self.from_address,
+            'chainId': self.w3.eth.chain_id,
+            'gas': 150000,
+            'gasPrice': self.pipeline.gas_oracle.get_gas_price()
+        })
+        tx_hash, receipt_future = self.pipeline.submit(transaction)
+        receipt = receipt_future.result()
+
+        events = self.contract.events.BatchAnchored().process_receipt(receipt)
+        return {
+            'transaction_hash': tx_hash.hex(),
+            'block_number': receipt['blockNumber'],
+            'batch_id': events[0]['args']['batchId'] if events else None
+        }
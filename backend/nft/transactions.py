@@ -0,0 +1,191 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+
+from ..metrics import stage
+
+class NonceManager:
+    """Hands out nonces for one account locally instead of asking the node per transaction"""
+
+    def __init__(self, w3: Web3, address: str):
+        self.w3 = w3
+        self.address = address
+        self._lock = threading.Lock()
+        self._next_nonce: Optional[int] = None
+
+    def next_nonce(self) -> int:
+        with self._lock:
+            if self._next_nonce is None:
+                # 'pending' includes our own transactions still in the mempool
+                self._next_nonce = self.w3.eth.get_transaction_count(self.address, 'pending')
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            return nonce
+
+    def resync(self) -> None:
+        """Forget the local counter; the next nonce is re-read from the node"""
+        with self._lock:
+            self._next_nonce = None
+
+    def peek(self) -> Optional[int]:
+        return self._next_nonce
+
+class GasPriceOracle:
+    """Caches eth.gas_price for refresh_interval seconds"""
+
+    def __init__(self, w3: Web3, refresh_interval: float = 15.0):
+        self.w3 = w3
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._gas_price: Optional[int] = None
+        self._fetched_at = 0.0
+
+    def get_gas_price(self) -> int:
+        with self._lock:
+            now = time.monotonic()
+            if self._gas_price is None or now - self._fetched_at >= self.refresh_interval:
+                self._gas_price = self.w3.eth.gas_price
+                self._fetched_at = now
+            return self._gas_price
+
+class TransactionPipeline:
+    """Signs and broadcasts transactions back-to-back and collects receipts asynchronously"""
+
+    def __init__(self, w3: Web3, private_key: str, nonce_manager: NonceManager,
+                 gas_oracle: GasPriceOracle, poll_interval: float = 1.0, receipt_timeout: float = 120.0):
+        self.w3 = w3
+        self.private_key = private_key
+        self.nonce_manager = nonce_manager
+        self.gas_oracle = gas_oracle
+        self.poll_interval = poll_interval
+        self.receipt_timeout = receipt_timeout
+        self.submitted = 0
+        self.confirmed = 0
+        self.failed = 0
+        self.receipt_errors = 0
+        self._pending: Dict[bytes, Tuple[Future, float]] = {}
+        # Last polling error per transaction, reported if it times out
+        self._errors: Dict[bytes, Exception] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._poller = threading.Thread(target=self._poll_receipts, name="receipt-poller", daemon=True)
+        self._poller.start()
+
+    def submit(self, transaction: Dict[str, Any]) -> Tuple[bytes, Future]:
+        """Fill in nonce (and gas price if unset), sign, broadcast; returns (tx_hash, receipt future)"""
+        if self._stopped.is_set():
+            raise RuntimeError("Transaction pipeline is stopped")
+        transaction = {
+            'gasPrice': self.gas_oracle.get_gas_price(),
+            **transaction,
+            'nonce': self.nonce_manager.next_nonce()
+        }
+        try:
+            with stage("tx_submit"):
+                signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
+                # eth-account renamed rawTransaction to raw_transaction in 0.13
+                raw = getattr(signed_txn, 'raw_transaction', None) or signed_txn.rawTransaction
+                tx_hash = self.w3.eth.send_raw_transaction(raw)
+        except Exception:
+            # The nonce may or may not have been consumed; let the node decide
+            self.nonce_manager.resync()
+            with self._lock:
+                self.failed += 1
+            raise
+
+        future: Future = Future()
+        with self._lock:
+            self._pending[bytes(tx_hash)] = (future, time.monotonic())
+            self.submitted += 1
+        self._wakeup.set()
+        return tx_hash, future
+
+    def in_flight(self) -> int:
+        """Transactions broadcast but not yet confirmed or failed"""
+        return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'in_flight': len(self._pending),
+                'submitted': self.submitted,
+                'confirmed': self.confirmed,
+                'failed': self.failed,
+                'receipt_errors': self.receipt_errors,
+                'next_nonce': self.nonce_manager.peek()
+            }
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        self._poller.join(timeout)
+        # Nobody polls for these any more; the transactions may still be mined
+        with self._lock:
+            pending = list(self._pending)
+        for tx_hash in pending:
+            self._resolve(tx_hash, exception=RuntimeError(
+                f"Transaction pipeline stopped before {Web3.to_hex(tx_hash)} was confirmed"
+            ))
+
+    def _poll_receipts(self) -> None:
+        while not self._stopped.is_set():
+            with self._lock:
+                pending = list(self._pending.items())
+            if not pending:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            for tx_hash, (future, submitted_at) in pending:
+                if self._stopped.is_set():
+                    break
+                try:
+                    receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+                except Exception as e:
+                    if not isinstance(e, TransactionNotFound):
+                        # Transient RPC failure (timeout, rate limit, node restart): poll again
+                        with self._lock:
+                            self.receipt_errors += 1
+                            self._errors[tx_hash] = e
+                    if time.monotonic() - submitted_at < self.receipt_timeout:
+                        continue
+                    last_error = self._errors.get(tx_hash)
+                    self._resolve(tx_hash, exception=TimeoutError(
+                        f"Transaction {Web3.to_hex(tx_hash)} not mined after {self.receipt_timeout}s"
+                        + (f" (last error: {last_error})" if last_error is not None else "")
+                    ))
+                    # A dropped transaction leaves a nonce gap
+                    self.nonce_manager.resync()
+                else:
+                    if receipt is None:
+                        continue
+                    if receipt.get('status', 1) == 0:
+                        self._resolve(tx_hash, exception=RuntimeError(
+                            f"Transaction {Web3.to_hex(tx_hash)} reverted"
+                        ))
+                    else:
+                        self._resolve(tx_hash, receipt=receipt)
+
+            self._stopped.wait(self.poll_interval)
+
+    def _resolve(self, tx_hash: bytes, receipt: Any = None, exception: Optional[BaseException] = None) -> None:
+        with self._lock:
+            entry = self._pending.pop(tx_hash, None)
+            self._errors.pop(tx_hash, None)
+            if entry is None:
+                # Already failed by stop() while a poll was in progress
+                return
+            future = entry[0]
+            if exception is None:
+                self.confirmed += 1
+            else:
+                self.failed += 1
+        if exception is None:
+            future.set_result(receipt)
+        else:
+            future.set_exception(exception)
@@ -0,0 +1,73 @@
+import hashlib
+import os
+import uuid
+from typing import AsyncIterable, AsyncIterator, Tuple
+
+import aiofiles
+import aiofiles.os
+
+class BlobStore:
+    """Content-addressed blobs on the local filesystem, written atomically"""
+
+    def __init__(self, root: str, chunk_size: int = 1024 * 1024):
+        self.root = root
+        self.chunk_size = chunk_size
+        self.tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    async def write_stream(self, chunks: AsyncIterable[bytes]) -> Tuple[str, int]:
+        """Store a stream of chunks; returns (sha256 hex digest, size in bytes)"""
+        hasher = hashlib.sha256()
+        size = 0
+        tmp_path = os.path.join(self.tmp_dir, uuid.uuid4().hex)
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                async for chunk in chunks:
+                    hasher.update(chunk)
+                    size += len(chunk)
+                    await f.write(chunk)
+            digest = hasher.hexdigest()
+            await self._commit(tmp_path, digest)
+        finally:
+            if await aiofiles.os.path.exists(tmp_path):
+                await aiofiles.os.remove(tmp_path)
+        return digest, size
+
+    async def write_bytes(self, data: bytes) -> Tuple[str, int]:
+        digest = hashlib.sha256(data).hexdigest()
+        if await self.exists(digest):
+            return digest, len(data)
+        tmp_path = os.path.join(self.tmp_dir, uuid.uuid4().hex)
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                await f.write(data)
+            await self._commit(tmp_path, digest)
+        finally:
+            if await aiofiles.os.path.exists(tmp_path):
+                await aiofiles.os.remove(tmp_path)
+        return digest, len(data)
+
+    async def exists(self, digest: str) -> bool:
+        return await aiofiles.os.path.exists(self.path_for(digest))
+
+    async def read_stream(self, digest: str) -> AsyncIterator[bytes]:
+        async with aiofiles.open(self.path_for(digest), 'rb') as f:
+            while True:
+                chunk = await f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    async def read_bytes(self, digest: str) -> bytes:
+        async with aiofiles.open(self.path_for(digest), 'rb') as f:
+            return await f.read()
+
+    async def _commit(self, tmp_path: str, digest: str) -> None:
+        final_path = self.path_for(digest)
+        if await aiofiles.os.path.exists(final_path):
+            return
+        await aiofiles.os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        await aiofiles.os.replace(tmp_path, final_path)
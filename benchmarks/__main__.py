@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+def _isolate_state() -> None:
+    # Before anything imports backend.config, which reads the environment once
+    scratch = tempfile.mkdtemp(prefix="content-marketplace-bench-")
+    defaults = {
+        'MODEL_PATH': "",
+        'DATABASE_URL': f"sqlite:///{os.path.join(scratch, 'bench.db')}",
+        'BLOB_STORE_PATH': os.path.join(scratch, "blobs"),
+        'DUPLICATE_INDEX_PATH': os.path.join(scratch, "feature_index"),
+        'VERIFICATION_CACHE_PATH': "",
+        'PROOF_JOBS_DB': os.path.join(scratch, "proof_jobs.db"),
+        'ANCHOR_DB': os.path.join(scratch, "anchors.db"),
+        'CIRCUITS_PATH': os.path.join(scratch, "circuits"),
+        'PROOF_PROCESS_WORKERS': "0",
+        # Reported by /mint; without a PRIVATE_KEY the fake chain is used
+        'CONTRACT_ADDRESS': "0x" + "44" * 20,
+        # The fake chain serves no logs to index
+        'INDEXER_ENABLED': "false"
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the verify -> prove -> mint pipeline (see Benchmarks in the README)")
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before failing (0.2 = 20%%)")
+    parser.add_argument("--only", default="", help="run micro benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds per micro benchmark")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--url", help="load-test a running server instead of the in-process app")
+    parser.add_argument("--scenarios", default="verify,mint", help="comma-separated HTTP scenarios")
+    parser.add_argument("--requests", type=int, default=500, help="HTTP requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--block-time", type=float, default=0.0, help="fake chain's seconds per mined transaction")
+    args = parser.parse_args(argv)
+
+    _isolate_state()
+    from . import harness, load, micro
+
+    results = {}
+    if not args.skip_micro:
+        results.update(micro.run(args.only, args.min_time))
+    if not args.skip_http:
+        results.update(asyncio.run(load.run(
+            args.scenarios.split(","), args.requests, args.concurrency, args.url, args.block_time
+        )))
+
+    comparison = None
+    if args.baseline:
+        comparison = harness.compare(results, harness.load_results(args.baseline), args.tolerance)
+    encoded = harness.write_results(args.output, results, comparison)
+    if not args.output:
+        print(encoded)
+
+    if comparison:
+        for row in comparison:
+            marker = "REGRESSED" if row['regressed'] else "ok"
+            print(f"{row['name']:40s} {row['baseline']:.6g} -> {row['current']:.6g} {row['unit']}"
+                  f"  x{row['slowdown']:.2f}  {marker}", file=sys.stderr)
+        if any(row['regressed'] for row in comparison):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
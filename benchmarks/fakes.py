@@ -0,0 +1,173 @@
+import json
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import rlp
+from eth_abi import decode, encode
+from web3 import Web3
+from web3.providers.base import BaseProvider
+
+from backend.nft.contract import ContentNFTContract
+from backend.nft.indexer import CONTENT_MINTED_TOPIC
+from backend.nft.ipfs import compute_cid
+
+MINT_SELECTOR = bytes(Web3.keccak(text="mintVerifiedContent(address,string,bytes32,bytes32,bytes)"))[:4]
+CONTRACT_ADDRESS = Web3.to_checksum_address("0x" + "44" * 20)
+# Well-known throwaway key; the fake chain accepts any signature
+PRIVATE_KEY = "0x" + "11" * 32
+
+class FakeChainProvider(BaseProvider):
+    """In-process JSON-RPC node for a real ``Web3``: one block per transaction"""
+
+    def __init__(self, block_time: float = 0.0):
+        super().__init__()
+        self.block_time = block_time
+        self.lock = threading.Lock()
+        self.receipts: Dict[bytes, Tuple[float, Dict[str, Any]]] = {}
+        self.minted = set()
+        self.next_token_id = 1
+
+    def make_request(self, method, params):
+        handler = getattr(self, f"_{method}", None)
+        if handler is None:
+            return {'jsonrpc': "2.0", 'id': 1, 'error': {'code': -32601, 'message': f"{method} not supported"}}
+        return {'jsonrpc': "2.0", 'id': 1, 'result': handler(*params)}
+
+    def _eth_chainId(self):
+        return hex(1337)
+
+    def _eth_gasPrice(self):
+        return hex(10)
+
+    def _eth_blockNumber(self):
+        with self.lock:
+            return hex(len(self.receipts))
+
+    def _eth_getTransactionCount(self, address, block_identifier):
+        with self.lock:
+            return hex(len(self.receipts))
+
+    def _eth_sendRawTransaction(self, raw):
+        raw = Web3.to_bytes(hexstr=raw) if isinstance(raw, str) else bytes(raw)
+        _, gas_price, gas, to, _, data = rlp.decode(raw)[:6]
+        tx_hash = bytes(Web3.keccak(raw))
+        with self.lock:
+            number = len(self.receipts) + 1
+            block_hash = Web3.to_hex(Web3.keccak(number.to_bytes(32, "big")))
+            logs, status = [], 1
+            if data[:4] == MINT_SELECTOR:
+                creator, token_uri, content_hash, model_hash, _ = decode(
+                    ["address", "string", "bytes32", "bytes32", "bytes"], data[4:]
+                )
+                if content_hash in self.minted:
+                    status = 0
+                else:
+                    self.minted.add(content_hash)
+                    token_id, self.next_token_id = self.next_token_id, self.next_token_id + 1
+                    logs.append({
+                        'address': Web3.to_checksum_address(to),
+                        'topics': [Web3.to_hex(CONTENT_MINTED_TOPIC), Web3.to_hex(token_id.to_bytes(32, "big")),
+                                   Web3.to_hex(bytes(12) + Web3.to_bytes(hexstr=creator))],
+                        'data': Web3.to_hex(encode(["bytes32", "bytes32", "string"],
+                                                   [content_hash, model_hash, token_uri])),
+                        'blockNumber': hex(number),
+                        'blockHash': block_hash,
+                        'transactionHash': Web3.to_hex(tx_hash),
+                        'transactionIndex': "0x0",
+                        'logIndex': "0x0",
+                        'removed': False
+                    })
+            self.receipts[tx_hash] = (time.monotonic(), {
+                'transactionHash': Web3.to_hex(tx_hash),
+                'transactionIndex': "0x0",
+                'blockHash': block_hash,
+                'blockNumber': hex(number),
+                'from': "0x" + "00" * 20,
+                'to': Web3.to_checksum_address(to),
+                'cumulativeGasUsed': hex(int.from_bytes(gas, "big")),
+                'gasUsed': hex(int.from_bytes(gas, "big")),
+                'effectiveGasPrice': hex(int.from_bytes(gas_price, "big")),
+                'contractAddress': None,
+                'logs': logs,
+                'logsBloom': "0x" + "00" * 256,
+                'status': hex(status),
+                'type': "0x0"
+            })
+        return Web3.to_hex(tx_hash)
+
+    def _eth_getTransactionReceipt(self, tx_hash):
+        with self.lock:
+            entry = self.receipts.get(Web3.to_bytes(hexstr=tx_hash))
+        if entry is None or time.monotonic() - entry[0] < self.block_time:
+            return None
+        return entry[1]
+
+def fake_nft_contract(block_time: float = 0.0, poll_interval: float = 0.01) -> ContentNFTContract:
+    """The real ContentNFTContract on a Web3 backed by FakeChainProvider"""
+    return ContentNFTContract(
+        "", CONTRACT_ADDRESS, PRIVATE_KEY,
+        w3=Web3(FakeChainProvider(block_time)),
+        gas_price_refresh=60,
+        receipt_poll_interval=poll_interval
+    )
+
+class FakeIPFSNode:
+    """Local stand-in for a Kubo node's ``block/put`` RPC, served over real HTTP"""
+
+    def __init__(self):
+        self.blocks: Dict[str, bytes] = {}
+        self.pinned = set()
+        self.requests = 0
+        self.fail_next = 0
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                node.requests += 1
+                if node.fail_next:
+                    node.fail_next -= 1
+                    self._reply(503, b"busy")
+                    return
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                if url.path != "/api/v0/block/put" or params.get('cid-codec') != ['raw']:
+                    self._reply(404, b"not found")
+                    return
+                message = BytesParser(policy=HTTP).parsebytes(
+                    f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+                )
+                lines = []
+                for part in message.iter_parts():
+                    data = part.get_content()
+                    cid = compute_cid(data)
+                    node.blocks[cid] = data
+                    if params.get('pin') == ['true']:
+                        node.pinned.add(cid)
+                    lines.append(json.dumps({'Key': cid, 'Size': len(data)}))
+                self._reply(200, ("\n".join(lines) + "\n").encode())
+
+            def _reply(self, status: int, payload: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-ipfs", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
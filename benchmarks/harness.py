@@ -0,0 +1,93 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary of per-call durations in seconds"""
+    return {
+        'runs': len(samples),
+        'mean_s': statistics.fmean(samples),
+        'median_s': statistics.median(samples),
+        'p95_s': _percentile(samples, 0.95),
+        'min_s': min(samples),
+        'stdev_s': statistics.stdev(samples) if len(samples) > 1 else 0.0
+    }
+
+def measure(fn: Callable[[], Any], min_time: float = 1.0, min_runs: int = 5,
+            max_runs: int = 100000, warmup: int = 3) -> Dict[str, Any]:
+    """Call ``fn`` repeatedly for at least ``min_time`` seconds and summarise the calls"""
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_runs and (len(samples) < min_runs or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    result = summarize(samples)
+    result.update({'value': result['median_s'], 'unit': 's/op', 'lower_is_better': True})
+    return result
+
+def environment() -> Dict[str, Any]:
+    info = {
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        info['torch'] = torch.__version__
+        info['torch_threads'] = torch.get_num_threads()
+    try:
+        info['git_rev'] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return info
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float = 0.2) -> List[Dict[str, Any]]:
+    """Per-benchmark change against a baseline run; ``regressed`` beyond ``tolerance``"""
+    rows = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None or not reference.get('value'):
+            continue
+        ratio = result['value'] / reference['value']
+        # Express every change so that > 1 means slower
+        slowdown = ratio if result['lower_is_better'] else 1.0 / ratio if ratio else float('inf')
+        rows.append({
+            'name': name,
+            'baseline': reference['value'],
+            'current': result['value'],
+            'unit': result['unit'],
+            'slowdown': slowdown,
+            'regressed': slowdown > 1.0 + tolerance
+        })
+    return rows
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)['results']
+
+def write_results(path: Optional[str], results: Dict[str, Dict[str, Any]],
+                  comparison: Optional[List[Dict[str, Any]]] = None) -> str:
+    document = {'environment': environment(), 'results': results}
+    if comparison is not None:
+        document['comparison'] = comparison
+    encoded = json.dumps(document, indent=2, sort_keys=True)
+    if path:
+        with open(path, "w") as f:
+            f.write(encoded + "\n")
+    return encoded
@@ -0,0 +1,124 @@
+import asyncio
+import collections
+import hashlib
+import itertools
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from .harness import summarize
+
+RequestFactory = Callable[[int], Tuple[str, str, Dict[str, Any]]]
+
+def verify_request(i: int) -> Tuple[str, str, Dict[str, Any]]:
+    # Unique content per request, so the verification cache does not short-circuit inference
+    return "POST", "/api/v1/verify", {
+        'content': f"load test content {i}",
+        'content_type': 'text',
+        'creator_address': "0x" + f"{i % 1000:040x}"
+    }
+
+def _mint_content(i: int) -> str:
+    return f"mint load content {i}"
+
+def mint_request(i: int) -> Tuple[str, str, Dict[str, Any]]:
+    # Content hashes are the SHA-256 of the content, verified by prepare_mint
+    return "POST", "/api/v1/mint", {
+        'content_hash': hashlib.sha256(_mint_content(i).encode()).hexdigest(),
+        'creator_address': "0x" + f"{i % 1000:040x}"
+    }
+
+async def prepare_mint(client: httpx.AsyncClient, requests: int) -> None:
+    """Verify the content the mint scenario will mint (minting unknown content is a 404)"""
+    for start in range(0, requests, 256):
+        body = "\n".join(json.dumps({
+            'content': _mint_content(i),
+            'creator_address': "0x" + f"{i % 1000:040x}"
+        }) for i in range(start, min(requests, start + 256)))
+        response = await client.post("/api/v1/verify/batch", content=body,
+                                     headers={'content-type': "application/x-ndjson"})
+        response.raise_for_status()
+
+SCENARIOS: Dict[str, RequestFactory] = {
+    'verify': verify_request,
+    'mint': mint_request
+}
+
+# Run once, untimed, before a scenario's load
+SETUP: Dict[str, Callable[[httpx.AsyncClient, int], Awaitable[None]]] = {
+    'mint': prepare_mint
+}
+
+async def generate_load(client: httpx.AsyncClient, make_request: RequestFactory,
+                        requests: int, concurrency: int) -> Dict[str, Any]:
+    """Closed-loop load: ``concurrency`` clients issue ``requests`` requests in total"""
+    counter = itertools.count()
+    latencies = []
+    statuses: Dict[int, int] = collections.Counter()
+
+    async def worker() -> None:
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            method, path, body = make_request(i)
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    result = summarize(latencies)
+    result.update({
+        'p99_s': sorted(latencies)[min(len(latencies) - 1, int(0.99 * len(latencies)))],
+        'concurrency': concurrency,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'requests_per_s': len(latencies) / elapsed,
+        # Shed (429/503) responses are cheap, so only successes count as throughput
+        'value': sum(count for status, count in statuses.items() if status < 300) / elapsed,
+        'unit': 'req/s',
+        'lower_is_better': False
+    })
+    return result
+
+@asynccontextmanager
+async def in_process_client(block_time: float = 0.0) -> AsyncIterator[httpx.AsyncClient]:
+    """The FastAPI app behind an ASGI transport, with the fake chain for /mint"""
+    from backend.api.routes import lifespan, services
+    from backend.main import app
+    from .fakes import fake_nft_contract
+
+    async with lifespan(app):
+        if not await services.wait_ready(120):
+            raise RuntimeError(f"Service did not become ready: {services.status()}")
+        if services.nft_minter is None:
+            from backend.nft.minting import NFTMinter
+            services.nft_minter = NFTMinter(fake_nft_contract(block_time))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            yield client
+
+async def run(scenarios=("verify", "mint"), requests: int = 500, concurrency: int = 32,
+              url: Optional[str] = None, block_time: float = 0.0) -> Dict[str, Dict[str, Any]]:
+    """Throughput and latency per scenario, against ``url`` or an in-process app"""
+    if url:
+        client_context = httpx.AsyncClient(base_url=url, timeout=120,
+                                           limits=httpx.Limits(max_connections=concurrency))
+    else:
+        client_context = in_process_client(block_time)
+
+    results = {}
+    async with client_context as client:
+        for name in scenarios:
+            if name in SETUP:
+                await SETUP[name](client, requests)
+            results[f"http.{name}[c={concurrency}]"] = await generate_load(
+                client, SCENARIOS[name], requests, concurrency
+            )
+    return results
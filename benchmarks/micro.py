@@ -0,0 +1,105 @@
+import itertools
+import os
+import tempfile
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from .harness import measure
+
+Case = Tuple[str, Callable[[], Any]]
+
+def model_cases(batch_sizes=(1, 8, 32, 128)) -> Iterator[Case]:
+    import torch
+    from backend.ai_verification.model import ContentProcessor
+
+    torch.manual_seed(0)
+    processor = ContentProcessor(None)
+    texts = [f"benchmark content {i}" for i in range(max(batch_sizes))]
+
+    yield "features.text_to_features", lambda: processor._text_to_features(texts[0])
+    yield "features.texts_to_features[32]", lambda: processor._texts_to_features(texts[:32])
+    for batch_size in batch_sizes:
+        features = processor._texts_to_features(texts[:batch_size])
+        yield f"model.forward[{batch_size}]", lambda features=features: processor.backend(features)
+    yield "model.process_batch[32]", lambda: processor.process_batch(texts[:32])
+
+    model = processor.backend.model
+    def model_hash():
+        model.invalidate_model_hash()
+        return model.get_model_hash()
+    yield "model.get_model_hash", model_hash
+    yield "model.get_model_hash[cached]", model.get_model_hash
+
+def proof_cases() -> Iterator[Case]:
+    from backend.ai_verification.model import ContentProcessor
+    from backend.ai_verification.zk_circuits import ZKProofGenerator
+
+    verification_data = ContentProcessor(None).process_content("benchmark proof input")
+    generator = ZKProofGenerator(tempfile.mkdtemp(prefix="bench-circuits-"))
+    args = (verification_data['content_hash'], verification_data['model_hash'], verification_data)
+    yield "zk.build_circuit_input", lambda: generator.build_circuit_input(*args)
+    yield "zk.generate_verification_proof", lambda: generator.generate_verification_proof(*args)
+
+def verifier_cases() -> Iterator[Case]:
+    from backend.ai_verification.verification import ContentVerifier
+
+    verifier = ContentVerifier(None, tempfile.mkdtemp(prefix="bench-circuits-"), max_batch_size=1)
+    counter = itertools.count()
+    creator = "0x" + "22" * 20
+    yield "verifier.verify_content", lambda: verifier.verify_content(f"unique content {next(counter)}", creator)
+    yield "verifier.verify_batch[32]", lambda: verifier.verify_batch(
+        [(f"unique batch content {next(counter)}", creator) for _ in range(32)]
+    )
+
+def minting_cases() -> Iterator[Case]:
+    from backend.nft.ipfs import IPFSPublisher, MetadataStore
+    from backend.nft.minting import NFTMinter
+    from .fakes import FakeIPFSNode, fake_nft_contract
+
+    store = MetadataStore(os.path.join(tempfile.mkdtemp(prefix="bench-ipfs-"), "ipfs_objects.db"))
+    minter = NFTMinter(fake_nft_contract(), metadata_store=store)
+    content_data = {'content_hash': "ab" * 32, 'creator_address': "0x" + "33" * 20, 'content_type': 'text'}
+    verification_record = {
+        'content_hash': content_data['content_hash'],
+        'model_hash': "cd" * 32,
+        'verification_data': {'is_ai_assisted': True, 'verification_scores': [[0.2, 0.8]]},
+        'zk_proof': {'proof': 'bench'},
+        'timestamp': None
+    }
+    metadata = minter.create_metadata(content_data, verification_record)
+    yield "nft.create_metadata", lambda: minter.create_metadata(content_data, verification_record)
+    yield "nft.upload_to_ipfs", lambda: minter.upload_to_ipfs(metadata)
+    token_counter = itertools.count()
+    # The fake chain reverts repeated content hashes, as the contract does
+    def mint():
+        content_hash = f"{next(token_counter):064x}"
+        return minter.mint_verified_content({**content_data, 'content_hash': content_hash},
+                                            {**verification_record, 'content_hash': content_hash})
+    yield "nft.mint_verified_content", mint
+    minter.contract.pipeline.stop()
+
+    # One multipart request per batch of 32 distinct metadata objects
+    node = FakeIPFSNode()
+    publisher = IPFSPublisher(store, node.url, batch_size=32)
+    counter = itertools.count()
+    def publish_batch():
+        for _ in range(32):
+            store.put({**metadata, 'name': f"bench {next(counter)}"})
+        return publisher.publish_pending()
+    yield "ipfs.publish_batch[32]", publish_batch
+    publisher.stop()
+    node.close()
+
+SUITES: Dict[str, Callable[[], Iterator[Case]]] = {
+    'model': model_cases,
+    'proof': proof_cases,
+    'verifier': verifier_cases,
+    'minting': minting_cases
+}
+
+def run(pattern: str = "", min_time: float = 1.0) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for suite in SUITES.values():
+        for name, fn in suite():
+            if pattern in name:
+                results[name] = measure(fn, min_time=min_time)
+    return results
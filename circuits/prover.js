@@ -0,0 +1,28 @@
+// Resident Groth16 prover used by backend/ai_verification/zk_circuits.py (SnarkjsProver).
+// Usage: node prover.js <circuit.wasm> <circuit.zkey>
+// Loads both artifacts into memory once, prints {"ready": true, ...}, then
+// answers one JSON circuit input per stdin line with one JSON proof per stdout line.
+const fs = require("fs");
+const readline = require("readline");
+const snarkjs = require("snarkjs");
+
+async function main() {
+    const [wasmPath, zkeyPath] = process.argv.slice(2);
+    const started = Date.now();
+    const wasm = { type: "mem", data: new Uint8Array(fs.readFileSync(wasmPath)) };
+    const zkey = { type: "mem", data: new Uint8Array(fs.readFileSync(zkeyPath)) };
+    process.stdout.write(JSON.stringify({ ready: true, load_time_ms: Date.now() - started }) + "\n");
+
+    const lines = readline.createInterface({ input: process.stdin });
+    for await (const line of lines) {
+        if (!line.trim()) continue;
+        try {
+            const { proof, publicSignals } = await snarkjs.groth16.fullProve(JSON.parse(line), wasm, zkey);
+            process.stdout.write(JSON.stringify({ proof, public_signals: publicSignals }) + "\n");
+        } catch (e) {
+            process.stdout.write(JSON.stringify({ error: String(e) }) + "\n");
+        }
+    }
+}
+
+main();
@@ -1,7 +1,66 @@
-
 // SPDX-License-Identifier: MIT
 pragma solidity ^0.8.0;
 
-contract VerificationRegistry {
-    // registry for verified content proofs (placeholder)
+import "@openzeppelin/contracts/access/Ownable.sol";
+import "@openzeppelin/contracts/utils/cryptography/MerkleProof.sol";
+
+contract VerificationRegistry is Ownable {
+    struct Batch {
+        bytes32 root;
+        uint256 leafCount;
+        uint256 timestamp;
+    }
+
+    // Batches are numbered from 1; 0 means "not anchored"
+    Batch[] private _batches;
+    mapping(bytes32 => uint256) public batchIdByRoot;
+
+    event BatchAnchored(
+        uint256 indexed batchId,
+        bytes32 indexed root,
+        uint256 leafCount
+    );
+
+    // Leaves are keccak256(contentHash, modelHash, proofDigest) and inner nodes
+    // hash sorted pairs, matching OpenZeppelin's MerkleProof
+    function anchorBatch(bytes32 root, uint256 leafCount) external onlyOwner returns (uint256) {
+        require(root != bytes32(0), "Empty root");
+        require(batchIdByRoot[root] == 0, "Root already anchored");
+
+        _batches.push(Batch({
+            root: root,
+            leafCount: leafCount,
+            timestamp: block.timestamp
+        }));
+        uint256 batchId = _batches.length;
+        batchIdByRoot[root] = batchId;
+
+        emit BatchAnchored(batchId, root, leafCount);
+
+        return batchId;
+    }
+
+    function getBatch(uint256 batchId) external view returns (bytes32, uint256, uint256) {
+        require(batchId > 0 && batchId <= _batches.length, "Batch does not exist");
+        Batch memory batch = _batches[batchId - 1];
+        return (batch.root, batch.leafCount, batch.timestamp);
+    }
+
+    function batchCount() external view returns (uint256) {
+        return _batches.length;
+    }
+
+    function verifyInclusion(
+        bytes32 root,
+        bytes32 contentHash,
+        bytes32 modelHash,
+        bytes32 proofDigest,
+        bytes32[] calldata merkleProof
+    ) external view returns (bool) {
+        if (batchIdByRoot[root] == 0) {
+            return false;
+        }
+        bytes32 leaf = keccak256(abi.encodePacked(contentHash, modelHash, proofDigest));
+        return MerkleProof.verify(merkleProof, root, leaf);
+    }
 }
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# Settings that place files relative to the working directory
+_LOCAL_PATHS = {
+    'DATABASE_URL': lambda root: f"sqlite:///{os.path.join(root, 'content_marketplace.db')}",
+    'PROOF_JOBS_DB': lambda root: os.path.join(root, "proof_jobs.db"),
+    'BLOB_STORE_PATH': lambda root: os.path.join(root, "blobs"),
+    'DUPLICATE_INDEX_PATH': lambda root: os.path.join(root, "feature_index"),
+    'ANCHOR_DB': lambda root: os.path.join(root, "anchors.db"),
+    'IPFS_STORE_DB': lambda root: os.path.join(root, "ipfs_objects.db"),
+    'OWNER_LOCK_PATH': lambda root: os.path.join(root, "owner.lock"),
+}
+
+
+@pytest.fixture(autouse=True, scope="session")
+def app_paths(tmp_path_factory):
+    """Point the app's databases, stores and locks at a temporary directory"""
+    # Session-wide, as the app's services are a module-level singleton built on
+    # first import; the environment also covers subprocesses
+    root = str(tmp_path_factory.mktemp("app"))
+    with pytest.MonkeyPatch.context() as patch:
+        for name, path in _LOCAL_PATHS.items():
+            patch.setenv(name, path(root))
+            if "backend.config" in sys.modules:
+                patch.setattr(sys.modules["backend.config"].config, name, path(root))
+        yield root
@@ -0,0 +1,41 @@
+import time
+
+
+def test_token_bucket_limits_each_key():
+    import pytest
+    from backend.api.admission import Overloaded, TokenBucketLimiter
+
+    limiter = TokenBucketLimiter(rate=1.0, burst=2)
+    limiter.acquire("0xa")
+    limiter.acquire("0xa")
+    with pytest.raises(Overloaded) as excinfo:
+        limiter.acquire("0xa")
+    assert excinfo.value.status_code == 429
+    assert 0 < excinfo.value.retry_after <= 1.0
+    # Other creators have their own bucket
+    limiter.acquire("0xb")
+    assert limiter.get_stats()['rejected'] == 1
+
+
+def test_rate_limited_verify_returns_429(monkeypatch):
+    monkeypatch.setenv("MODEL_PATH", "")
+    monkeypatch.setenv("PROOF_PROCESS_WORKERS", "0")
+    from fastapi.testclient import TestClient
+    from backend.api import routes
+    from backend.api.admission import TokenBucketLimiter
+    from backend.main import app
+
+    monkeypatch.setattr(routes.services, "rate_limiter", TokenBucketLimiter(rate=0.5, burst=1))
+    submission = {"content": "rate limited", "content_type": "text",
+                  "creator_address": "0x0000000000000000000000000000000000000002"}
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 30
+        while client.get("/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert client.post("/api/v1/verify", json=submission).status_code == 200
+        rejected = client.post("/api/v1/verify", json=submission)
+        metrics = client.get("/metrics").text
+
+    assert rejected.status_code == 429
+    assert rejected.headers["retry-after"] == "2"
+    assert 'content_marketplace_requests_shed_total{reason="rate_limit"}' in metrics
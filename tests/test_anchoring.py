@@ -0,0 +1,129 @@
+import hashlib
+
+
+class FakeRegistry:
+    """Local stand-in for VerificationRegistry: records anchored roots"""
+
+    def __init__(self):
+        self.roots = []
+
+    def anchor_root(self, root, leaf_count):
+        self.roots.append((root, leaf_count))
+        return {"batch_id": len(self.roots), "transaction_hash": "0x" + root.hex()}
+
+
+def _hex(i):
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+def test_merkle_proofs_verify_for_every_leaf():
+    from backend.nft.anchoring import MerkleTree
+
+    for size in (1, 2, 3, 7, 8, 13):
+        leaves = [hashlib.sha256(bytes([i])).digest() for i in range(size)]
+        tree = MerkleTree(leaves)
+        for index, leaf in enumerate(leaves):
+            assert MerkleTree.verify(leaf, tree.proof(index), tree.root)
+        assert not MerkleTree.verify(b"\0" * 32, tree.proof(0), tree.root)
+
+
+def test_batcher_flushes_by_size_and_stores_inclusion_proofs(tmp_path):
+    from backend.nft.anchoring import AnchorBatcher, MerkleTree, leaf_hash, proof_digest
+
+    registry = FakeRegistry()
+    batcher = AnchorBatcher(registry, str(tmp_path / "anchors.db"), max_batch_size=4, max_delay=60)
+    for i in range(5):
+        batcher.add(_hex(i), _hex("model"), {"proof": i})
+    batcher.add(_hex(0), _hex("model"), {"proof": 0})
+
+    batch = batcher.flush()
+    assert batch["leaf_count"] == 4
+    assert batcher.get_inclusion_proof(_hex(4))["status"] == "pending"
+
+    proof = batcher.get_inclusion_proof(_hex(2))
+    leaf = leaf_hash(_hex(2), _hex("model"), proof_digest({"proof": 2}))
+    assert proof["leaf"] == leaf.hex()
+    assert MerkleTree.verify(leaf, [bytes.fromhex(p) for p in proof["merkle_proof"]], registry.roots[0][0])
+    assert proof["batch_id"] == 1
+
+
+def test_batcher_flushes_on_deadline(tmp_path):
+    import time
+    from backend.nft.anchoring import AnchorBatcher
+
+    registry = FakeRegistry()
+    batcher = AnchorBatcher(registry, str(tmp_path / "anchors.db"), max_batch_size=100, max_delay=0.05)
+    batcher.start()
+    try:
+        batcher.add(_hex(1), _hex("model"), {"proof": 1})
+        deadline = time.monotonic() + 5
+        while not registry.roots and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        batcher.stop()
+    assert registry.roots[0][1] == 1
+
+
+def test_batcher_retries_the_same_root_and_accepts_already_anchored(tmp_path):
+    import pytest
+    from backend.nft.anchoring import AnchorBatcher
+
+    class UnreliableRegistry(FakeRegistry):
+        """Fails the first submission outright, then mines one but loses the response"""
+
+        def __init__(self):
+            super().__init__()
+            self.attempts = []
+
+        def anchor_root(self, root, leaf_count):
+            self.attempts.append(root)
+            if len(self.attempts) == 1:
+                raise ConnectionError("node unavailable")
+            if len(self.attempts) == 2:
+                super().anchor_root(root, leaf_count)
+                raise TimeoutError("receipt lost")
+            if any(anchored == root for anchored, _ in self.roots):
+                raise ValueError("Root already anchored")
+            return super().anchor_root(root, leaf_count)
+
+        def batch_id(self, root):
+            return next((i + 1 for i, (anchored, _) in enumerate(self.roots) if anchored == root), None)
+
+    registry = UnreliableRegistry()
+    batcher = AnchorBatcher(registry, str(tmp_path / "anchors.db"), max_batch_size=2, max_delay=60)
+    batcher.add(_hex(1), _hex("model"), {"proof": 1})
+    batcher.add(_hex(2), _hex("model"), {"proof": 2})
+    with pytest.raises(ConnectionError):
+        batcher.flush()
+
+    # Leaves added meanwhile do not change the batch being retried
+    batcher.add(_hex(3), _hex("model"), {"proof": 3})
+    batch = batcher.flush()
+    assert registry.attempts[0] == registry.attempts[1] == bytes.fromhex(batch["root"])
+    assert batch["batch_id"] == 1 and batcher.get_stats()["already_anchored"] == 1
+    assert batcher.get_inclusion_proof(_hex(2))["status"] == "anchored"
+    assert batcher.get_inclusion_proof(_hex(3))["status"] == "pending"
+
+    assert batcher.flush()["leaf_count"] == 1
+    assert batcher.get_stats()["pending_leaves"] == 0
+
+
+def test_reverification_under_a_new_model_is_anchored_separately(tmp_path):
+    from backend.nft.anchoring import AnchorBatcher
+
+    registry = FakeRegistry()
+    batcher = AnchorBatcher(registry, str(tmp_path / "anchors.db"), max_batch_size=4, max_delay=60)
+    batcher.add(_hex(1), _hex("model-1"), {"proof": 1})
+    batcher.flush()
+
+    # After a model swap the same content is verified again with a new proof
+    batcher.add(_hex(1), _hex("model-2"), {"proof": 2})
+    assert batcher.get_inclusion_proof(_hex(1))["status"] == "pending"
+    assert batcher.get_inclusion_proof(_hex(1), _hex("model-1"))["status"] == "anchored"
+    batcher.flush()
+
+    old = batcher.get_inclusion_proof(_hex(1), _hex("model-1"))
+    new = batcher.get_inclusion_proof(_hex(1), _hex("model-2"))
+    assert old["batch_id"] == 1 and new["batch_id"] == 2
+    assert batcher.get_inclusion_proof(_hex(1))["model_hash"] == _hex("model-2")
+    assert batcher.get_inclusion_proof(_hex(1), _hex("model-3")) is None
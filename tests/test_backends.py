@@ -0,0 +1,39 @@
+import pytest
+
+
+@pytest.mark.parametrize("backend", ["int8", "torchscript"])
+def test_backend_passes_parity_with_distinct_fingerprint(backend, tmp_path):
+    import torch
+    from backend.ai_verification.model import ContentProcessor, ContentVerificationModel
+
+    # Weights whose int8 decisions match fp32 on the parity samples
+    torch.manual_seed(2)
+    model_path = tmp_path / "model.pth"
+    torch.save(ContentVerificationModel().state_dict(), model_path)
+
+    eager = ContentProcessor(str(model_path))
+    optimized = ContentProcessor(str(model_path), backend=backend)
+    assert optimized.parity['passed']
+
+    # Distinct from the fp32 fingerprint, and stable for the same weights
+    assert eager.model_hash == eager.model.get_model_hash()
+    assert optimized.model_hash != eager.model_hash
+    assert ContentProcessor(str(model_path), backend=backend).model_hash == optimized.model_hash
+
+    result = optimized.process_content("parity check")
+    assert result['model_hash'] == optimized.model_hash
+    assert result['is_ai_assisted'] == eager.process_content("parity check")['is_ai_assisted']
+
+
+def test_backend_failing_parity_refuses_to_load(tmp_path):
+    import torch
+    from backend.ai_verification.model import ContentProcessor, ContentVerificationModel
+
+    # Weights where int8 flips a few near-threshold decisions
+    torch.manual_seed(6)
+    model_path = tmp_path / "model.pth"
+    torch.save(ContentVerificationModel().state_dict(), model_path)
+
+    with pytest.raises(RuntimeError, match="parity"):
+        ContentProcessor(str(model_path), backend="int8")
+    assert ContentProcessor(str(model_path), backend="int8", parity_tolerance=None).parity is None
@@ -0,0 +1,110 @@
+import json
+
+
+def test_verify_batch_streams_ndjson(monkeypatch):
+    monkeypatch.setenv("MODEL_PATH", "")
+    monkeypatch.setenv("PROOF_PROCESS_WORKERS", "0")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.api import routes
+
+    app = FastAPI(lifespan=routes.lifespan)
+    app.include_router(routes.router, prefix="/api/v1")
+    items = [{"content": f"item {i}", "creator_address": "0x1"} for i in range(5)]
+    items.insert(2, {"content": "missing creator"})
+    body = "\n".join(json.dumps(item) for item in items)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/v1/verify/batch",
+            content=body,
+            headers={"content-type": "application/x-ndjson"}
+        )
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert lines[0] == {"index": 2, "error": lines[0]["error"]}
+    assert [line["index"] for line in lines[1:]] == [0, 1, 3, 4, 5]
+    assert [line["content_hash"] for line in lines[1:]] == [
+        routes.services.verifier.processor._hash_content(item["content"]) for item in items if "creator_address" in item
+    ]
+
+
+def test_verify_batch_reports_item_failures_and_keeps_going(monkeypatch):
+    monkeypatch.setenv("MODEL_PATH", "")
+    monkeypatch.setenv("PROOF_PROCESS_WORKERS", "0")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.api import routes
+
+    app = FastAPI(lifespan=routes.lifespan)
+    app.include_router(routes.router, prefix="/api/v1")
+    items = [{"content": f"array item {i}", "creator_address": "0x1"} for i in range(6)]
+    # A JSON array body, truncated after the sixth item
+    body = json.dumps(items)[:-1] + ', {"content": '
+
+    with TestClient(app) as client:
+        write_bytes = routes.services.blob_store.write_bytes
+
+        async def failing_write(data):
+            if data == b"array item 4":
+                raise OSError("disk full")
+            return await write_bytes(data)
+
+        monkeypatch.setattr(routes.config, "VERIFY_BATCH_CHUNK_SIZE", 4)
+        monkeypatch.setattr(routes.services.blob_store, "write_bytes", failing_write)
+        response = client.post("/api/v1/verify/batch", content=body, headers={"content-type": "application/json"})
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2, 3, 4, 5, 6]
+    assert "content_hash" in lines[5] and "disk full" in lines[4]["error"]
+    assert "Invalid batch body" in lines[6]["error"]
+
+
+def test_json_array_bodies_are_parsed_incrementally():
+    import io
+    from backend.api.routes import _iter_json_array
+
+    class CountingBody(io.BytesIO):
+        def __init__(self, data):
+            super().__init__(data)
+            self.reads = 0
+
+        def read(self, size=-1):
+            self.reads += 1
+            return super().read(size)
+
+    items = [{"content": "é" * i, "creator_address": "0x1"} for i in range(40)] + [12345]
+    body = CountingBody(json.dumps(items, indent=1).encode())
+    parsed = _iter_json_array(body, block_size=7)
+    assert next(parsed) == items[0] and body.reads < 10
+    assert list(parsed) == items[1:]
+    assert list(_iter_json_array(io.BytesIO(b" [ ] "), block_size=1)) == []
+
+
+def test_verify_batch_queues_proofs_for_anchoring(monkeypatch, tmp_path):
+    monkeypatch.setenv("MODEL_PATH", "")
+    monkeypatch.setenv("PROOF_PROCESS_WORKERS", "0")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.api import routes
+    from backend.nft.anchoring import AnchorBatcher
+
+    class FakeRegistry:
+        def anchor_root(self, root, leaf_count):
+            return {"batch_id": 1, "transaction_hash": "0x" + root.hex()}
+
+    app = FastAPI(lifespan=routes.lifespan)
+    app.include_router(routes.router, prefix="/api/v1")
+    body = "\n".join(json.dumps({"content": f"anchored {i}", "creator_address": "0x1"}) for i in range(3))
+
+    with TestClient(app) as client:
+        monkeypatch.setattr(routes.services, "anchor_batcher",
+                            AnchorBatcher(FakeRegistry(), str(tmp_path / "anchors.db"), max_delay=60))
+        lines = client.post("/api/v1/verify/batch", content=body,
+                            headers={"content-type": "application/x-ndjson"}).text.splitlines()
+        anchors = [client.get(f"/api/v1/anchors/{json.loads(line)['content_hash']}") for line in lines]
+        monkeypatch.setattr(routes.services, "anchor_batcher", None)
+
+    assert len(anchors) == 3
+    assert all(anchor.status_code == 200 and anchor.json()["status"] == "pending" for anchor in anchors)
@@ -0,0 +1,63 @@
+
+def test_batch_matches_single_item_processing():
+    from backend.ai_verification.model import ContentProcessor
+
+    processor = ContentProcessor()
+    texts = ["first", "second", "third"]
+    batched = processor.process_batch(texts)
+    for text, result in zip(texts, batched):
+        single = processor.process_content(text)
+        assert result['content_hash'] == single['content_hash']
+        assert result['is_ai_assisted'] == single['is_ai_assisted']
+        assert abs(result['verification_scores'][0][1] - single['verification_scores'][0][1]) < 1e-6
+
+
+def test_engine_batches_concurrent_requests():
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.ai_verification.model import ContentProcessor
+    from backend.ai_verification.batching import BatchingInferenceEngine
+
+    engine = BatchingInferenceEngine(ContentProcessor(), max_batch_size=8, max_wait_ms=20)
+    try:
+        texts = [f"item {i}" for i in range(16)]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(engine.process_content, texts))
+        assert [r['content_hash'] for r in results] == [
+            engine.processor._hash_content(t) for t in texts
+        ]
+        stats = engine.get_stats()
+        assert stats['items'] == 16
+        assert stats['batches'] < 16
+    finally:
+        engine.stop()
+
+
+def test_stop_resolves_queued_requests():
+    import threading
+    import pytest
+    from backend.ai_verification.batching import BatchingInferenceEngine
+
+    release = threading.Event()
+
+    class SlowProcessor:
+        def process_batch(self, texts):
+            release.wait(5)
+            return [{'content': text} for text in texts]
+
+    engine = BatchingInferenceEngine(SlowProcessor(), max_batch_size=2, max_wait_ms=0)
+    futures = [engine.submit(f"item {i}") for i in range(5)]
+    threading.Timer(0.05, release.set).start()
+    engine.stop()
+    assert [future.result(timeout=0)['content'] for future in futures] == [f"item {i}" for i in range(5)]
+    with pytest.raises(RuntimeError):
+        engine.submit("late")
+
+    # Items the worker cannot reach before the timeout fail instead of hanging
+    release.clear()
+    engine = BatchingInferenceEngine(SlowProcessor(), max_batch_size=1, max_wait_ms=0)
+    futures = [engine.submit(f"item {i}") for i in range(3)]
+    engine.stop(timeout=0.05)
+    with pytest.raises(RuntimeError):
+        futures[-1].result(timeout=0)
+    release.set()
+    assert futures[0].result(timeout=5)['content'] == "item 0"
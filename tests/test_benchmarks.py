@@ -0,0 +1,40 @@
+
+def test_compare_flags_regressions_in_both_directions():
+    from benchmarks.harness import compare
+
+    baseline = {
+        'model.forward[32]': {'value': 1.0, 'unit': 's/op', 'lower_is_better': True},
+        'http.verify[c=32]': {'value': 100.0, 'unit': 'req/s', 'lower_is_better': False}
+    }
+    current = {
+        'model.forward[32]': {'value': 1.1, 'unit': 's/op', 'lower_is_better': True},
+        'http.verify[c=32]': {'value': 50.0, 'unit': 'req/s', 'lower_is_better': False},
+        'new.benchmark': {'value': 1.0, 'unit': 's/op', 'lower_is_better': True}
+    }
+    rows = {row['name']: row for row in compare(current, baseline, tolerance=0.2)}
+    assert set(rows) == {'model.forward[32]', 'http.verify[c=32]'}
+    assert not rows['model.forward[32]']['regressed']
+    assert rows['http.verify[c=32]']['regressed']
+    assert rows['http.verify[c=32]']['slowdown'] == 2.0
+
+
+def test_minting_benchmarks_run_against_fake_chain():
+    from benchmarks.harness import measure
+    from benchmarks.micro import minting_cases
+
+    results = {name: measure(fn, min_time=0.0, min_runs=2, warmup=0) for name, fn in minting_cases()}
+    assert set(results) == {"nft.create_metadata", "nft.upload_to_ipfs", "nft.mint_verified_content",
+                            "ipfs.publish_batch[32]"}
+    assert all(result['runs'] == 2 for result in results.values())
+
+
+def test_mint_load_runs_the_real_contract_wrapper(monkeypatch):
+    import asyncio
+    from backend.config import config
+    from benchmarks.fakes import CONTRACT_ADDRESS
+    from benchmarks.load import run
+
+    monkeypatch.setattr(config, "CONTRACT_ADDRESS", CONTRACT_ADDRESS)
+    # Requests 10+ use creator addresses with hex letters, which must be checksummed
+    results = asyncio.run(run(scenarios=("mint",), requests=12, concurrency=2))
+    assert results["http.mint[c=2]"]["statuses"] == {"200": 12}
@@ -0,0 +1,54 @@
+import asyncio
+import hashlib
+import os
+
+
+def test_blob_store_streams_and_dedups(tmp_path):
+    from backend.storage.blobs import BlobStore
+
+    store = BlobStore(str(tmp_path), chunk_size=4)
+    payload = b"streamed payload " * 100
+
+    async def chunks():
+        for i in range(0, len(payload), 64):
+            yield payload[i:i + 64]
+
+    async def main():
+        first = await store.write_stream(chunks())
+        second = await store.write_bytes(payload)
+        read_back = b"".join([chunk async for chunk in store.read_stream(first[0])])
+        return first, second, read_back
+
+    first, second, read_back = asyncio.run(main())
+    digest = hashlib.sha256(payload).hexdigest()
+    assert first == second == (digest, len(payload))
+    assert read_back == payload
+    assert os.path.exists(tmp_path / digest[:2] / digest[2:4] / digest)
+    assert os.listdir(tmp_path / "tmp") == []
+
+
+def test_verify_upload_matches_json_verify(monkeypatch, tmp_path):
+    monkeypatch.setenv("MODEL_PATH", "")
+    monkeypatch.setenv("PROOF_PROCESS_WORKERS", "0")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.api import routes
+    from backend.storage.blobs import BlobStore
+
+    monkeypatch.setattr(routes.services, "blob_store", BlobStore(str(tmp_path)))
+    app = FastAPI(lifespan=routes.lifespan)
+    app.include_router(routes.router, prefix="/api/v1")
+    content = "uploaded content " * 1000
+
+    with TestClient(app) as client:
+        uploaded = client.post(
+            "/api/v1/verify/upload",
+            files={"file": ("content.txt", content.encode())},
+            data={"creator_address": "0x1"}
+        ).json()
+        verified = client.post("/api/v1/verify", json={"content": content, "creator_address": "0x1"}).json()
+        blob = client.get(f"/api/v1/content/{uploaded['content_hash']}/blob")
+
+    assert uploaded['content_hash'] == hashlib.sha256(content.encode()).hexdigest()
+    assert uploaded['verification_data'] == verified['verification_data']
+    assert blob.content == content.encode()
@@ -0,0 +1,55 @@
+
+def test_cache_lru_eviction_and_counters():
+    from backend.ai_verification.cache import VerificationCache
+
+    cache = VerificationCache(max_entries=2)
+    cache.put("a", "m1", {"v": 1})
+    cache.put("b", "m1", {"v": 2})
+    assert cache.get("a", "m1") == {"v": 1}
+    cache.put("c", "m1", {"v": 3})
+    assert cache.get("b", "m1") is None
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["evictions"] == 1
+
+
+def test_cache_entries_scoped_by_model_hash(tmp_path):
+    from backend.ai_verification.cache import VerificationCache
+
+    db_path = str(tmp_path / "cache.db")
+    cache = VerificationCache(db_path=db_path)
+    cache.put("a", "m1", {"v": 1})
+
+    # A second worker sharing the file sees the entry
+    other = VerificationCache(db_path=db_path)
+    assert other.get("a", "m1") == {"v": 1}
+
+    # A worker on the next model version misses without dropping the old version's rows
+    assert other.get("a", "m2") is None
+    other.put("a", "m2", {"v": 2})
+    assert VerificationCache(db_path=db_path).get("a", "m1") == {"v": 1}
+    assert VerificationCache(db_path=db_path).get("a", "m2") == {"v": 2}
+
+
+def test_cache_disk_tier_bounded_by_size_and_ttl(tmp_path):
+    import sqlite3
+    import time
+    from backend.ai_verification.cache import VerificationCache
+
+    db_path = str(tmp_path / "cache.db")
+    cache = VerificationCache(max_entries=1, db_path=db_path, max_disk_entries=3)
+    for i in range(7):
+        cache.put(f"c{i}", "m1", {"v": i})
+
+    def rows():
+        return sqlite3.connect(db_path).execute(
+            "SELECT content_hash FROM verification_cache ORDER BY content_hash").fetchall()
+
+    # Trimmed back to 3 rows every 3 puts; the latest put lands after the last sweep
+    assert len(rows()) == 4 and ("c6",) in rows()
+    assert cache.get_stats()["disk_evictions"] == 3
+
+    # Expired rows are swept when the next worker opens the file
+    VerificationCache(db_path=db_path, ttl_seconds=0.01)
+    time.sleep(0.02)
+    VerificationCache(db_path=db_path, ttl_seconds=0.01)
+    assert rows() == []
@@ -0,0 +1,181 @@
+import asyncio
+
+
+def test_write_behind_buffer_upserts_in_bulk(tmp_path):
+    from sqlalchemy import func, select
+    from backend.database.models import Content, NFTMetadata
+    from backend.database.session import create_engine, init_models
+    from backend.database.writer import WriteBehindBuffer
+
+    def content_row(i, verified):
+        return {
+            'content_hash': f"{i:064x}",
+            'content_ref': f"{i:064x}",
+            'content_size': 9,
+            'content_type': 'text',
+            'creator_address': '0x' + '1' * 40,
+            'ai_model_hash': 'ab' * 32,
+            'verification_proof_ref': 'cd' * 32,
+            'verification_proof_size': 2,
+            'zk_proof_ref': 'cd' * 32,
+            'zk_proof_size': 2,
+            'is_verified': verified
+        }
+
+    async def main():
+        engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+        await init_models(engine)
+        writer = WriteBehindBuffer(engine, max_batch=1000, flush_interval=60)
+        for i in range(50):
+            writer.add_content(content_row(i, False))
+        await writer.flush()
+
+        # Re-verification of the same hash updates the existing row
+        writer.add_content(content_row(0, True))
+        writer.add_nft({'token_id': 7, 'content_hash': f"{0:064x}", 'metadata_uri': 'ipfs://x',
+                        'transaction_hash': '0x1', 'blockchain_address': '0x' + '2' * 40})
+        await writer.flush()
+
+        async with engine.connect() as conn:
+            count = await conn.scalar(select(func.count()).select_from(Content))
+            row = (await conn.execute(select(Content.is_verified, Content.nft_token_id)
+                                      .where(Content.content_hash == f"{0:064x}"))).one()
+            nft_content_id = await conn.scalar(select(NFTMetadata.content_id).where(NFTMetadata.token_id == 7))
+            journal_mode = await conn.exec_driver_sql("PRAGMA journal_mode")
+            journal_mode = journal_mode.scalar()
+        await engine.dispose()
+        return count, tuple(row), nft_content_id, journal_mode, writer.get_stats()
+
+    count, row, nft_content_id, journal_mode, stats = asyncio.run(main())
+    assert count == 50
+    assert row == (True, 7)
+    assert nft_content_id is not None
+    assert journal_mode == "wal"
+    assert stats['flushes'] == 2
+
+
+
+def test_write_behind_buffer_chunks_dead_letters_and_drains(tmp_path):
+    from sqlalchemy import func, select
+    from backend.database.models import Content
+    from backend.database.session import create_engine, init_models
+    from backend.database.writer import WriteBehindBuffer
+
+    def content_row(i):
+        return {
+            'content_hash': f"{i:064x}",
+            # NOT NULL column: this row is refused on its own
+            'content_ref': None if i == 5 else f"{i:064x}",
+            'content_size': 9,
+            'content_type': 'text',
+            'creator_address': '0x' + '1' * 40,
+            'ai_model_hash': 'ab' * 32,
+            'verification_proof_ref': 'cd' * 32,
+            'verification_proof_size': 2,
+            'zk_proof_ref': 'cd' * 32,
+            'zk_proof_size': 2,
+            'is_verified': True
+        }
+
+    async def main():
+        engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+        await init_models(engine)
+        flushed = []
+        writer = WriteBehindBuffer(engine, max_batch=4, flush_interval=60,
+                                   on_flush=lambda content, nfts: flushed.append(len(content)))
+        for i in range(10):
+            writer.add_content(content_row(i))
+        written = await writer.flush()
+
+        # stop() writes what is still buffered instead of dropping it
+        writer.start()
+        writer.add_content(content_row(20))
+        await writer.stop()
+
+        async with engine.connect() as conn:
+            count = await conn.scalar(select(func.count()).select_from(Content))
+        await engine.dispose()
+        return written, flushed, count, writer.dead_letters(), writer.get_stats()
+
+    written, flushed, count, dead, stats = asyncio.run(main())
+    assert written == 9 and count == 10
+    # Chunks of 4; the chunk holding the bad row was retried row by row
+    assert flushed == [4, 3, 2, 1]
+    assert len(dead) == 1 and dead[0][1]['content_hash'] == f"{5:064x}"
+    assert stats['dead_lettered'] == 1 and stats['pending'] == 0
+
+def test_read_through_cache_collapses_concurrent_misses():
+    from backend.api.read_cache import ReadThroughCache
+
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"token_id": 1}
+
+    async def main():
+        cache = ReadThroughCache(max_entries=10, ttl_seconds=60)
+        results = await asyncio.gather(*(cache.get_or_load(("nft", 1), loader) for _ in range(10)))
+        cached = await cache.get_or_load(("nft", 1), loader)
+        cache.invalidate(("nft", 1))
+        await cache.get_or_load(("nft", 1), loader)
+        return results, cached, cache.get_stats()
+
+    results, cached, stats = asyncio.run(main())
+    assert len(calls) == 2
+    assert all(r.etag == cached.etag for r in results)
+    assert stats['coalesced'] == 9 and stats['hits'] == 1 and stats['invalidations'] == 1
+
+
+def test_shared_invalidations_reach_forked_workers():
+    import multiprocessing
+    from backend.api.read_cache import SharedInvalidations
+
+    invalidations = SharedInvalidations(capacity=8)
+    invalidations.publish(["content:own"])
+
+    def worker():
+        invalidations.publish(["content:aa", "nft:7"])
+
+    child = multiprocessing.get_context("fork").Process(target=worker)
+    child.start()
+    child.join()
+
+    # The publisher skips its own keys
+    assert invalidations.poll() == ["content:aa", "nft:7"]
+    assert invalidations.poll() == []
+
+    invalidations.publish([f"content:{i}" for i in range(3)])
+    child = multiprocessing.get_context("fork").Process(
+        target=lambda: invalidations.publish([f"nft:{i}" for i in range(9)]))
+    child.start()
+    child.join()
+    # Fell further behind than the ring holds: clear the whole cache
+    assert invalidations.poll() is None
+
+
+def test_read_through_cache_survives_a_cancelled_leader():
+    from backend.api.read_cache import ReadThroughCache
+
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return {"token_id": 1}
+
+    async def main():
+        cache = ReadThroughCache(max_entries=10, ttl_seconds=60)
+        leader = asyncio.ensure_future(cache.get_or_load(("nft", 1), loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_load(("nft", 1), loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        response = await waiter
+        cached = await cache.get_or_load(("nft", 1), loader)
+        return leader.cancelled(), response, cached
+
+    cancelled, response, cached = asyncio.run(main())
+    assert cancelled and len(calls) == 1
+    assert response.body == {"token_id": 1} and cached is response
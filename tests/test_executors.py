@@ -0,0 +1,52 @@
+
+def test_stage_pool_limits_concurrency():
+    import asyncio
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.api.executors import StagePool
+
+    pool = StagePool("mint", ThreadPoolExecutor(max_workers=8), max_concurrency=2)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def work():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+
+    async def main():
+        await asyncio.gather(*(pool.run(work) for _ in range(6)))
+
+    asyncio.run(main())
+    pool.shutdown()
+    assert max(peak) <= 2
+
+
+def test_stage_pool_sheds_beyond_queue_limit():
+    import asyncio
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    import pytest
+    from backend.api.admission import Overloaded
+    from backend.api.executors import StagePool
+
+    pool = StagePool("verify", ThreadPoolExecutor(max_workers=1), max_concurrency=1, max_queue=1)
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(Overloaded):
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(main())
+    pool.shutdown()
+    assert pool.get_stats()['rejected'] == 1
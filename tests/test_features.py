@@ -0,0 +1,21 @@
+import hashlib
+
+
+def _reference_features(text):
+    # Original list-based implementation, kept here to pin the feature layout
+    import torch
+    text_hash = hashlib.sha256(text.encode()).hexdigest()
+    features = [int(text_hash[i:i+8], 16) for i in range(0, min(len(text_hash), 192), 8)]
+    features = features[:768] + [0] * (768 - len(features))
+    return torch.tensor(features, dtype=torch.float32).unsqueeze(0)
+
+
+def test_hash_features_match_reference():
+    import torch
+    from backend.ai_verification.features import HashFeatureExtractor
+
+    texts = [f"sample {i}" for i in range(200)] + ["", "ünïcode"]
+    features = HashFeatureExtractor()(texts)
+    assert features.shape == (len(texts), 768)
+    expected = torch.cat([_reference_features(t) for t in texts])
+    assert torch.equal(features, expected)
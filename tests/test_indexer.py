@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+from types import SimpleNamespace
+
+CONTRACT = "0x" + "ab" * 20
+
+
+class FakeChainEth:
+    """In-process w3.eth over a list of blocks; get_logs refuses ranges wider than max_range"""
+
+    def __init__(self, max_range=8):
+        self.max_range = max_range
+        self.blocks = []
+        self.get_logs_calls = 0
+
+    def mine(self, logs=(), fork="a"):
+        number = len(self.blocks)
+        block_hash = hashlib.sha256(f"{fork}:{number}".encode()).digest()
+        self.blocks.append((block_hash, [dict(log, blockNumber=number, blockHash=block_hash) for log in logs]))
+
+    @property
+    def block_number(self):
+        return len(self.blocks) - 1
+
+    def get_block(self, number):
+        return {'hash': self.blocks[number][0]}
+
+    def get_logs(self, params):
+        self.get_logs_calls += 1
+        if params['toBlock'] - params['fromBlock'] + 1 > self.max_range:
+            raise ValueError("block range too large")
+        return [log for block_hash, logs in self.blocks[params['fromBlock']:params['toBlock'] + 1] for log in logs]
+
+
+def minted_log(token_id, content_hash, uri="ipfs://meta"):
+    from eth_abi import encode
+    from backend.nft.indexer import CONTENT_MINTED_TOPIC
+
+    return {
+        'address': CONTRACT,
+        'topics': [bytes(CONTENT_MINTED_TOPIC), token_id.to_bytes(32, "big"), bytes(12) + b"\x11" * 20],
+        'data': encode(["bytes32", "bytes32", "string"], [bytes.fromhex(content_hash), b"\x22" * 32, uri]),
+        'transactionHash': token_id.to_bytes(32, "big")
+    }
+
+
+def test_indexer_follows_logs_and_rewinds_reorgs(tmp_path):
+    from backend.database.chain_index import ChainIndexStore
+    from backend.database.models import Content
+    from backend.database.queries import get_nft
+    from backend.database.session import create_engine, create_session_factory, init_models
+    from backend.nft.indexer import ChainIndexer
+
+    hashes = [f"{i:064x}" for i in range(1, 4)]
+    eth = FakeChainEth(max_range=8)
+    for number in range(40):
+        # Token 99 is for content this marketplace never verified
+        eth.mine([minted_log(1, hashes[0])] if number == 5 else
+                 [minted_log(2, hashes[1]), minted_log(99, "ff" * 32)] if number == 30 else [])
+
+    async def main():
+        engine = create_engine(f"sqlite:///{tmp_path / 'index.db'}")
+        await init_models(engine)
+        async with engine.begin() as conn:
+            await conn.execute(Content.__table__.insert(), [{
+                'content_hash': content_hash, 'content_ref': content_hash, 'content_size': 1,
+                'content_type': 'text', 'creator_address': '0x' + '1' * 40, 'ai_model_hash': 'ab' * 32,
+                'verification_proof_ref': 'cd' * 32, 'verification_proof_size': 1,
+                'zk_proof_ref': 'cd' * 32, 'zk_proof_size': 1, 'is_verified': True
+            } for content_hash in hashes])
+
+        changed = []
+        indexer = ChainIndexer(SimpleNamespace(eth=eth), CONTRACT, ChainIndexStore(engine, CONTRACT),
+                               reorg_depth=6, max_range=32, target_logs=100, on_change=changed.extend)
+        assert await indexer.sync() == 2
+        stats = indexer.get_stats()
+
+        # Blocks 36.. are replaced; the reorged chain mints token 3 instead
+        del eth.blocks[36:]
+        for number in range(36, 42):
+            eth.mine([minted_log(3, hashes[2])] if number == 38 else [], fork="b")
+        await indexer.sync()
+
+        sessions = create_session_factory(engine)
+        async with sessions() as session:
+            nfts = [await get_nft(session, token_id) for token_id in (1, 2, 3, 99)]
+        await engine.dispose()
+        return stats, indexer.get_stats(), nfts, changed
+
+    stats, after, nfts, changed = asyncio.run(main())
+    # 32- and 16-block ranges were refused; later ranges stay at the node's limit
+    assert stats['range_errors'] == 2 and stats['range_ceiling'] == 8
+    assert stats['checkpoint'] == 39 and stats['lag_blocks'] == 0
+    assert stats['events_indexed'] == 2 and stats['events_skipped'] == 1
+    assert after['reorgs'] == 1 and after['checkpoint'] == 41
+
+    assert nfts[0]['content_hash'] == hashes[0] and nfts[0]['block_number'] == 5
+    assert nfts[0]['blockchain_address'] == CONTRACT and nfts[0]['metadata_uri'] == "ipfs://meta"
+    assert nfts[1]['block_number'] == 30
+    assert nfts[2]['block_number'] == 38
+    assert nfts[3] is None
+    assert {row['token_id'] for row in changed} == {1, 2, 3}
+
+
+def test_indexer_rewinds_rows_from_orphaned_blocks(tmp_path):
+    from sqlalchemy import select
+    from backend.database.chain_index import ChainIndexStore
+    from backend.database.models import Content, NFTMetadata
+    from backend.database.session import create_engine, init_models
+    from backend.nft.indexer import ChainIndexer
+
+    content_hash = f"{7:064x}"
+    eth = FakeChainEth(max_range=100)
+    for number in range(20):
+        eth.mine([minted_log(5, content_hash)] if number == 18 else [])
+
+    async def main():
+        engine = create_engine(f"sqlite:///{tmp_path / 'index.db'}")
+        await init_models(engine)
+        async with engine.begin() as conn:
+            await conn.execute(Content.__table__.insert(), [{
+                'content_hash': content_hash, 'content_ref': content_hash, 'content_size': 1,
+                'content_type': 'text', 'creator_address': '0x' + '1' * 40, 'ai_model_hash': 'ab' * 32,
+                'verification_proof_ref': 'cd' * 32, 'verification_proof_size': 1,
+                'zk_proof_ref': 'cd' * 32, 'zk_proof_size': 1, 'is_verified': True
+            }])
+        indexer = ChainIndexer(SimpleNamespace(eth=eth), CONTRACT, ChainIndexStore(engine, CONTRACT), reorg_depth=4)
+        await indexer.sync()
+
+        # The mint's block is orphaned and the new chain has no event
+        del eth.blocks[17:]
+        for _ in range(4):
+            eth.mine(fork="b")
+        await indexer.sync()
+
+        async with engine.connect() as conn:
+            nft = (await conn.execute(select(NFTMetadata.token_id))).all()
+            token = await conn.scalar(select(Content.nft_token_id))
+        await engine.dispose()
+        return nft, token
+
+    nft, token = asyncio.run(main())
+    assert nft == [] and token is None
+
+
+def test_receipt_token_id_comes_from_content_minted_log():
+    from backend.nft.contract import ContentNFTContract
+
+    contract = SimpleNamespace(contract_address=CONTRACT)
+    receipt = {'logs': [dict(minted_log(42, "aa" * 32), blockNumber=1, blockHash=b"\x01" * 32)]}
+    assert ContentNFTContract._get_token_id_from_receipt(contract, receipt) == 42
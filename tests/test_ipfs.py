@@ -0,0 +1,48 @@
+
+def test_cid_is_computed_locally_and_metadata_deduplicated(tmp_path):
+    from backend.nft.ipfs import MetadataStore, compute_cid, encode_json
+
+    # Well-known CIDv1 of the empty raw block
+    assert compute_cid(b"") == "bafkreihdwdcefgh4dqkjv67uzcmw7ojee6xedzdetojuzjevtenxquvyku"
+    assert encode_json({"b": 1, "a": "é"}) == '{"a":"é","b":1}'.encode()
+
+    store = MetadataStore(str(tmp_path / "ipfs.db"))
+    cid = store.put({"name": "one", "value": 1})
+    assert store.put({"value": 1, "name": "one"}) == cid
+    assert store.get(cid) == encode_json({"name": "one", "value": 1})
+    assert store.get_stats() == {"pending": 1, "deduplicated": 1}
+
+
+def test_publisher_pins_batches_on_local_node(tmp_path):
+    import pytest
+    import requests
+    from benchmarks.fakes import FakeIPFSNode
+    from backend.nft.ipfs import IPFSPublisher, MetadataStore, PENDING, PINNED
+    from backend.nft.minting import NFTMinter
+
+    node = FakeIPFSNode()
+    store = MetadataStore(str(tmp_path / "ipfs.db"), retry_backoff=0.0)
+    minter = NFTMinter(contract=None, ipfs_gateway="ipfs://", metadata_store=store)
+    publisher = IPFSPublisher(store, node.url, batch_size=8)
+    try:
+        uris = [minter.upload_to_ipfs({"name": f"token {i}"}) for i in range(10)]
+        cids = [uri[len("ipfs://"):] for uri in uris]
+
+        # Transport retries absorb a transient error
+        node.fail_next = 1
+        assert publisher.publish_pending() == 8
+        assert publisher.publish_pending() == 2
+        assert node.requests == 3
+        assert node.pinned == set(cids)
+        assert node.blocks[cids[0]] == store.get(cids[0])
+        assert store.status(cids[0]) == PINNED
+
+        # Persistent failures back off in the store and leave objects pending
+        store.put({"name": "late"})
+        node.fail_next = 10
+        with pytest.raises(requests.RequestException):
+            publisher.publish_pending()
+        assert store.get_stats()[PENDING] == 1
+    finally:
+        publisher.stop()
+        node.close()
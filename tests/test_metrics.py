@@ -0,0 +1,59 @@
+import time
+
+
+def test_histogram_renders_prometheus_buckets():
+    from backend.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+
+    text = registry.render()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+
+def test_metrics_endpoint_and_sampled_traces(monkeypatch):
+    monkeypatch.setenv("MODEL_PATH", "")
+    monkeypatch.setenv("PROOF_PROCESS_WORKERS", "0")
+    from fastapi.testclient import TestClient
+    from backend.config import config
+    from backend.main import app
+    from backend.metrics import TRACER
+
+    monkeypatch.setattr(TRACER, "sample_rate", 1.0)
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "secret")
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 30
+        while client.get("/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        response = client.post("/api/v1/verify", json={
+            "content": "metrics test content",
+            "content_type": "text",
+            "creator_address": "0x0000000000000000000000000000000000000001"
+        })
+        assert response.status_code == 200
+        client.get(f"/api/v1/content/{response.json()['content_hash']}")
+
+        metrics = client.get("/metrics").text
+        traces = client.get("/api/v1/admin/traces", headers={"X-Admin-Token": "secret"}).json()['traces']
+        wrong_token = client.get("/api/v1/admin/traces", headers={"X-Admin-Token": "guess"})
+        monkeypatch.setattr(config, "ADMIN_TOKEN", None)
+        # No token configured: admin endpoints stay closed
+        unconfigured = client.get("/api/v1/admin/traces")
+
+    # Path parameters are reported by template, not by value
+    assert 'method="GET",route="/api/v1/content/{content_hash}"' in metrics
+    assert 'route="/api/v1/verify",status="200"' in metrics
+    assert 'content_marketplace_stage_duration_seconds_count{stage="inference"}' in metrics
+
+    assert wrong_token.status_code == 403 and unconfigured.status_code == 403
+
+    verify_trace = next(trace for trace in traces if trace['name'] == "POST /api/v1/verify")
+    # Spans recorded on the verify worker thread join the request's trace
+    assert {"cache_lookup", "inference", "proof"} <= {span['stage'] for span in verify_trace['spans']}
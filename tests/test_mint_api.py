@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+
+def test_mint_uses_the_persisted_verification_record(monkeypatch):
+    monkeypatch.setenv("MODEL_PATH", "")
+    monkeypatch.setenv("PROOF_PROCESS_WORKERS", "0")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.api import routes
+
+    app = FastAPI(lifespan=routes.lifespan)
+    app.include_router(routes.router, prefix="/api/v1")
+    creator = "0x" + "5a" * 20
+
+    minted = []
+    class RecordingMinter:
+        contract = SimpleNamespace(pipeline=SimpleNamespace(in_flight=lambda: 0))
+
+        def mint_verified_content(self, content_data, verification_record):
+            minted.append((content_data, verification_record))
+            return {'token_id': 7, 'transaction_hash': '0x' + '00' * 32, 'metadata_uri': 'ipfs://m'}
+
+    with TestClient(app) as client:
+        verified = client.post("/api/v1/verify", json={"content": "mint me", "creator_address": creator}).json()
+        content_hash = verified["content_hash"]
+
+        unknown = client.post("/api/v1/mint", json={"content_hash": "ab" * 32, "creator_address": creator})
+        other = client.post("/api/v1/mint", json={"content_hash": content_hash, "creator_address": "0x" + "11" * 20})
+
+        monkeypatch.setattr(routes.services, "nft_minter", RecordingMinter())
+        monkeypatch.setattr(routes.config, "CONTRACT_ADDRESS", "0x" + "44" * 20)
+        response = client.post("/api/v1/mint", json={"content_hash": content_hash, "creator_address": creator})
+        monkeypatch.setattr(routes.services, "nft_minter", None)
+
+    assert unknown.status_code == 404
+    assert other.status_code == 403
+    assert response.status_code == 200 and response.json()["token_id"] == 7
+    content_data, record = minted[0]
+    assert content_data["creator_address"] == creator
+    assert record["model_hash"] == verified["verification_data"]["model_hash"]
+    assert record["zk_proof"] == verified["zk_proof"]
+    assert record["verification_data"]["verification_scores"] == verified["verification_data"]["verification_scores"]
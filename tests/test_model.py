@@ -0,0 +1,52 @@
+
+def test_model_hash_is_cached_and_reproducible():
+    import torch
+    from backend.ai_verification.model import ContentVerificationModel
+
+    torch.manual_seed(0)
+    model = ContentVerificationModel()
+    first = model.get_model_hash()
+    assert model.get_model_hash() == first
+
+    clone = ContentVerificationModel()
+    clone.load_state_dict(model.state_dict())
+    assert clone.get_model_hash() == first
+
+
+def test_model_hash_invalidated_on_load_state_dict():
+    import torch
+    from backend.ai_verification.model import ContentVerificationModel
+
+    model = ContentVerificationModel()
+    before = model.get_model_hash()
+    state = {k: torch.zeros_like(v) for k, v in model.state_dict().items()}
+    model.load_state_dict(state)
+    assert model.get_model_hash() != before
+
+
+def test_process_digests_rejects_content_based_extractors():
+    import pytest
+    from backend.ai_verification.features import FeatureExtractor
+    from backend.ai_verification.model import ContentProcessor
+
+    class EmbeddingExtractor(FeatureExtractor):
+        def __call__(self, texts):
+            raise AssertionError("not called")
+
+    class Unfinished(FeatureExtractor):
+        pass
+
+    with pytest.raises(TypeError):
+        Unfinished()
+    processor = ContentProcessor(feature_extractor=EmbeddingExtractor())
+    with pytest.raises(ValueError, match="EmbeddingExtractor"):
+        processor.process_digests([b"\0" * 32])
+
+
+def test_loading_a_version_leaves_torch_threads_alone():
+    import torch
+    from backend.ai_verification.model import ContentProcessor
+
+    threads = torch.get_num_threads()
+    ContentProcessor(num_threads=threads + 1)
+    assert torch.get_num_threads() == threads
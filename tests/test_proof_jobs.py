@@ -0,0 +1,58 @@
+import time
+
+from backend.ai_verification.zk_circuits import ProverBackend
+
+
+class FlakyProver(ProverBackend):
+    def __init__(self, failures):
+        super().__init__("./circuits")
+        self.failures = failures
+
+    def prove(self, circuit_name, input_data):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("prover crashed")
+        return {"proof": {"protocol": "groth16"}, "public_signals": [str(input_data["content_hash"]), "1"]}
+
+
+def _wait_for(queue, job_id, status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] == status:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job did not reach {status}: {queue.get(job_id)}")
+
+
+def test_worker_pool_retries_failed_jobs(tmp_path):
+    from backend.ai_verification.proof_jobs import ProofJobQueue, ProofWorkerPool
+    from backend.ai_verification.zk_circuits import ZKProofGenerator
+
+    queue = ProofJobQueue(str(tmp_path / "jobs.db"), max_attempts=3, retry_backoff=0.0)
+    generator = ZKProofGenerator("./circuits", FlakyProver(failures=1))
+    circuit_input = generator.build_circuit_input(
+        "abc", "model", {"verification_scores": [[0.2, 0.8]], "is_ai_assisted": True}
+    )
+    job_id = queue.submit("abc", "model", circuit_input)
+
+    pool = ProofWorkerPool(queue, lambda: generator, workers=1)
+    pool.start()
+    try:
+        job = _wait_for(queue, job_id, "completed")
+    finally:
+        pool.stop()
+
+    assert job["attempts"] == 2
+    assert job["result"]["circuit_input"] == circuit_input
+
+
+def test_job_fails_after_max_attempts(tmp_path):
+    from backend.ai_verification.proof_jobs import ProofJobQueue
+
+    queue = ProofJobQueue(str(tmp_path / "jobs.db"), max_attempts=1)
+    job_id = queue.submit("abc", "model", {})
+    job = queue.claim()
+    queue.fail(job["job_id"], job["attempts"], "boom")
+    assert queue.get(job_id)["status"] == "failed"
+    assert queue.claim() is None
@@ -0,0 +1,29 @@
+def test_model_registry_hot_swaps_and_keeps_versions(tmp_path):
+    import torch
+    from backend.ai_verification.model import ContentVerificationModel
+    from backend.ai_verification.verification import ContentVerifier
+
+    paths = []
+    for i in range(3):
+        torch.manual_seed(i)
+        paths.append(str(tmp_path / f"model-{i}.pth"))
+        torch.save(ContentVerificationModel().state_dict(), paths[-1])
+
+    verifier = ContentVerifier(paths[0], str(tmp_path), model_versions=2)
+    first = verifier.processor
+    record, _ = verifier.verify_content("hello", "0x1")
+    assert record['model_hash'] == first.model_hash
+
+    second = verifier.models.reload_async(paths[1]).result()
+    assert verifier.processor is second.processor
+    # The old processor is still usable by requests that pinned it
+    assert first.process_content("hello")['model_hash'] == first.model_hash
+    assert verifier.verify_content("hello", "0x1")[0]['model_hash'] == second.fingerprint
+
+    # Rolling back to a resident version is instant; the oldest is evicted past the limit
+    verifier.models.activate(first.model_hash)
+    verifier.models.load_and_activate(paths[2])
+    fingerprints = [version['fingerprint'] for version in verifier.models.versions()]
+    assert fingerprints == [verifier.processor.model_hash, first.model_hash]
+    assert verifier.models.get_stats()['swaps'] == 3
+    verifier.models.stop()
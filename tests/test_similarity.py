@@ -0,0 +1,60 @@
+def _hash(i):
+    return f"{i:064x}"
+
+
+def test_feature_index_flags_near_duplicates_and_persists(tmp_path):
+    import numpy as np
+    from backend.ai_verification.similarity import FeatureIndex
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((600, 256)).astype(np.float32)
+    index = FeatureIndex(str(tmp_path), threshold=0.95, nlist=8, nprobe=3,
+                         train_threshold=500, initial_capacity=64)
+    for i, vector in enumerate(vectors):
+        assert index.check_and_add(_hash(i), "model-a", vector) == []
+
+    # Trained into partitions past the threshold, and grown without a rebuild
+    assert index.get_stats()['partitions'] == 8
+    assert len(index) == 600
+
+    near = vectors[42] + 0.01 * rng.standard_normal(256).astype(np.float32)
+    duplicates = index.check_and_add(_hash(1000), "model-a", near)
+    assert [d['content_hash'] for d in duplicates] == [_hash(42)]
+
+    # Resubmitting indexed content is not a duplicate of itself nor re-added
+    assert index.check_and_add(_hash(7), "model-a", vectors[7]) == []
+    assert len(index) == 601
+    index.flush()
+
+    reopened = FeatureIndex(str(tmp_path), threshold=0.95, nlist=8, nprobe=3, train_threshold=500)
+    assert len(reopened) == 601
+    assert reopened.search(vectors[300], k=1)[0][0] == _hash(300)
+
+    # Vectors from another model are not comparable
+    assert reopened.check_and_add(_hash(1), "model-b", vectors[0]) == []
+    assert len(reopened) == 1
+
+
+def test_feature_index_instances_share_the_files(tmp_path):
+    import numpy as np
+    from backend.ai_verification.similarity import FeatureIndex
+
+    # Two instances on one path stand in for two pre-forked workers
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((600, 256)).astype(np.float32)
+    options = dict(threshold=0.95, nlist=8, nprobe=8, train_threshold=500, initial_capacity=64)
+    first = FeatureIndex(str(tmp_path), **options)
+    second = FeatureIndex(str(tmp_path), **options)
+    for i, vector in enumerate(vectors[:550]):
+        (first if i % 2 else second).check_and_add(_hash(i), "model-a", vector)
+
+    # Growth and training by either side are picked up by the other
+    assert second.search(vectors[549], k=1)[0][0] == _hash(549)
+    assert first.search(vectors[100], k=1)[0][0] == _hash(100)
+    second.check_and_add(_hash(900), "model-a", vectors[590])
+    assert [d['content_hash'] for d in first.check_and_add(_hash(901), "model-a", vectors[590])] == [_hash(900)]
+    assert len(first) == len(second) == 552
+
+    second.check_and_add(_hash(1), "model-b", vectors[0])
+    assert [match for match, _ in first.search(vectors[0], k=5)] == [_hash(1)]
+    assert len(first) == 1
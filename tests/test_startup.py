@@ -0,0 +1,31 @@
+import subprocess
+import sys
+import time
+
+
+def test_importing_routes_does_not_load_torch_or_web3():
+    code = (
+        "import sys; import backend.api.routes; "
+        "print(','.join(m for m in ('torch', 'web3') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_liveness_and_readiness_are_separate(monkeypatch):
+    monkeypatch.setenv("MODEL_PATH", "")
+    monkeypatch.setenv("PROOF_PROCESS_WORKERS", "0")
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        deadline = time.monotonic() + 30
+        ready = client.get("/ready")
+        while ready.status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            ready = client.get("/ready")
+
+    assert ready.status_code == 200
+    phases = ready.json()['startup_ms']
+    assert {"database", "imports", "model", "verifier", "ready"} <= set(phases)
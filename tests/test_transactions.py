@@ -0,0 +1,111 @@
+import hashlib
+import threading
+from types import SimpleNamespace
+
+from web3.exceptions import TransactionNotFound
+
+
+class FakeEth:
+    """In-process stand-in for w3.eth: mines every transaction on the second receipt poll"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sent = []
+        self.polls = {}
+        self.count_calls = 0
+        self.gas_price_calls = 0
+        self.account = SimpleNamespace(sign_transaction=self._sign)
+
+    @property
+    def gas_price(self):
+        self.gas_price_calls += 1
+        return 10
+
+    def get_transaction_count(self, address, block_identifier="latest"):
+        self.count_calls += 1
+        return len(self.sent)
+
+    def _sign(self, transaction, private_key):
+        return SimpleNamespace(rawTransaction=repr(sorted(transaction.items())).encode())
+
+    def send_raw_transaction(self, raw):
+        with self.lock:
+            self.sent.append(raw)
+            return hashlib.sha256(raw).digest()
+
+    def get_transaction_receipt(self, tx_hash):
+        with self.lock:
+            self.polls[tx_hash] = self.polls.get(tx_hash, 0) + 1
+            if self.polls[tx_hash] < 2:
+                raise TransactionNotFound("pending")
+            return {"status": 1, "blockNumber": 1, "transactionIndex": 0}
+
+
+def test_pipeline_assigns_unique_nonces_and_collects_receipts():
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.nft.transactions import NonceManager, GasPriceOracle, TransactionPipeline
+
+    w3 = SimpleNamespace(eth=FakeEth())
+    pipeline = TransactionPipeline(
+        w3, "key", NonceManager(w3, "0xabc"), GasPriceOracle(w3, refresh_interval=60), poll_interval=0.01
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            submissions = list(pool.map(lambda i: pipeline.submit({"to": "0xdef", "value": i}), range(20)))
+        receipts = [future.result(timeout=5) for _, future in submissions]
+    finally:
+        pipeline.stop()
+
+    nonces = sorted(int(raw.split(b"('nonce', ")[1].split(b")")[0]) for raw in w3.eth.sent)
+    assert nonces == list(range(20))
+    assert w3.eth.count_calls == 1
+    assert w3.eth.gas_price_calls == 1
+    assert all(receipt["status"] == 1 for receipt in receipts)
+    assert pipeline.get_stats()["confirmed"] == 20
+
+
+def test_nonce_manager_resyncs_after_error():
+    from backend.nft.transactions import NonceManager
+
+    w3 = SimpleNamespace(eth=FakeEth())
+    manager = NonceManager(w3, "0xabc")
+    assert manager.next_nonce() == 0
+    assert manager.next_nonce() == 1
+    w3.eth.sent.extend([b"a", b"b", b"c"])
+    manager.resync()
+    assert manager.next_nonce() == 3
+
+
+def test_pipeline_retries_receipt_errors_and_fails_pending_on_stop():
+    import pytest
+    from backend.nft.transactions import NonceManager, GasPriceOracle, TransactionPipeline
+
+    class FlakyEth(FakeEth):
+        def get_transaction_receipt(self, tx_hash):
+            # The node drops the first few receipt lookups
+            if self.polls.get(tx_hash, 0) < 3:
+                self.polls[tx_hash] = self.polls.get(tx_hash, 0) + 1
+                raise ConnectionError("node unavailable")
+            return super().get_transaction_receipt(tx_hash)
+
+    w3 = SimpleNamespace(eth=FlakyEth())
+    pipeline = TransactionPipeline(
+        w3, "key", NonceManager(w3, "0xabc"), GasPriceOracle(w3), poll_interval=0.01
+    )
+    try:
+        _, future = pipeline.submit({"to": "0xdef", "value": 1})
+        assert future.result(timeout=5)["status"] == 1
+        assert pipeline.get_stats()["receipt_errors"] == 3
+
+        # Never mined: stop() fails the future instead of leaving it hanging
+        def never_mined(tx_hash):
+            raise TransactionNotFound("pending")
+
+        w3.eth.get_transaction_receipt = never_mined
+        _, stuck = pipeline.submit({"to": "0xdef", "value": 2})
+    finally:
+        pipeline.stop()
+    with pytest.raises(RuntimeError, match="stopped"):
+        stuck.result(timeout=1)
+    with pytest.raises(RuntimeError, match="stopped"):
+        pipeline.submit({"to": "0xdef", "value": 3})
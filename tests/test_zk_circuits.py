@@ -0,0 +1,42 @@
+import json
+
+
+def test_artifacts_missing_are_reported(tmp_path):
+    import pytest
+    from backend.ai_verification.zk_circuits import CircuitArtifacts
+
+    with pytest.raises(FileNotFoundError) as excinfo:
+        CircuitArtifacts(str(tmp_path)).load()
+    assert "content_verification.zkey" in str(excinfo.value)
+
+
+def test_artifacts_loaded_once(tmp_path):
+    from backend.ai_verification.zk_circuits import CircuitArtifacts
+
+    build_dir = tmp_path / "build" / "content_verification"
+    build_dir.mkdir(parents=True)
+    for ext in ("wasm", "r1cs", "zkey"):
+        (build_dir / f"content_verification.{ext}").write_bytes(b"\0" * 64)
+    (build_dir / "verification_key.json").write_text(json.dumps({"protocol": "groth16"}))
+
+    artifacts = CircuitArtifacts(str(tmp_path)).load()
+    assert artifacts.verification_key == {"protocol": "groth16"}
+    assert artifacts.get_stats()["sizes"] == {"wasm": 64, "r1cs": 64, "zkey": 64}
+
+
+def test_proof_pool_workers_load_their_prover_once(tmp_path):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from backend.ai_verification import zk_circuits
+
+    data = {'verification_scores': [[0.1, 0.9]], 'is_ai_assisted': True}
+    zk_circuits.init_proof_worker(str(tmp_path), "mock")
+    generator = zk_circuits._worker_generator
+    proof = zk_circuits.prove_in_worker("ab" * 32, "cd" * 32, data)
+    zk_circuits.prove_in_worker("ab" * 32, "cd" * 32, data)
+    assert zk_circuits._worker_generator is generator
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=zk_circuits.init_proof_worker,
+                             initargs=(str(tmp_path), "mock")) as pool:
+        assert pool.submit(zk_circuits.prove_in_worker, "ab" * 32, "cd" * 32, data).result() == proof